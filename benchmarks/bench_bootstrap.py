@@ -0,0 +1,54 @@
+"""
+Benchmark: bootstrap CIs via resample + evaluate_predictions vs. bootstrap_metrics.
+
+The naive baseline materializes every resample and calls
+``evaluate_predictions`` on it; ``bootstrap_metrics`` works on multinomial
+count matrices with a single argsort. The baseline is timed on
+``--naive-boot`` resamples and extrapolated to ``--boot``.
+
+Run with:
+python -m benchmarks.bench_bootstrap --rows 1000000 --boot 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from evaluating import bootstrap_metrics, evaluate_predictions
+
+
+def main(n_rows: int, n_boot: int, naive_boot: int, n_jobs: int) -> None:
+    rng = np.random.default_rng(0)
+    y = rng.gamma(4.0, 30_000.0, n_rows)
+    df = pd.DataFrame({"salary_usd": y, "pred": y * rng.lognormal(0.0, 0.3, n_rows)})
+
+    t0 = time.perf_counter()
+    for _ in range(naive_boot):
+        sample = df.iloc[rng.integers(0, n_rows, n_rows)]
+        evaluate_predictions(sample, "salary_usd", preds_column="pred")
+    t_naive = (time.perf_counter() - t0) * n_boot / naive_boot
+
+    t0 = time.perf_counter()
+    bootstrap_metrics(
+        df, "salary_usd", preds_column="pred", n_boot=n_boot, n_jobs=n_jobs
+    )
+    t_fast = time.perf_counter() - t0
+
+    print(f"rows={n_rows:,} resamples={n_boot} n_jobs={n_jobs}")
+    print(f"{'naive':<12}{t_naive:>9.1f} s (extrapolated from {naive_boot})")
+    print(f"{'bootstrap':<12}{t_fast:>9.1f} s   ({t_naive / t_fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--boot", type=int, default=1000)
+    parser.add_argument("--naive-boot", type=int, default=10)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    main(args.rows, args.boot, args.naive_boot, args.n_jobs)
@@ -0,0 +1,96 @@
+"""
+Benchmark: time-to-first-prediction of .joblib pipelines vs. model bundles.
+
+Each measurement runs in a fresh interpreter, so it includes the import cost
+(sklearn / lightgbm / pandas for joblib, numpy only for GLM bundles).
+
+Run with:
+python -m benchmarks.bench_bundle_startup
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import polars as pl
+
+# One posting as plain Python values
+ROW_QUERY = "data/jobs_cleaned.parquet"
+
+JOBLIB_SNIPPET = """
+import time; t0 = time.perf_counter()
+import pandas as pd
+from joblib import load
+model = load({path!r})
+model.predict(pd.DataFrame({row!r}))
+print(time.perf_counter() - t0)
+"""
+
+BUNDLE_SNIPPET = """
+import time; t0 = time.perf_counter()
+from serving import load_bundle
+model = load_bundle({path!r})
+model.predict({row!r})
+print(time.perf_counter() - t0)
+"""
+
+
+def _time_to_first_prediction(snippet: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", snippet],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def main(repeat: int) -> None:
+    from joblib import load
+
+    from serving import export_bundle
+
+    row = (
+        pl.read_parquet(ROW_QUERY, n_rows=1)
+        .select(
+            "years_experience",
+            "employment_type",
+            "company_location",
+            "industry_group",
+            "education_required",
+            "company_size",
+        )
+        .to_dict(as_series=False)
+    )
+    row = json.loads(json.dumps(row))
+
+    print(f"{'model':<8}{'joblib [ms]':>13}{'bundle [ms]':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("glm", "lgbm"):
+            joblib_path = f"modeling/models/best_{name}.joblib"
+            bundle_path = str(Path(tmp) / f"best_{name}")
+            export_bundle(load(joblib_path), bundle_path)
+
+            t_joblib = _time_to_first_prediction(
+                JOBLIB_SNIPPET.format(path=joblib_path, row=row), repeat
+            )
+            t_bundle = _time_to_first_prediction(
+                BUNDLE_SNIPPET.format(path=bundle_path, row=row), repeat
+            )
+            print(f"{name:<8}{1e3 * t_joblib:>13.0f}{1e3 * t_bundle:>13.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.repeat)
@@ -0,0 +1,63 @@
+"""
+Benchmark: render time and PNG size of scatter vs. density plots.
+
+Draws ``--rows`` synthetic (actual, predicted) salary pairs once with
+``plt.scatter`` and once with ``plot_density`` and saves both at dpi=200 with
+the Agg backend.
+
+Run with:
+python -m benchmarks.bench_density --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from plotting import plot_density  # noqa: E402
+
+
+def _render(draw, x, y, out_path: Path) -> float:
+    t0 = time.perf_counter()
+    plt.figure()
+    draw(x, y)
+    plt.savefig(out_path, dpi=200, bbox_inches="tight")
+    plt.close()
+    return time.perf_counter() - t0
+
+
+def main(n_rows: int, bins: int) -> None:
+    rng = np.random.default_rng(0)
+    actual = rng.gamma(4.0, 30_000.0, n_rows)
+    predicted = actual * rng.lognormal(0.0, 0.2, n_rows)
+
+    draws = {
+        "scatter": lambda x, y: plt.scatter(x, y, s=10, alpha=0.3),
+        "density": lambda x, y: plot_density(x, y, bins=bins),
+    }
+    print(f"rows={n_rows:,} bins={bins}")
+    print(f"{'kind':<10}{'time [s]':>10}{'PNG [KB]':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, draw in draws.items():
+            out_path = Path(tmp) / f"{kind}.png"
+            seconds = _render(draw, actual, predicted, out_path)
+            size_kb = out_path.stat().st_size / 1024
+            print(f"{kind:<10}{seconds:>10.2f}{size_kb:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bins", type=int, default=300)
+    args = parser.parse_args()
+
+    main(args.rows, args.bins)
@@ -0,0 +1,59 @@
+"""
+Benchmark: evaluate_predictions per model vs. evaluate_predictions_multi.
+
+Evaluates ``--models`` synthetic prediction columns on ``--rows`` rows, once
+with one ``evaluate_predictions`` call per model (as compare_model.py used to)
+and once with a single ``evaluate_predictions_multi`` call.
+
+Run with:
+python -m benchmarks.bench_evaluation --rows 2000000 --models 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from evaluating import evaluate_predictions, evaluate_predictions_multi
+
+
+def main(n_rows: int, n_models: int) -> None:
+    rng = np.random.default_rng(0)
+    y = rng.gamma(4.0, 30_000.0, n_rows)
+    cols = [f"pred_{k}" for k in range(n_models)]
+    df = pd.DataFrame(
+        {
+            "salary_usd": y,
+            **{c: y * rng.lognormal(0.0, 0.3, n_rows) for c in cols},
+        }
+    )
+
+    t0 = time.perf_counter()
+    single = pd.concat(
+        [evaluate_predictions(df, "salary_usd", preds_column=c)[0] for c in cols],
+        axis=1,
+        keys=cols,
+    )
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    multi = evaluate_predictions_multi(df, "salary_usd", preds_columns=cols)
+    t_multi = time.perf_counter() - t0
+
+    diff = np.abs(multi.to_numpy() / single.loc[multi.index].to_numpy() - 1).max()
+    print(f"rows={n_rows:,} models={n_models}")
+    print(f"{'per model':<12}{t_single:>8.2f} s")
+    print(f"{'multi':<12}{t_multi:>8.2f} s   ({t_single / t_multi:.1f}x)")
+    print(f"max relative difference: {diff:.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--models", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.rows, args.models)
@@ -0,0 +1,57 @@
+"""
+Benchmark: Gini via lorenz_curve + auc vs. gini_exact vs. a chunked LorenzSketch.
+
+Run with:
+python -m benchmarks.bench_gini --rows 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics import auc
+
+from evaluating import LorenzSketch, gini_exact, lorenz_curve
+
+
+def main(n_rows: int, n_bins: int, chunk_size: int) -> None:
+    rng = np.random.default_rng(0)
+    y = rng.gamma(4.0, 30_000.0, n_rows)
+    pred = y * rng.lognormal(0.0, 0.5, n_rows)
+    exposure = np.ones(n_rows)
+
+    t0 = time.perf_counter()
+    reference = 1 - 2 * auc(*lorenz_curve(y, pred, exposure))
+    t_curve = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    exact = gini_exact(y, pred)
+    t_exact = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sketch = LorenzSketch.from_predictions(pred[:chunk_size], n_bins)
+    for start in range(0, n_rows, chunk_size):
+        stop = start + chunk_size
+        sketch.update(y[start:stop], pred[start:stop])
+    t_sketch = time.perf_counter() - t0
+
+    print(f"rows={n_rows:,} bins={n_bins} chunk={chunk_size:,}")
+    print(f"{'method':<16}{'time [s]':>10}{'|error|':>12}{'bound':>12}")
+    print(f"{'curve + auc':<16}{t_curve:>10.2f}{0.0:>12.1e}")
+    print(f"{'gini_exact':<16}{t_exact:>10.2f}{abs(exact - reference):>12.1e}")
+    print(
+        f"{'LorenzSketch':<16}{t_sketch:>10.2f}"
+        f"{abs(sketch.gini() - reference):>12.1e}{sketch.gini_error_bound():>12.1e}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--bins", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    main(args.rows, args.bins, args.chunk_size)
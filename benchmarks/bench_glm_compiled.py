@@ -0,0 +1,77 @@
+"""
+Benchmark: single-row latency of the tuned GLM, pipeline vs. bundle vs. compiled.
+
+Scores the same postings one at a time through ``Pipeline.predict`` (one-row
+DataFrame), ``ModelBundle.predict`` (one-row dict) and
+``CompiledGLM.predict_one`` (plain dict), and reports the median latency and
+the largest difference from the pipeline.
+
+Run with:
+python -m benchmarks.bench_glm_compiled
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import polars as pl
+from joblib import load
+
+from modeling._common import CAT_COLS, NUM_COLS
+from serving import compile_glm, export_bundle, load_bundle
+
+MODEL_PATH = "modeling/models/best_glm.joblib"
+DATA_PATH = "data/jobs_cleaned.parquet"
+
+
+def _median_us(fn, rows) -> float:
+    times = []
+    for row in rows:
+        t0 = time.perf_counter()
+        fn(row)
+        times.append(time.perf_counter() - t0)
+    return 1e6 * float(np.median(times))
+
+
+def main(n_rows: int) -> None:
+    pipe = load(MODEL_PATH)
+    df = pl.read_parquet(DATA_PATH, columns=NUM_COLS + CAT_COLS, n_rows=n_rows)
+    X = df.to_pandas()
+    rows = df.to_dicts()
+
+    compiled = compile_glm(pipe, X_check=X)
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = load_bundle(export_bundle(pipe, tmp))
+
+        reference = pipe.predict(X)
+        compiled_pred = np.array([compiled.predict_one(r) for r in rows])
+
+        results = [
+            (
+                "pipeline",
+                _median_us(pipe.predict, [X.iloc[[i]] for i in range(n_rows)]),
+            ),
+            (
+                "bundle",
+                _median_us(
+                    bundle.predict, [{k: [v] for k, v in r.items()} for r in rows]
+                ),
+            ),
+            ("compiled", _median_us(compiled.predict_one, rows)),
+        ]
+
+    print(f"{'predictor':<12}{'median [us]':>13}{'speed-up':>10}")
+    for name, us in results:
+        print(f"{name:<12}{us:>13.1f}{results[0][1] / us:>9.0f}x")
+    print(f"max |compiled - pipeline| = {np.abs(compiled_pred - reference).max():.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    main(args.rows)
@@ -0,0 +1,77 @@
+"""
+Benchmark: ElasticNet tuning with random search vs. warm-started paths.
+
+Run with:
+python -m benchmarks.bench_glm_path
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from scipy.stats import loguniform
+from sklearn.linear_model import ElasticNet
+from sklearn.metrics import make_scorer
+from sklearn.model_selection import KFold
+from sklearn.pipeline import Pipeline
+
+from modeling import (
+    ElasticNetPathSearchCV,
+    FoldCachedSearchCV,
+    load_split_xy,
+    make_preprocessor,
+    rmse,
+)
+
+
+def main(n_iter: int, n_jobs: int) -> None:
+    X_train, y_train, _, _ = load_split_xy("data/jobs_cleaned.parquet")
+    y_train_log = np.log1p(y_train)
+
+    pipe = Pipeline(
+        [
+            ("preprocess", make_preprocessor()),
+            ("model", ElasticNet(max_iter=5000, random_state=42)),
+        ]
+    )
+    common = dict(
+        scoring=make_scorer(rmse, greater_is_better=False),
+        cv=KFold(n_splits=5, shuffle=True, random_state=42),
+        n_jobs=n_jobs,
+    )
+
+    searches = {
+        f"random ({n_iter} points)": FoldCachedSearchCV(
+            pipe,
+            {
+                "model__alpha": loguniform(1e-4, 1e1),
+                "model__l1_ratio": np.linspace(0.0, 1.0, 6),
+            },
+            n_iter=n_iter,
+            random_state=42,
+            **common,
+        ),
+        "path, cold (180 points)": ElasticNetPathSearchCV(
+            pipe, warm_start=False, **common
+        ),
+        "path, warm (180 points)": ElasticNetPathSearchCV(pipe, **common),
+    }
+
+    print(f"{'search':<26}{'wall [s]':>10}{'CD iters':>10}{'CV RMSE':>10}")
+    for name, search in searches.items():
+        t0 = time.perf_counter()
+        search.fit(X_train, y_train_log)
+        wall = time.perf_counter() - t0
+        n_iter_cd = getattr(search, "n_iter_total_", float("nan"))
+        print(f"{name:<26}{wall:>10.1f}{n_iter_cd:>10}{-search.best_score_:>10.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n-iter", type=int, default=30)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    main(args.n_iter, args.n_jobs)
@@ -0,0 +1,95 @@
+"""
+Benchmark: per-plot group_by passes vs. one compute_group_stats pass.
+
+Writes ``--rows`` postings (resampled from data/jobs_cleaned.parquet) to a
+temporary Parquet file, then times the aggregations the EDA notebook runs, once
+as one ``group_by`` scan per column plus a skills explode (the old plotting
+path) and once as a single ``compute_group_stats`` (exact and approximate).
+
+Run with:
+python -m benchmarks.bench_group_stats --rows 5000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from plotting import GroupStats, compute_group_stats
+
+DATA_PATH = "data/jobs_cleaned.parquet"
+GROUP_COLS = [
+    "experience_level",
+    "company_size",
+    "employment_type",
+    "education_required",
+    "company_location",
+    "company_area",
+    "same_country",
+    "industry",
+    "industry_group",
+]
+
+
+def _per_plot(path: Path) -> None:
+    for col in GROUP_COLS:
+        pl.scan_parquet(path).group_by(col).agg(
+            pl.col("salary_usd").median().alias("median_salary"),
+            pl.len().alias("n"),
+        ).collect()
+    (
+        pl.scan_parquet(path)
+        .select("skills_list")
+        .explode("skills_list")
+        .group_by("skills_list")
+        .len()
+        .collect()
+    )
+
+
+def main(n_rows: int) -> None:
+    df = pl.read_parquet(DATA_PATH)
+    df = df.sample(n_rows, with_replacement=True, seed=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "postings.parquet"
+        df.write_parquet(path)
+        del df
+
+        timings = {}
+        t0 = time.perf_counter()
+        _per_plot(path)
+        timings["per plot"] = time.perf_counter() - t0
+
+        for approx in (False, True):
+            t0 = time.perf_counter()
+            stats = compute_group_stats(
+                pl.scan_parquet(path), GROUP_COLS, approx=approx
+            )
+            timings["one pass" + (" approx" if approx else "")] = (
+                time.perf_counter() - t0
+            )
+
+        cache_dir = stats.save(Path(tmp) / "stats")
+        t0 = time.perf_counter()
+        cached = GroupStats.load(cache_dir)
+        for col in GROUP_COLS:
+            cached.group(col).filter(pl.col("n") >= 20)
+        timings["from cache"] = time.perf_counter() - t0
+
+    print(f"rows={n_rows:,} group columns={len(GROUP_COLS)}")
+    for name, seconds in timings.items():
+        ratio = timings["per plot"] / seconds
+        print(f"{name:<16}{seconds:>8.3f} s  ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    main(args.rows)
@@ -0,0 +1,75 @@
+"""
+Benchmark: LightGBM tuning with RandomizedSearchCV vs. HalvingLGBMSearchCV.
+
+Uses the same search space, folds and candidate sampling as model_tuning.py.
+
+Run with:
+python -m benchmarks.bench_lgbm_search --n-iter 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from lightgbm import LGBMRegressor
+from scipy.stats import loguniform
+from sklearn.metrics import make_scorer
+from sklearn.model_selection import KFold, RandomizedSearchCV
+from sklearn.pipeline import Pipeline
+
+from modeling import HalvingLGBMSearchCV, load_split_xy, make_preprocessor, rmse
+
+PARAM_DIST = {
+    "model__learning_rate": loguniform(1e-3, 2e-1),
+    "model__num_leaves": [15, 31, 63, 127],
+    "model__min_child_weight": loguniform(1e-3, 1e1),
+}
+
+
+def main(n_iter: int, n_jobs: int) -> None:
+    X_train, y_train, X_test, y_test = load_split_xy("data/jobs_cleaned.parquet")
+    y_train_log = np.log1p(y_train)
+
+    pipe = Pipeline(
+        [
+            ("preprocess", make_preprocessor()),
+            ("model", LGBMRegressor(random_state=42, verbosity=-1)),
+        ]
+    )
+    common = dict(
+        n_iter=n_iter,
+        scoring=make_scorer(rmse, greater_is_better=False),
+        cv=KFold(n_splits=5, shuffle=True, random_state=42),
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+
+    searches = {
+        "RandomizedSearchCV": RandomizedSearchCV(
+            pipe,
+            {**PARAM_DIST, "model__n_estimators": [300, 600, 1000, 2000]},
+            **common,
+        ),
+        "HalvingLGBMSearchCV": HalvingLGBMSearchCV(
+            pipe, PARAM_DIST, max_resource=2000, **common
+        ),
+    }
+
+    print(f"{'search':<22}{'wall [s]':>10}{'CV RMSE':>10}{'test RMSE':>11}")
+    for name, search in searches.items():
+        t0 = time.perf_counter()
+        search.fit(X_train, y_train_log)
+        wall = time.perf_counter() - t0
+        test_rmse = rmse(np.log1p(y_test), search.best_estimator_.predict(X_test))
+        print(f"{name:<22}{wall:>10.1f}{-search.best_score_:>10.4f}{test_rmse:>11.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n-iter", type=int, default=30)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    main(args.n_iter, args.n_jobs)
@@ -0,0 +1,74 @@
+"""
+Benchmark: load_split_xy default (object strings) vs. categorical mode.
+
+Each mode runs in a fresh process so peak RSS is measured independently.
+
+Run with:
+python -m benchmarks.bench_load_split --rows 3000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from instrumentation import peak_rss_mb
+from modeling import load_split_xy
+
+
+def make_parquet(n_rows: int, out_path: Path) -> None:
+    # Tile the cleaned Kaggle data up to n_rows with unique job ids
+    base = pl.read_parquet("data/jobs_cleaned.parquet")
+    reps = -(-n_rows // base.height)
+    df = (
+        pl.concat([base] * reps)
+        .head(n_rows)
+        .with_columns(
+            (pl.lit("AI") + pl.int_range(pl.len()).cast(pl.Utf8)).alias("job_id")
+        )
+    )
+    df.write_parquet(out_path)
+
+
+def _run(parquet_path: str, categorical: bool, queue) -> None:
+    rss_before = peak_rss_mb()
+    t0 = time.perf_counter()
+    X_train, y_train, X_test, y_test = load_split_xy(
+        parquet_path, categorical=categorical
+    )
+    elapsed = time.perf_counter() - t0
+    x_mb = (
+        X_train.memory_usage(deep=True).sum() + X_test.memory_usage(deep=True).sum()
+    ) / 2**20
+    queue.put((elapsed, peak_rss_mb() - rss_before, x_mb))
+
+
+def main(n_rows: int) -> None:
+    ctx = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet_path = str(Path(tmp) / "jobs.parquet")
+        make_parquet(n_rows, Path(parquet_path))
+
+        print(f"rows: {n_rows:,}")
+        print(f"{'mode':<12}{'time [s]':>10}{'peak RSS +MB':>14}{'X size MB':>12}")
+        for categorical in (False, True):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(parquet_path, categorical, queue))
+            proc.start()
+            elapsed, rss_mb, x_mb = queue.get()
+            proc.join()
+            mode = "categorical" if categorical else "pandas"
+            print(f"{mode:<12}{elapsed:>10.2f}{rss_mb:>14.0f}{x_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    args = parser.parse_args()
+
+    main(args.rows)
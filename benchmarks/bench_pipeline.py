@@ -0,0 +1,389 @@
+"""
+Benchmark suite: wall time and peak memory of every pipeline stage by data size.
+
+For each ``--rows`` size a fresh process builds raw postings by tiling
+data/jobs_cleaned.parquet (or with ``data.generate_postings`` for
+``--synthetic``; no network needed either way) and runs the stages in order:
+preprocess, create_sample_split, load_split_xy, make_preprocessor
+fit_transform / transform, GLM and LGBM fit / predict, evaluate_predictions and
+lorenz_curve. Every stage reports its wall time and its peak RSS above the RSS
+at stage start (Linux resets the high-water mark per stage; elsewhere the
+process-wide peak is used). With ``--repeat`` the best of several runs is kept.
+
+``--save`` writes the results as JSON; ``--compare`` checks them against such
+a baseline and exits with status 1 when a stage got slower (or bigger) than
+``--threshold`` allows, so CI fails on regressions. Sizes missing from the
+baseline are run without comparison: benchmarks/baseline.json covers 10k, 100k
+and 1M rows, since 10M rows do not fit in the ~5 GB of RAM it was recorded
+with. A run whose process dies
+(e.g. out of memory) or exceeds ``--timeout`` exits with status 2.
+
+Run with:
+python -m benchmarks.bench_pipeline --rows 10000 100000 1000000 10000000
+python -m benchmarks.bench_pipeline --compare benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from instrumentation import peak_rss_mb, reset_peak_rss, rss_mb
+
+DATA_PATH = "data/jobs_cleaned.parquet"
+BASELINE_PATH = Path("benchmarks/baseline.json")
+
+_POLL_SECONDS = 1.0
+
+STAGES = [
+    "preprocess",
+    "create_sample_split",
+    "load_split_xy",
+    "preprocessor_fit_transform",
+    "preprocessor_transform",
+    "glm_fit",
+    "glm_predict",
+    "lgbm_fit",
+    "lgbm_predict",
+    "evaluate_predictions",
+    "lorenz_curve",
+]
+
+# Columns added by preprocess; the rest is the raw Kaggle schema
+ENGINEERED_COLS = [
+    "company_area",
+    "residence_area",
+    "same_country",
+    "industry_group",
+    "skills_list",
+    "num_skills",
+]
+
+
+# ----------------------------
+# Memory
+# ----------------------------
+@contextmanager
+def _measure(results: dict, stage: str):
+    reset_peak_rss()
+    rss_start = rss_mb()
+    t0 = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - t0
+    peak = peak_rss_mb()
+    results[stage] = {"seconds": seconds, "peak_mb": max(peak - rss_start, 0.0)}
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+def make_raw(n_rows: int, synthetic: bool = False) -> pl.DataFrame:
+    """
+    Raw postings (CSV schema, dates as strings): the Kaggle rows tiled up to
+    ``n_rows``, or generated ones.
+    """
+    if synthetic:
+        from data import generate_postings
+
+        return generate_postings(n_rows, seed=0)
+
+    base = pl.read_parquet(DATA_PATH).drop(ENGINEERED_COLS)
+    reps = -(-n_rows // base.height)
+    return (
+        pl.concat([base] * reps)
+        .head(n_rows)
+        .with_columns(
+            (pl.lit("AI") + pl.int_range(pl.len()).cast(pl.Utf8)).alias("job_id"),
+            pl.col("posting_date", "application_deadline").dt.strftime("%Y-%m-%d"),
+        )
+    )
+
+
+def run_stages(
+    n_rows: int, lgbm_rounds: int = 100, synthetic: bool = False
+) -> dict[str, dict]:
+    """Run every stage once on ``n_rows`` postings in this process."""
+    from lightgbm import LGBMRegressor
+    from sklearn.linear_model import ElasticNet
+
+    from data import create_sample_split
+    from evaluating import evaluate_predictions, lorenz_curve
+    from modeling import load_split_xy, make_preprocessor
+    from modeling._common import TARGET
+    from preprocessing import preprocess
+
+    raw = make_raw(n_rows, synthetic)
+    results: dict[str, dict] = {}
+
+    with _measure(results, "preprocess"):
+        clean = preprocess(raw)
+    del raw
+
+    with _measure(results, "create_sample_split"):
+        create_sample_split(clean, id_column="job_id", training_frac=0.8)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "jobs_cleaned.parquet")
+        clean.write_parquet(path)
+        del clean
+        with _measure(results, "load_split_xy"):
+            X_train, y_train, X_test, y_test = load_split_xy(path)
+
+    pre = make_preprocessor()
+    with _measure(results, "preprocessor_fit_transform"):
+        Xt_train = pre.fit_transform(X_train)
+    with _measure(results, "preprocessor_transform"):
+        Xt_test = pre.transform(X_test)
+
+    # Same models as model_training (fewer boosting rounds)
+    y_log = np.log1p(y_train)
+    glm = ElasticNet(alpha=1e-2, l1_ratio=0.5, max_iter=5000, random_state=42)
+    with _measure(results, "glm_fit"):
+        glm.fit(Xt_train, y_log)
+    with _measure(results, "glm_predict"):
+        glm.predict(Xt_test)
+
+    lgbm = LGBMRegressor(
+        n_estimators=lgbm_rounds,
+        learning_rate=0.05,
+        num_leaves=31,
+        random_state=42,
+        verbosity=-1,
+    )
+    with _measure(results, "lgbm_fit"):
+        lgbm.fit(Xt_train, y_log)
+    with _measure(results, "lgbm_predict"):
+        pred = np.expm1(lgbm.predict(Xt_test))
+
+    eval_df = pd.DataFrame({TARGET: y_test, "pred": pred})
+    with _measure(results, "evaluate_predictions"):
+        evaluate_predictions(eval_df, TARGET, preds_column="pred")
+    with _measure(results, "lorenz_curve"):
+        lorenz_curve(y_test, pred, np.ones(len(y_test)))
+
+    return results
+
+
+def _run_in_child(n_rows: int, lgbm_rounds: int, synthetic: bool, queue) -> None:
+    queue.put(run_stages(n_rows, lgbm_rounds, synthetic))
+
+
+def _wait_for_result(proc, queue, timeout: float | None) -> dict:
+    # Poll so that a child that dies (e.g. OOM-killed) or hangs fails the run
+    # instead of blocking the parent forever
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=_POLL_SECONDS)
+        except Empty:
+            pass
+        if not proc.is_alive():
+            try:  # the result may have arrived just before the exit
+                return queue.get(timeout=_POLL_SECONDS)
+            except Empty:
+                raise RuntimeError(f"exited with code {proc.exitcode}") from None
+        if deadline is not None and time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError(f"timed out after {timeout:g} s")
+
+
+def run_suite(
+    sizes: list[int],
+    repeat: int = 1,
+    lgbm_rounds: int = 100,
+    synthetic: bool = False,
+    timeout: float | None = None,
+) -> dict[str, dict]:
+    """
+    ``{str(n_rows): {stage: {"seconds", "peak_mb"}}}``; every run is a fresh
+    process and the minimum over ``repeat`` runs is kept per stage.
+
+    Raises ``RuntimeError`` if a run's process dies or takes longer than
+    ``timeout`` seconds.
+    """
+    ctx = mp.get_context("spawn")
+    results = {}
+    for n_rows in sizes:
+        runs = []
+        for _ in range(repeat):
+            queue = ctx.Queue()
+            proc = ctx.Process(
+                target=_run_in_child, args=(n_rows, lgbm_rounds, synthetic, queue)
+            )
+            proc.start()
+            try:
+                runs.append(_wait_for_result(proc, queue, timeout))
+            except RuntimeError as exc:
+                raise RuntimeError(f"benchmark at {n_rows:,} rows {exc}") from None
+            finally:
+                proc.join()
+        results[str(n_rows)] = {
+            stage: {
+                key: min(run[stage][key] for run in runs)
+                for key in ("seconds", "peak_mb")
+            }
+            for stage in STAGES
+        }
+    return results
+
+
+# ----------------------------
+# Baselines
+# ----------------------------
+def compare(
+    results: dict,
+    baseline: dict,
+    threshold: float = 0.25,
+    min_seconds: float = 0.05,
+    min_mb: float = 32.0,
+) -> list[str]:
+    """
+    Regressions of ``results`` against ``baseline`` (same shape).
+
+    A stage regresses when it is more than ``threshold`` (relative) worse than
+    the baseline and also worse by at least ``min_seconds`` / ``min_mb``, so
+    millisecond stages do not fail on timer noise. Sizes or stages missing
+    from either side are skipped.
+    """
+    limits = {"seconds": min_seconds, "peak_mb": min_mb}
+    failures = []
+    for size, stages in results.items():
+        for stage, measured in stages.items():
+            ref = baseline.get(size, {}).get(stage)
+            if ref is None:
+                continue
+            for key, slack in limits.items():
+                new, old = measured[key], ref[key]
+                if new > old * (1 + threshold) and new - old > slack:
+                    failures.append(
+                        f"{stage} @ {int(size):,} rows: {key} {old:.3g} -> {new:.3g}"
+                    )
+    return failures
+
+
+def _environment() -> dict:
+    import lightgbm
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "numpy": np.__version__,
+        "polars": pl.__version__,
+        "sklearn": sklearn.__version__,
+        "lightgbm": lightgbm.__version__,
+    }
+
+
+def _print_table(results: dict) -> None:
+    sizes = list(results)
+    header = "".join(f"{int(n):>20,}" for n in sizes)
+    print(f"{'stage':<28}{header}")
+    print(f"{'':<28}" + f"{'s':>12}{'MB':>8}" * len(sizes))
+    for stage in STAGES:
+        cells = "".join(
+            f"{results[n][stage]['seconds']:>12.3f}{results[n][stage]['peak_mb']:>8.0f}"
+            for n in sizes
+        )
+        print(f"{stage:<28}{cells}")
+
+
+def main(
+    sizes: list[int],
+    repeat: int = 1,
+    lgbm_rounds: int = 100,
+    synthetic: bool = False,
+    save: str | None = None,
+    baseline: str | None = None,
+    threshold: float = 0.25,
+    timeout: float | None = None,
+) -> int:
+    try:
+        results = run_suite(
+            sizes,
+            repeat=repeat,
+            lgbm_rounds=lgbm_rounds,
+            synthetic=synthetic,
+            timeout=timeout,
+        )
+    except RuntimeError as exc:
+        print(f"FAILED {exc}")
+        return 2
+    _print_table(results)
+
+    if save is not None:
+        payload = {
+            "environment": _environment(),
+            "lgbm_rounds": lgbm_rounds,
+            "synthetic": synthetic,
+            "results": results,
+        }
+        Path(save).write_text(json.dumps(payload, indent=2) + "\n")
+
+    if baseline is None:
+        return 0
+    reference = json.loads(Path(baseline).read_text())
+    if reference.get("lgbm_rounds") != lgbm_rounds:
+        print("warning: baseline was recorded with a different --lgbm-rounds")
+    if reference.get("synthetic", False) != synthetic:
+        print("warning: baseline was recorded on other input data (--synthetic)")
+    for size in results:
+        if size not in reference["results"]:
+            print(f"note: {int(size):,} rows not in {baseline}, not compared")
+    failures = compare(results, reference["results"], threshold=threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if not failures:
+        print(f"no regressions against {baseline} (threshold {threshold:.0%})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--lgbm-rounds", type=int, default=100)
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="generated postings instead of the tiled Kaggle rows",
+    )
+    parser.add_argument("--save", default=None, help="write results to this JSON")
+    parser.add_argument(
+        "--compare", default=None, help=f"baseline JSON, e.g. {BASELINE_PATH}"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="seconds allowed per run"
+    )
+    args = parser.parse_args()
+
+    sys.exit(
+        main(
+            args.rows,
+            repeat=args.repeat,
+            lgbm_rounds=args.lgbm_rounds,
+            synthetic=args.synthetic,
+            save=args.save,
+            baseline=args.compare,
+            threshold=args.threshold,
+            timeout=args.timeout,
+        )
+    )
@@ -1,4 +1,12 @@
-from ._load_data import load_data
+from ._load_data import cache_dataset, cache_utf8_csv, load_data
 from ._sample_split import create_sample_split
+from ._synthetic import generate_postings, write_postings
 
-__all__ = ["load_data", "create_sample_split"]
+__all__ = [
+    "load_data",
+    "cache_dataset",
+    "cache_utf8_csv",
+    "create_sample_split",
+    "generate_postings",
+    "write_postings",
+]
@@ -1,21 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
 from pathlib import Path
 
-import kagglehub
 import polars as pl
 
+from instrumentation import stage
+
+DATASET_HANDLE = "bismasajjad/global-ai-job-market-and-salary-trends-2025"
+CSV_NAME = "ai_job_dataset.csv"
+CSV_ENCODING = "latin1"
+
+CACHE_DIR = Path("data/cache")
+
+# Environment overrides (useful for air-gapped batch nodes and tests)
+ENV_CSV_PATH = "AI_JOBS_CSV"  # local CSV to use instead of kagglehub
+ENV_CACHE_DIR = "AI_JOBS_CACHE_DIR"  # where the Parquet cache lives
+ENV_OFFLINE = "AI_JOBS_OFFLINE"  # "1" -> never call kagglehub
+
+_HASH_CHUNK = 1 << 20
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _file_digest(path: Path) -> str:
+    """
+    SHA-256 of the file content, read in chunks so large dumps stay cheap.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _csv_to_parquet(csv_path: Path, out_path: Path) -> None:
+    # Write to a temporary file first so an interrupted run never leaves a
+    # half-written Parquet behind under the final (content-addressed) name.
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(f".{os.getpid()}.tmp")
+    pl.read_csv(csv_path, encoding=CSV_ENCODING).write_parquet(tmp_path)
+    os.replace(tmp_path, out_path)
+
+
+def _transcode_to_utf8(csv_path: Path, out_path: Path) -> None:
+    # latin1 maps every byte to one character, so decoding in chunks is safe
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(csv_path, encoding=CSV_ENCODING, newline="") as src, open(
+        tmp_path, "w", encoding="utf-8", newline=""
+    ) as dst:
+        shutil.copyfileobj(src, dst, _HASH_CHUNK)
+    os.replace(tmp_path, out_path)
+
+
+def _pointer_path(cache_dir: Path) -> Path:
+    # Remembers which content hash the last Kaggle download resolved to
+    return cache_dir / (DATASET_HANDLE.replace("/", "__") + ".sha256")
+
+
+def _download_csv() -> Path:
+    import kagglehub  # imported lazily: not needed for local / cached runs
+
+    dataset_dir = kagglehub.dataset_download(DATASET_HANDLE)
+    return Path(dataset_dir) / CSV_NAME
+
+
+def cache_dataset(
+    csv_path: str | Path | None = None,
+    *,
+    cache_dir: str | Path | None = None,
+    offline: bool | None = None,
+    refresh: bool = False,
+) -> Path:
+    """
+    Return the path of the cached Parquet copy of the raw dataset.
+
+    The CSV is converted once and stored as ``<sha256>.parquet``, keyed by a
+    content hash of the source file. The source is resolved in this order:
+
+    1. ``csv_path`` argument
+    2. ``AI_JOBS_CSV`` environment variable
+    3. the Kaggle dataset (via kagglehub)
+
+    For the Kaggle source, the hash of the last download is remembered so that
+    later calls read the cache without touching the network. Pass
+    ``refresh=True`` to download again. With ``offline=True`` (or
+    ``AI_JOBS_OFFLINE=1``) kagglehub is never called and a missing cache is
+    an error.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(ENV_CACHE_DIR) or CACHE_DIR
+    cache_dir = Path(cache_dir)
+
+    if offline is None:
+        offline = _env_flag(ENV_OFFLINE)
+
+    if csv_path is None:
+        csv_path = os.environ.get(ENV_CSV_PATH) or None
+
+    # ----------------------------
+    # Local file: hash it and convert if this content is new
+    # ----------------------------
+    if csv_path is not None:
+        csv_path = Path(csv_path)
+        out_path = cache_dir / f"{_file_digest(csv_path)}.parquet"
+        if refresh or not out_path.exists():
+            _csv_to_parquet(csv_path, out_path)
+        return out_path
+
+    # ----------------------------
+    # Kaggle: reuse the last resolved hash unless asked to refresh
+    # ----------------------------
+    pointer = _pointer_path(cache_dir)
+    if not refresh and pointer.exists():
+        out_path = cache_dir / f"{pointer.read_text().strip()}.parquet"
+        if out_path.exists():
+            return out_path
+
+    if offline:
+        raise FileNotFoundError(
+            f"No cached dataset in {cache_dir} and offline mode is on. "
+            f"Set {ENV_CSV_PATH} to a local copy of {CSV_NAME}."
+        )
+
+    downloaded = _download_csv()
+    digest = _file_digest(downloaded)
+    out_path = cache_dir / f"{digest}.parquet"
+    if refresh or not out_path.exists():
+        _csv_to_parquet(downloaded, out_path)
+    pointer.write_text(digest)
+
+    return out_path
+
 
-def load_data() -> pl.DataFrame:
-    file_path = "ai_job_dataset.csv"
+def cache_utf8_csv(
+    csv_path: str | Path,
+    *,
+    cache_dir: str | Path | None = None,
+    refresh: bool = False,
+) -> Path:
+    """
+    Return the path of a UTF-8 copy of a local raw CSV, for lazy scanning.
 
-    dataset_dir = kagglehub.dataset_download(
-        "bismasajjad/global-ai-job-market-and-salary-trends-2025"
-    )
+    Polars' CSV scanner only decodes UTF-8, so the file is transcoded once
+    (decoded as latin1, like ``cache_dataset``) and stored as
+    ``<sha256>.utf8.csv`` next to the Parquet cache. Scanning it gives the same
+    strings as the eager path.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(ENV_CACHE_DIR) or CACHE_DIR
+    csv_path = Path(csv_path)
+    out_path = Path(cache_dir) / f"{_file_digest(csv_path)}.utf8.csv"
+    if refresh or not out_path.exists():
+        _transcode_to_utf8(csv_path, out_path)
+    return out_path
 
-    csv_path = Path(dataset_dir) / file_path
 
-    df = pl.read_csv(
-        csv_path,
-        encoding="latin1",
-    )
+def load_data(
+    csv_path: str | Path | None = None,
+    *,
+    cache_dir: str | Path | None = None,
+    offline: bool | None = None,
+    refresh: bool = False,
+    memory_map: bool = True,
+) -> pl.DataFrame:
+    """
+    Load the raw AI job dataset from the local Parquet cache.
 
+    See ``cache_dataset`` for how the source is resolved and cached.
+    """
+    with stage("load_data") as s:
+        parquet_path = cache_dataset(
+            csv_path, cache_dir=cache_dir, offline=offline, refresh=refresh
+        )
+        df = pl.read_parquet(parquet_path, memory_map=memory_map)
+        s.rows = df.height
     return df
@@ -0,0 +1,443 @@
+"""
+Synthetic job postings with the raw Kaggle schema, for offline scale tests.
+
+Rows are drawn column by column with numpy (no Python loop over rows) from
+skewed categorical distributions, and ``salary_usd`` is a log-linear function
+of experience, location, company size, employment type, education, industry,
+title and skills plus noise, so the models have a real signal to learn. Dates
+are ``YYYY-MM-DD`` strings as in the CSV, so the output goes straight into
+``preprocess``.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+# Same column order as ai_job_dataset.csv
+COLUMNS = [
+    "job_id",
+    "job_title",
+    "salary_usd",
+    "salary_currency",
+    "experience_level",
+    "employment_type",
+    "company_location",
+    "company_size",
+    "employee_residence",
+    "remote_ratio",
+    "required_skills",
+    "education_required",
+    "years_experience",
+    "industry",
+    "posting_date",
+    "application_deadline",
+    "job_description_length",
+    "benefits_score",
+    "company_name",
+]
+
+# ----------------------------
+# Vocabularies: (value, weight, effect on log salary)
+# ----------------------------
+# Experience levels also carry their range of years_experience
+EXPERIENCE = [
+    ("EN", 0.20, -0.35, 0, 1),
+    ("MI", 0.35, -0.05, 2, 4),
+    ("SE", 0.30, 0.25, 5, 9),
+    ("EX", 0.15, 0.60, 10, 19),
+]
+
+# Countries by posting volume; the first 20 are the Kaggle ones (with their
+# relative pay level), the tail falls into the "Other" area in preprocess
+COUNTRIES = [
+    ("United States", 0.25, 0.25),
+    ("United Kingdom", 0.08, 0.14),
+    ("Germany", 0.07, 0.07),
+    ("India", 0.07, -0.27),
+    ("Canada", 0.05, 0.00),
+    ("France", 0.04, 0.02),
+    ("China", 0.04, -0.27),
+    ("Netherlands", 0.03, 0.12),
+    ("Switzerland", 0.025, 0.42),
+    ("Singapore", 0.025, 0.14),
+    ("Australia", 0.025, 0.03),
+    ("Japan", 0.02, -0.23),
+    ("Sweden", 0.02, 0.09),
+    ("Israel", 0.02, -0.24),
+    ("Ireland", 0.015, -0.30),
+    ("South Korea", 0.015, -0.27),
+    ("Denmark", 0.015, 0.39),
+    ("Norway", 0.01, 0.35),
+    ("Austria", 0.01, -0.30),
+    ("Finland", 0.01, -0.22),
+    ("Spain", 0.02, -0.15),
+    ("Poland", 0.015, -0.35),
+    ("Brazil", 0.015, -0.45),
+    ("Portugal", 0.01, -0.30),
+    ("Italy", 0.01, -0.15),
+    ("Mexico", 0.01, -0.50),
+    ("Belgium", 0.008, 0.00),
+    ("United Arab Emirates", 0.007, 0.05),
+    ("Argentina", 0.005, -0.55),
+    ("Nigeria", 0.005, -0.70),
+]
+
+CURRENCY = {
+    "United Kingdom": "GBP",
+    **{
+        c: "EUR"
+        for c in [
+            "Germany",
+            "France",
+            "Netherlands",
+            "Ireland",
+            "Austria",
+            "Finland",
+            "Spain",
+            "Portugal",
+            "Italy",
+            "Belgium",
+        ]
+    },
+}
+
+COMPANY_SIZE = [("S", 0.30, -0.08), ("M", 0.40, 0.0), ("L", 0.30, 0.10)]
+EMPLOYMENT_TYPE = [
+    ("FT", 0.75, 0.0),
+    ("CT", 0.10, 0.05),
+    ("FL", 0.08, -0.05),
+    ("PT", 0.07, -0.25),
+]
+EDUCATION = [
+    ("Bachelor", 0.45, 0.0),
+    ("Master", 0.35, 0.05),
+    ("PhD", 0.12, 0.12),
+    ("Associate", 0.08, -0.08),
+]
+REMOTE_RATIO = [(0, 0.5), (50, 0.3), (100, 0.2)]
+
+INDUSTRIES = [
+    ("Technology", 0.22, 0.08),
+    ("Finance", 0.12, 0.10),
+    ("Healthcare", 0.09, -0.02),
+    ("Consulting", 0.08, 0.03),
+    ("Retail", 0.07, -0.06),
+    ("Telecommunications", 0.06, 0.02),
+    ("Automotive", 0.06, 0.01),
+    ("Manufacturing", 0.06, -0.04),
+    ("Media", 0.05, -0.03),
+    ("Energy", 0.04, 0.04),
+    ("Gaming", 0.04, 0.00),
+    ("Real Estate", 0.03, 0.00),
+    ("Transportation", 0.03, -0.03),
+    ("Education", 0.03, -0.10),
+    ("Government", 0.02, -0.08),
+]
+
+JOB_TITLES = [
+    ("Data Scientist", 0.12, 0.00),
+    ("Machine Learning Engineer", 0.11, 0.05),
+    ("Data Engineer", 0.09, 0.00),
+    ("Data Analyst", 0.08, -0.20),
+    ("AI Software Engineer", 0.07, 0.03),
+    ("AI Research Scientist", 0.05, 0.10),
+    ("ML Ops Engineer", 0.05, 0.02),
+    ("Deep Learning Engineer", 0.05, 0.06),
+    ("NLP Engineer", 0.04, 0.05),
+    ("Computer Vision Engineer", 0.04, 0.05),
+    ("AI Product Manager", 0.04, 0.04),
+    ("AI Consultant", 0.04, -0.02),
+    ("Research Scientist", 0.04, 0.08),
+    ("Machine Learning Researcher", 0.03, 0.08),
+    ("AI Specialist", 0.03, -0.05),
+    ("Robotics Engineer", 0.03, 0.02),
+    ("Autonomous Systems Engineer", 0.025, 0.04),
+    ("AI Architect", 0.02, 0.15),
+    ("Principal Data Scientist", 0.015, 0.25),
+    ("Head of AI", 0.01, 0.35),
+]
+
+SKILLS = [
+    ("Python", 0.16, 0.00),
+    ("SQL", 0.10, -0.02),
+    ("TensorFlow", 0.06, 0.03),
+    ("PyTorch", 0.06, 0.04),
+    ("Kubernetes", 0.05, 0.05),
+    ("AWS", 0.05, 0.03),
+    ("Docker", 0.04, 0.02),
+    ("Spark", 0.04, 0.03),
+    ("Deep Learning", 0.04, 0.04),
+    ("Scala", 0.035, 0.03),
+    ("Linux", 0.035, 0.00),
+    ("Git", 0.035, -0.01),
+    ("Java", 0.03, 0.00),
+    ("GCP", 0.03, 0.03),
+    ("Azure", 0.03, 0.02),
+    ("NLP", 0.03, 0.04),
+    ("Computer Vision", 0.025, 0.04),
+    ("MLOps", 0.025, 0.05),
+    ("Statistics", 0.025, 0.00),
+    ("Mathematics", 0.02, 0.01),
+    ("R", 0.02, -0.02),
+    ("Hadoop", 0.015, 0.00),
+    ("Data Visualization", 0.015, -0.03),
+    ("Tableau", 0.015, -0.04),
+]
+
+KNOWN_COMPANIES = [
+    "TechCorp Inc",
+    "Cognitive Computing",
+    "AI Innovations",
+    "Digital Transformation LLC",
+    "Future Systems",
+    "Quantum Computing Inc",
+    "Cloud AI Solutions",
+    "Predictive Systems",
+    "Smart Analytics",
+    "Advanced Robotics",
+    "Neural Networks Co",
+    "Machine Intelligence Group",
+    "Autonomous Tech",
+    "DataVision Ltd",
+    "DeepTech Ventures",
+    "Algorithmic Solutions",
+]
+
+BASE_LOG_SALARY = 11.3  # median salary ~100k USD overall
+NOISE_SD = 0.22
+FIRST_POSTING = dt.date(2024, 1, 1)
+LAST_POSTING = dt.date(2025, 4, 30)
+
+
+# ----------------------------
+# Sampling helpers
+# ----------------------------
+def _values(table) -> list:
+    return [row[0] for row in table]
+
+
+def _weights(table) -> np.ndarray:
+    w = np.array([row[1] for row in table], dtype=np.float64)
+    return w / w.sum()
+
+
+def _effects(table) -> np.ndarray:
+    return np.array([row[2] for row in table], dtype=np.float64)
+
+
+def _draw(rng: np.random.Generator, table, n: int) -> np.ndarray:
+    """Category codes of ``n`` draws from the weights of ``table``."""
+    return rng.choice(len(table), size=n, p=_weights(table))
+
+
+def _decode(values: list, codes: np.ndarray) -> pl.Series:
+    return pl.Series(values).gather(codes)
+
+
+def _companies(n_companies: int) -> list[str]:
+    extra = [f"Company {k:06d}" for k in range(n_companies - len(KNOWN_COMPANIES))]
+    return KNOWN_COMPANIES + extra
+
+
+def _skills(rng: np.random.Generator, n: int) -> tuple[pl.Series, np.ndarray]:
+    """
+    3 to 5 distinct skills per posting, weighted (Gumbel top-k: sampling
+    without replacement for all rows at once); returns the comma-separated
+    string and the summed salary premium.
+    """
+    keys = np.log(_weights(SKILLS)) + rng.gumbel(size=(n, len(SKILLS)))
+    top = np.argsort(-keys, axis=1)[:, :5]
+    k = rng.integers(3, 6, size=n)
+
+    picked = np.arange(5) < k[:, None]
+    premium = (_effects(SKILLS)[top] * picked).sum(axis=1)
+
+    names = _values(SKILLS)
+    n_picked = pl.Series(k)
+    skills = pl.select(
+        pl.concat_str(
+            [pl.when(n_picked > j).then(_decode(names, top[:, j])) for j in range(5)],
+            separator=", ",
+            ignore_nulls=True,
+        )
+    ).to_series()
+    return skills, premium
+
+
+# ----------------------------
+# Generator
+# ----------------------------
+def generate_postings(
+    n_rows: int,
+    seed: int | np.random.SeedSequence = 0,
+    *,
+    start_id: int = 0,
+    n_companies: int | None = None,
+    missing_rate: float = 0.0,
+) -> pl.DataFrame:
+    """
+    ``n_rows`` synthetic postings with the raw ``ai_job_dataset.csv`` schema.
+
+    Parameters
+    ----------
+    seed : int or SeedSequence
+        Same seed, same rows.
+    start_id : int
+        ``job_id`` of the first row is ``AI{start_id + 1:08d}``.
+    n_companies : int, optional
+        Number of distinct ``company_name`` values (Zipf-distributed);
+        defaults to one company per 200 postings, at least the 16 Kaggle ones.
+    missing_rate : float
+        Share of nulls put into each feature column the models impute
+        (``years_experience`` and the categoricals); 0 like the Kaggle file.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_rows
+
+    # Experience level and years within the level's range
+    level = _draw(rng, EXPERIENCE, n)
+    lo = np.array([row[3] for row in EXPERIENCE])[level]
+    hi = np.array([row[4] for row in EXPERIENCE])[level]
+    years = lo + np.floor(rng.random(n) * (hi - lo + 1)).astype(np.int64)
+
+    # Most people live where the company is
+    location = _draw(rng, COUNTRIES, n)
+    residence = np.where(rng.random(n) < 0.7, location, _draw(rng, COUNTRIES, n))
+
+    size = _draw(rng, COMPANY_SIZE, n)
+    employment = _draw(rng, EMPLOYMENT_TYPE, n)
+    education = _draw(rng, EDUCATION, n)
+    industry = _draw(rng, INDUSTRIES, n)
+    title = _draw(rng, JOB_TITLES, n)
+    remote = np.array(_values(REMOTE_RATIO))[_draw(rng, REMOTE_RATIO, n)]
+    skills, skill_premium = _skills(rng, n)
+
+    log_salary = (
+        BASE_LOG_SALARY
+        + _effects(EXPERIENCE)[level]
+        + 0.015 * (years - lo)
+        + _effects(COUNTRIES)[location]
+        + _effects(COMPANY_SIZE)[size]
+        + _effects(EMPLOYMENT_TYPE)[employment]
+        + _effects(EDUCATION)[education]
+        + _effects(INDUSTRIES)[industry]
+        + _effects(JOB_TITLES)[title]
+        + skill_premium
+        + rng.normal(0.0, NOISE_SD, n)
+    )
+    salary = np.rint(np.exp(log_salary)).astype(np.int64)
+
+    # Company names: a few large employers post most of the jobs
+    if n_companies is None:
+        n_companies = max(len(KNOWN_COMPANIES), n_rows // 200)
+    company_weights = 1.0 / np.arange(1, n_companies + 1) ** 1.1
+    company = rng.choice(n_companies, size=n, p=company_weights / company_weights.sum())
+
+    # Applications stay open for two to ten weeks
+    n_days = (LAST_POSTING - FIRST_POSTING).days + 1
+    posting = np.datetime64(FIRST_POSTING, "D") + rng.integers(0, n_days, size=n)
+    deadline = posting + rng.integers(14, 75, size=n)
+
+    countries = _values(COUNTRIES)
+    df = pl.DataFrame(
+        {
+            "job_id": pl.int_range(start_id + 1, start_id + n + 1, eager=True),
+            "job_title": _decode(_values(JOB_TITLES), title),
+            "salary_usd": salary,
+            "salary_currency": _decode(
+                [CURRENCY.get(c, "USD") for c in countries], location
+            ),
+            "experience_level": _decode(_values(EXPERIENCE), level),
+            "employment_type": _decode(_values(EMPLOYMENT_TYPE), employment),
+            "company_location": _decode(countries, location),
+            "company_size": _decode(_values(COMPANY_SIZE), size),
+            "employee_residence": _decode(countries, residence),
+            "remote_ratio": remote,
+            "required_skills": skills,
+            "education_required": _decode(_values(EDUCATION), education),
+            "years_experience": years,
+            "industry": _decode(_values(INDUSTRIES), industry),
+            "posting_date": posting,
+            "application_deadline": deadline,
+            "job_description_length": rng.integers(500, 2500, size=n),
+            "benefits_score": np.round(rng.uniform(5.0, 10.0, size=n), 1),
+            "company_name": _decode(_companies(n_companies), company),
+        }
+    ).with_columns(
+        pl.format("AI{}", pl.col("job_id").cast(pl.Utf8).str.zfill(8)),
+        # Dates as strings, like the CSV
+        pl.col("posting_date", "application_deadline").dt.strftime("%Y-%m-%d"),
+    )
+
+    if missing_rate > 0:
+        df = df.with_columns(
+            pl.when(pl.Series(rng.random(n) < missing_rate))
+            .then(None)
+            .otherwise(pl.col(c))
+            .alias(c)
+            for c in [
+                "years_experience",
+                "employment_type",
+                "company_location",
+                "industry",
+                "education_required",
+                "company_size",
+            ]
+        )
+
+    return df.select(COLUMNS)
+
+
+def write_postings(
+    path: str | Path,
+    n_rows: int,
+    *,
+    seed: int = 0,
+    chunk_size: int = 250_000,
+    **kwargs,
+) -> Path:
+    """
+    Write ``n_rows`` synthetic postings to a Parquet or CSV file (by suffix),
+    one chunk of ``chunk_size`` rows at a time, so memory is bounded by the
+    chunk size. Every chunk gets its own child seed of ``seed``: the same
+    ``seed`` and ``chunk_size`` give the same file. ``kwargs`` go to
+    ``generate_postings``.
+    """
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix not in (".parquet", ".csv"):
+        raise ValueError(f"Expected a .parquet or .csv path, got {path}")
+
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    if kwargs.get("n_companies") is None:
+        # Same company pool in every chunk
+        kwargs["n_companies"] = max(len(KNOWN_COMPANIES), n_rows // 200)
+
+    writer = None
+    with open(path, "wb") as f:
+        try:
+            for i, chunk_seed in enumerate(seeds):
+                start = i * chunk_size
+                chunk = generate_postings(
+                    min(chunk_size, n_rows - start),
+                    chunk_seed,
+                    start_id=start,
+                    **kwargs,
+                )
+                if path.suffix == ".csv":
+                    chunk.write_csv(f, include_header=i == 0)
+                    continue
+                table = chunk.to_arrow()
+                writer = writer or pq.ParquetWriter(f, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    return path
@@ -0,0 +1,37 @@
+"""
+Write synthetic job postings (raw Kaggle schema) for offline scale tests.
+
+python -m data.generate_synthetic --rows 10000000 --out data/synthetic/jobs.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from data import write_postings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--out",
+        default="data/synthetic/jobs.parquet",
+        help=".parquet or .csv (the CSV can be fed to prepare_data --csv)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument(
+        "--missing-rate", type=float, default=0.0, help="share of null features"
+    )
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    path = write_postings(
+        args.out,
+        args.rows,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        missing_rate=args.missing_rate,
+    )
+    print(f"{args.rows:,} rows -> {path} ({time.perf_counter() - t0:.1f} s)")
@@ -1,19 +1,59 @@
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 
-from data import load_data
+import polars as pl
+
+from data import cache_dataset, cache_utf8_csv, load_data
+from instrumentation import add_profile_arguments, enable_from_args, stage
 from preprocessing import preprocess
 
+OUT_PATH = Path("data/jobs_cleaned.parquet")
 
-def main() -> None:
-    df = load_data()
-    df_clean = preprocess(df)
 
-    out_path = Path("data/jobs_cleaned.parquet")
+def main(
+    csv_path: str | Path | None = None,
+    out_path: str | Path = OUT_PATH,
+    streaming: bool = False,
+) -> None:
+    out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.write_parquet(out_path)
+
+    if not streaming:
+        df = load_data(csv_path)
+        df_clean = preprocess(df)
+        with stage("write", rows=df_clean.height):
+            df_clean.write_parquet(out_path)
+        return
+
+    # ----------------------------
+    # Streaming: scan -> preprocess -> sink, memory bounded by batch size
+    # ----------------------------
+    # Large dumps are scanned from a cached UTF-8 copy (Polars' CSV scanner
+    # only decodes UTF-8), transcoded with the same latin1 decoding as the
+    # eager path. Without an explicit CSV we scan the cached Parquet copy.
+    if csv_path is not None:
+        with stage("transcode_utf8"):
+            lf = pl.scan_csv(cache_utf8_csv(csv_path))
+    else:
+        lf = pl.scan_parquet(cache_dataset())
+
+    with stage("preprocess_streaming"):
+        preprocess(lf).sink_parquet(out_path, engine="streaming")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Create data/jobs_cleaned.parquet")
+    parser.add_argument("--csv", default=None, help="local raw CSV to preprocess")
+    parser.add_argument("--out", default=str(OUT_PATH), help="output Parquet path")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="run scan -> preprocess -> sink_parquet with the streaming engine",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    main(args.csv, args.out, streaming=args.streaming)
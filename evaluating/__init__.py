@@ -1,3 +1,20 @@
-from ._evaluation import evaluate_predictions, lorenz_curve
+from ._attribution import grouped_shap
+from ._bootstrap import bootstrap_metrics
+from ._evaluation import evaluate_predictions, evaluate_predictions_multi, lorenz_curve
+from ._lorenz import LorenzSketch, gini_exact
+from ._partial_dependence import partial_dependence_batched
+from ._report import Figure, build_report, file_digest
 
-__all__ = ["lorenz_curve", "evaluate_predictions"]
+__all__ = [
+    "lorenz_curve",
+    "gini_exact",
+    "LorenzSketch",
+    "evaluate_predictions",
+    "evaluate_predictions_multi",
+    "bootstrap_metrics",
+    "partial_dependence_batched",
+    "grouped_shap",
+    "Figure",
+    "build_report",
+    "file_digest",
+]
@@ -0,0 +1,188 @@
+"""
+Bootstrap confidence intervals for the ``evaluate_predictions`` metrics.
+
+A resample is a vector of multinomial counts ``c`` (how often each row is
+drawn), so every metric is a ratio of weighted sums and a chunk of resamples
+reduces to one ``(B, n) @ (n, k)`` product. The Gini needs the rows ordered by
+prediction; they are sorted once, and the Lorenz area of a resample follows
+in closed form from the counts (a row drawn ``c`` times adds ``c`` adjacent
+points to the curve), so no resample is ever sorted or materialized.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from glum import TweedieDistribution
+from joblib import Parallel, delayed, effective_n_jobs
+
+from instrumentation import instrumented
+
+METRICS = [
+    "mean_preds",
+    "mean_outcome",
+    "bias",
+    "mse",
+    "rmse",
+    "mae",
+    "deviance",
+    "gini",
+]
+
+# Resamples per random stream (the unit chunks are made of)
+_BLOCK = 32
+# (resample, row) cells in flight over all workers; a chunk's temporaries take
+# roughly 40 bytes per cell, so this caps them at about 300 MB in total
+_MAX_CELLS = 2**23
+
+
+def _gini_from_counts(counts: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """
+    Gini of each resample (row of ``counts``), rows already sorted by
+    prediction; equals ``1 - 2 * auc(lorenz_curve(...))`` on the resample.
+    """
+    m = counts.sum(axis=1)
+    cum = np.cumsum(counts * value, axis=1)
+    total = cum[:, -1]
+    # Sum of the cumulated outcome over all m points of the resampled curve:
+    # a row drawn c times after cumulated S_prev adds c * S_prev + v c (c + 1) / 2
+    cum_sum = (
+        np.einsum("ij,ij->i", counts, cum) - 0.5 * (counts**2 @ value) + 0.5 * total
+    )
+    first = value[np.argmax(counts > 0, axis=1)]
+    area = (cum_sum / total - 0.5 * (first / total + 1)) / (m - 1)
+    return 1 - 2 * area
+
+
+def _metrics_from_counts(counts: np.ndarray, columns: np.ndarray, value: np.ndarray):
+    """All metrics for a chunk of resamples; ``columns`` is the per-row table."""
+    sums = counts @ columns
+    sum_w = sums[:, 0]
+    mean_preds, mean_outcome, mse, mae, deviance = sums[:, 1:].T / sum_w
+    return np.column_stack(
+        [
+            mean_preds,
+            mean_outcome,
+            (mean_preds - mean_outcome) / mean_outcome,
+            mse,
+            np.sqrt(mse),
+            mae,
+            deviance,
+            _gini_from_counts(counts, value),
+        ]
+    )
+
+
+def _draw_counts(rng, n_resamples: int, n: int) -> np.ndarray:
+    """
+    Multinomial(n, 1/n) counts (how often each row is drawn with replacement)
+    for ``n_resamples`` resamples, as one int32 ``(n_resamples, n)`` array.
+    """
+    # Row b's draws are offset by b * n, so one bincount counts all resamples
+    # (several times faster than rng.multinomial with n equal probabilities)
+    draws = rng.integers(0, n, (n_resamples, n), dtype=np.int64)
+    draws += np.arange(0, n_resamples * n, n)[:, None]
+    return (
+        np.bincount(draws.ravel(), minlength=n_resamples * n)
+        .astype(np.int32)
+        .reshape(n_resamples, n)
+    )
+
+
+def _bootstrap_chunk(seeds, sizes, columns, value):
+    # One stream per block of resamples, so the draws do not depend on how
+    # blocks are grouped into chunks (i.e. on n_jobs or chunk_size)
+    n = len(value)
+    bounds = np.cumsum([0, *sizes])
+    counts = np.empty((bounds[-1], n), dtype=np.int32)
+    for s, lo, hi in zip(seeds, bounds[:-1], bounds[1:]):
+        counts[lo:hi] = _draw_counts(np.random.default_rng(s), hi - lo, n)
+    return _metrics_from_counts(counts, columns, value)
+
+
+@instrumented()
+def bootstrap_metrics(
+    df,
+    outcome_column,
+    *,
+    preds_column=None,
+    model=None,
+    tweedie_power=1.5,
+    exposure_column=None,
+    n_boot=1000,
+    level=0.95,
+    seed=0,
+    chunk_size=None,
+    n_jobs=1,
+):
+    """
+    Percentile bootstrap confidence intervals for the metrics of
+    ``evaluate_predictions``.
+
+    Resamples are drawn in blocks of 32 from independent streams spawned from
+    ``seed``, so the result depends only on ``seed`` and ``n_boot``. Blocks are
+    grouped into chunks of about ``chunk_size`` resamples (default: sized so
+    that all ``n_jobs`` workers together hold about 2**23 counts) that run in
+    parallel.
+
+    Returns a DataFrame with one row per metric and the columns
+    ``estimate`` (full sample), ``std``, ``lower`` and ``upper``.
+    """
+    assert preds_column or model, "Please either provide the column name of"
+    " the pre-computed predictions or a model to predict from."
+    if preds_column is None:
+        preds = np.asarray(model.predict(df), dtype=np.float64)
+    else:
+        preds = np.asarray(df[preds_column], dtype=np.float64)
+
+    y = np.asarray(df[outcome_column], dtype=np.float64)
+    if exposure_column:
+        weights = np.asarray(df[exposure_column], dtype=np.float64)
+    else:
+        weights = np.ones(len(y))
+
+    # Sort once by prediction (as lorenz_curve does); all sums are invariant
+    order = np.argsort(preds)
+    preds, y, weights = preds[order], y[order], weights[order]
+
+    unit_deviance = TweedieDistribution(tweedie_power).unit_deviance(y, preds)
+    columns = np.column_stack(
+        [
+            weights,
+            weights * preds,
+            weights * y,
+            weights * (preds - y) ** 2,
+            weights * np.abs(preds - y),
+            weights * unit_deviance,
+        ]
+    )
+    value = y * weights
+
+    n = len(y)
+    sizes = [_BLOCK] * (n_boot // _BLOCK)
+    if n_boot % _BLOCK:
+        sizes.append(n_boot % _BLOCK)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if chunk_size is None:
+        chunk_size = _MAX_CELLS // (n * effective_n_jobs(n_jobs))
+    per_chunk = max(1, chunk_size // _BLOCK)
+    blocks = [slice(i, i + per_chunk) for i in range(0, len(sizes), per_chunk)]
+
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_chunk)(seeds[b], sizes[b], columns, value) for b in blocks
+    )
+    samples = np.vstack(chunks)
+
+    estimate = _metrics_from_counts(np.ones((1, n)), columns, value)[0]
+    tail = 100 * (1 - level) / 2
+    lower, upper = np.percentile(samples, [tail, 100 - tail], axis=0)
+    return pd.DataFrame(
+        {
+            "estimate": estimate,
+            "std": samples.std(axis=0, ddof=1),
+            "lower": lower,
+            "upper": upper,
+        },
+        index=METRICS,
+    )
@@ -0,0 +1,191 @@
+"""
+Headless, incremental figure rendering for the model reports.
+
+A report is a list of ``Figure`` specs. For every figure a key is hashed from
+its name, the code of its renderer and data function, an optional version
+string and its declared inputs (e.g. model and data file digests);
+figures whose key matches the previous run's manifest and whose file still
+exists are skipped without computing their data. The data of the remaining
+figures is prepared in the parent process and the figures are rendered
+concurrently in a process pool on matplotlib's Agg backend. A
+``manifest.json`` next to the figures records key, status and timings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+MANIFEST_NAME = "manifest.json"
+_HASH_CHUNK = 1 << 20
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 of a file (e.g. a model or the data), read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _code_digest(func: Callable) -> str:
+    """
+    Hash of a function's bytecode, constants and referenced names (nested
+    functions included), so editing e.g. ``bins=300`` changes it. Independent
+    of the module name, which is ``__main__`` when run as a script.
+    """
+    h = hashlib.sha256()
+
+    def update(code) -> None:
+        h.update(code.co_code)
+        h.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if hasattr(const, "co_code"):
+                update(const)
+            elif isinstance(const, frozenset):  # set order varies per process
+                h.update(repr(sorted(map(repr, const))).encode())
+            else:
+                h.update(repr(const).encode())
+
+    update(func.__code__)
+    return h.hexdigest()
+
+
+class Figure:
+    """
+    One output figure.
+
+    Parameters
+    ----------
+    name : str
+        Output path relative to the report directory (e.g. ``"pdp/a.png"``).
+    render : callable
+        Module-level function called as ``render(**data, out_path=path)`` in a
+        worker process; it must save the figure to ``out_path``.
+    prepare : callable
+        Zero-argument function returning ``data``; only called when the
+        figure has to be rendered.
+    inputs : list of str
+        Everything the figure depends on (model / data digests, settings).
+    version : str
+        Bump to re-render when something outside ``render`` / ``prepare``
+        changes the figure (e.g. a helper they call).
+
+    The code of ``render`` and ``prepare`` is part of the key, so editing a
+    renderer re-renders its figures (as does a Python upgrade, which changes
+    the bytecode).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        render: Callable,
+        prepare: Callable[[], dict],
+        inputs,
+        version: str = "",
+    ):
+        self.name = name
+        self.render = render
+        self.prepare = prepare
+        self.inputs = [str(i) for i in inputs]
+        self.version = version
+
+    @property
+    def key(self) -> str:
+        payload = json.dumps(
+            [
+                self.name,
+                self.render.__qualname__,
+                _code_digest(self.render),
+                _code_digest(self.prepare),
+                self.version,
+                self.inputs,
+            ]
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _init_worker() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render(render: Callable, data: dict, out_path: Path) -> float:
+    t0 = time.perf_counter()
+    render(**data, out_path=out_path)
+    return time.perf_counter() - t0
+
+
+def build_report(
+    figures: list[Figure],
+    out_dir: str | Path,
+    *,
+    n_workers: int | None = None,
+    force: bool = False,
+) -> dict:
+    """
+    Render the stale ``figures`` into ``out_dir`` and write the manifest.
+
+    ``n_workers=0`` renders in the current process; ``None`` uses one worker
+    per CPU. ``force`` re-renders everything. Returns the manifest.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    previous = {}
+    if manifest_path.exists():
+        previous = json.loads(manifest_path.read_text()).get("figures", {})
+
+    t_start = time.perf_counter()
+    entries: dict[str, dict] = {}
+    stale = []
+    for fig in figures:
+        old = previous.get(fig.name, {})
+        if not force and old.get("key") == fig.key and (out_dir / fig.name).exists():
+            entries[fig.name] = {**old, "status": "skipped"}
+        else:
+            stale.append(fig)
+
+    # Prepare all data first (in order, so shared computations are cached),
+    # then render everything concurrently
+    jobs = []
+    for fig in stale:
+        t0 = time.perf_counter()
+        data = fig.prepare()
+        out_path = out_dir / fig.name
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((fig, data, out_path, time.perf_counter() - t0))
+
+    if n_workers == 0:
+        _init_worker()
+        render_seconds = [_render(f.render, d, p) for f, d, p, _ in jobs]
+    else:
+        n_workers = n_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render, f.render, d, p) for f, d, p, _ in jobs]
+            render_seconds = [fut.result() for fut in futures]
+
+    for (fig, _, _, prepare_s), render_s in zip(jobs, render_seconds):
+        entries[fig.name] = {
+            "key": fig.key,
+            "inputs": fig.inputs,
+            "status": "rendered",
+            "prepare_seconds": round(prepare_s, 4),
+            "render_seconds": round(render_s, 4),
+        }
+
+    manifest = {
+        "total_seconds": round(time.perf_counter() - t_start, 4),
+        "rendered": len(jobs),
+        "skipped": len(figures) - len(jobs),
+        "figures": {fig.name: entries[fig.name] for fig in figures},
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return manifest
@@ -1,29 +1,74 @@
+"""
+Compare the tuned GLM and LGBM on the test split and build the report figures.
+
+The evaluation table is always printed; it also lists the LGBM with native
+categoricals when modeling/models/best_lgbm_native.joblib exists, whose
+top-5 gain importances are printed by original column. The figures cover the
+GLM and the one-hot LGBM only. Figures are built with
+``build_report``: only those whose model or data changed since the last run
+are recomputed, and they are rendered in parallel (see
+reports/figures/manifest.json for timings).
+
+python -m evaluating.compare_model [--workers N] [--force] [--profile]
+"""
+
+import argparse
+from functools import cache
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
 import polars as pl
 from joblib import load
-from sklearn.inspection import PartialDependenceDisplay
 
 from data import create_sample_split
-from evaluating import evaluate_predictions
+from evaluating import (
+    Figure,
+    build_report,
+    evaluate_predictions_multi,
+    file_digest,
+    grouped_shap,
+    partial_dependence_batched,
+)
+from instrumentation import add_profile_arguments, enable_from_args, stage
 from modeling._common import CAT_COLS, NUM_COLS, TARGET
+from plotting import DENSITY_THRESHOLD, plot_density
 
 # ----------------------------
 # Settings
 # ----------------------------
 OUT_DIR = Path("reports/figures")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+DATA_PATH = Path("data/jobs_cleaned.parquet")
+MODEL_PATHS = {
+    "glm": Path("modeling/models/best_glm.joblib"),  # Pipeline(preprocess + ElasticNet)
+    "lgbm": Path("modeling/models/best_lgbm.joblib"),  # Pipeline(preprocess + LGBM)
+    # Pipeline(native preprocessor + LGBM), optional
+    "lgbm_native": Path("modeling/models/best_lgbm_native.joblib"),
+}
+TRAINING_FRAC = 0.8
+
 
-PDP_DIR = OUT_DIR / "pdp"
-PDP_DIR.mkdir(parents=True, exist_ok=True)
+def top_gain_features(pipe, k: int = 5):
+    """
+    Indices, names and total gain of the ``k`` features of a fitted
+    Pipeline(preprocess + LGBMRegressor) with the largest gain importance.
+    """
+    names = pipe.named_steps["preprocess"].get_feature_names_out()
+    gain = pipe.named_steps["model"].booster_.feature_importance("gain")
+    idx = np.argsort(gain)[::-1][:k]
+    return idx, [str(names[i]) for i in idx], gain[idx]
 
 
+# ----------------------------
+# Renderers (run in worker processes)
+# ----------------------------
 def predicted_vs_actual(y_true, y_pred, title: str, out_path: Path) -> None:
-    # Predicted vs Actual plot
+    # Predicted vs Actual plot (binned density for large test sets)
     plt.figure()
-    plt.scatter(y_true, y_pred, s=10, alpha=0.3)
+    if len(y_true) > DENSITY_THRESHOLD:
+        plot_density(y_true, y_pred, bins=300)
+    else:
+        plt.scatter(y_true, y_pred, s=10, alpha=0.3)
     lo = float(min(np.min(y_true), np.min(y_pred)))
     hi = float(max(np.max(y_true), np.max(y_pred)))
     plt.plot([lo, hi], [lo, hi])
@@ -34,108 +79,196 @@ def predicted_vs_actual(y_true, y_pred, title: str, out_path: Path) -> None:
     plt.close()
 
 
-# ----------------------------
-# Load cleaned data + split
-# ----------------------------
-df = pl.read_parquet("data/jobs_cleaned.parquet")
-df = create_sample_split(df, id_column="job_id", training_frac=0.8)
-test_df = df.filter(pl.col("sample") == "test")
+def importance_bar(names, values, ylabel: str, title: str, out_path: Path) -> None:
+    plt.figure()
+    plt.bar(range(1, len(names) + 1), values)
+    plt.xticks(range(1, len(names) + 1), names, rotation=90)
+    plt.xlabel("Feature")
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.savefig(out_path, dpi=200, bbox_inches="tight")
+    plt.close()
 
-feature_cols = NUM_COLS + CAT_COLS
-X_test = test_df.select(feature_cols).to_pandas()
-y_test = test_df.select(TARGET).to_numpy().ravel()
 
-# ----------------------------
-# Load tuned models
-# ----------------------------
-best_glm = load("modeling/models/best_glm.joblib")  # Pipeline(preprocess + ElasticNet)
-best_lgbm = load("modeling/models/best_lgbm.joblib")  # Pipeline(preprocess + LGBM)
+def pdp_plot(fname: str, grid, average, individual, out_path: Path) -> None:
+    plt.figure()
+    # ICE curves of 50 rows behind the average
+    plt.plot(grid, individual[:50].T, color="grey", alpha=0.2, lw=0.5)
+    plt.plot(grid, average, marker="o" if len(grid) < 10 else None)
+    plt.xlabel(fname)
+    plt.ylabel("Partial dependence (log salary)")
+    plt.title(f"PDP (LGBM): {fname}")
+    plt.savefig(out_path, dpi=200, bbox_inches="tight")
+    plt.close()
 
-# ----------------------------
-# Predict (both trained on log-target)
-# ----------------------------
-pred_glm = np.expm1(best_glm.predict(X_test))
-pred_lgbm = np.expm1(best_lgbm.predict(X_test))
 
-# ----------------------------
-# PS4-style evaluation table
-# ----------------------------
-eval_df = X_test.copy()
-eval_df[TARGET] = y_test
-eval_df["pred_glm"] = pred_glm
-eval_df["pred_lgbm"] = pred_lgbm
+def main(n_workers: int | None = None, force: bool = False) -> dict:
+    # ----------------------------
+    # Load cleaned data + split
+    # ----------------------------
+    with stage("load") as s:
+        df = pl.read_parquet(DATA_PATH)
+        df = create_sample_split(df, id_column="job_id", training_frac=TRAINING_FRAC)
+        test_df = df.filter(pl.col("sample") == "test")
 
-print("=== Evaluation: Tuned GLM (ElasticNet, log-target) ===")
-print(evaluate_predictions(eval_df, TARGET, preds_column="pred_glm", tweedie_power=1.5))
+        feature_cols = NUM_COLS + CAT_COLS
+        X_test = test_df.select(feature_cols).to_pandas()
+        y_test = test_df.select(TARGET).to_numpy().ravel()
+        s.rows = len(X_test)
 
-print("\n=== Evaluation: Tuned LGBM (log-target) ===")
-print(
-    evaluate_predictions(eval_df, TARGET, preds_column="pred_lgbm", tweedie_power=1.5)
-)
+    # ----------------------------
+    # Load tuned models + predict (both trained on log-target)
+    # ----------------------------
+    best_glm = load(MODEL_PATHS["glm"])
+    best_lgbm = load(MODEL_PATHS["lgbm"])
+    native_path = MODEL_PATHS["lgbm_native"]
+    best_native = load(native_path) if native_path.exists() else None
 
-# ----------------------------
-# Predicted vs Actual plots
-# ----------------------------
-predicted_vs_actual(
-    y_test,
-    pred_glm,
-    "Predicted vs Actual (Tuned GLM)",
-    OUT_DIR / "pred_vs_actual_glm.png",
-)
+    with stage("predict", rows=len(X_test)):
+        pred_glm = np.expm1(best_glm.predict(X_test))
+        pred_lgbm = np.expm1(best_lgbm.predict(X_test))
+        if best_native is not None:
+            pred_native = np.expm1(best_native.predict(X_test))
 
-predicted_vs_actual(
-    y_test,
-    pred_lgbm,
-    "Predicted vs Actual (Tuned LGBM)",
-    OUT_DIR / "pred_vs_actual_lgbm.png",
-)
+    # ----------------------------
+    # PS4-style evaluation table
+    # ----------------------------
+    eval_df = X_test.copy()
+    eval_df[TARGET] = y_test
+    eval_df["pred_glm"] = pred_glm
+    eval_df["pred_lgbm"] = pred_lgbm
+    preds_columns = ["pred_glm", "pred_lgbm"]
+    if best_native is not None:
+        eval_df["pred_lgbm_native"] = pred_native
+        preds_columns.append("pred_lgbm_native")
 
-# ----------------------------
-# Feature importance (Top 5) for LGBM
-# ----------------------------
-pre = best_lgbm.named_steps["preprocess"]
-model = best_lgbm.named_steps["model"]
+    print("=== Evaluation: Tuned GLM vs. LGBM (log-target) ===")
+    print(
+        evaluate_predictions_multi(
+            eval_df, TARGET, preds_columns=preds_columns, tweedie_power=1.5
+        )
+    )
 
-feature_names = pre.get_feature_names_out()
-importances = model.feature_importances_
+    # ----------------------------
+    # Feature importance (Top 5) for LGBM
+    # ----------------------------
+    pre = best_lgbm.named_steps["preprocess"]
+    model = best_lgbm.named_steps["model"]
 
-top5_idx = np.argsort(importances)[::-1][:5]
-top5_names = [feature_names[i] for i in top5_idx]
+    top5_idx, top5_names, top5_gain = top_gain_features(best_lgbm)
 
-print("\nTop 5 features (LGBM gain importance):")
-for i, name in enumerate(top5_names, 1):
-    print(f"{i}. {name}")
+    print("\nTop 5 features (LGBM gain importance):")
+    for i, name in enumerate(top5_names, 1):
+        print(f"{i}. {name}")
 
-# Bar plot / 棒グラフ
-plt.figure()
-plt.bar(range(1, 6), [importances[i] for i in top5_idx])
-plt.xticks(range(1, 6), top5_names, rotation=90)
-plt.xlabel("Feature")
-plt.ylabel("Importance (gain)")
-plt.title("Top 5 Feature Importances (LGBM)")
-plt.savefig(OUT_DIR / "lgbm_top5_feature_importance.png", dpi=200, bbox_inches="tight")
-plt.close()
+    if best_native is not None:
+        # One column per original feature: drop the "num__" / "cat__" prefix
+        _, native_names, _ = top_gain_features(best_native)
+        print("\nTop 5 features (LGBM native categoricals, gain importance):")
+        for i, name in enumerate(native_names, 1):
+            print(f"{i}. {name.split('__', 1)[-1]}")
 
-# ----------------------------
-# Partial Dependence Plots (PDP) for top 5
-# ----------------------------
-# Compute PDP on preprocessed matrix to avoid name issues
+    # ----------------------------
+    # Expensive figure data, computed only if a figure needs it
+    # ----------------------------
+    @cache
+    def pdp_results():
+        # All five features and their grid values in one batched predict call
+        # on the sparse preprocessed matrix
+        with stage("partial_dependence"):
+            Xt = pre.transform(X_test)
+            return partial_dependence_batched(model, Xt, list(top5_idx))
 
-X_test_pre = pre.transform(X_test)
+    def shap_data():
+        # One-hot columns are summed back onto their input column
+        X_shap = X_test.sample(n=min(3000, len(X_test)), random_state=0)
+        with stage("grouped_shap", rows=len(X_shap)):
+            _, shap_importance = grouped_shap(best_lgbm, X_shap, n_jobs=-1)
+        print("\nFeature importance (LGBM, mean |SHAP| per original feature):")
+        print(shap_importance)
+        return {
+            "names": list(shap_importance.index),
+            "values": shap_importance.to_numpy(),
+            "ylabel": "Mean |SHAP| (log salary)",
+            "title": "Grouped SHAP Feature Importance (LGBM)",
+        }
 
-if hasattr(X_test_pre, "toarray"):
-    X_test_pre = X_test_pre.toarray()
+    # ----------------------------
+    # Report figures
+    # ----------------------------
+    data_inputs = [file_digest(DATA_PATH), f"training_frac={TRAINING_FRAC}"]
+    glm_inputs = [file_digest(MODEL_PATHS["glm"]), *data_inputs]
+    lgbm_inputs = [file_digest(MODEL_PATHS["lgbm"]), *data_inputs]
 
-for idx, fname in zip(top5_idx, top5_names):
-    plt.figure()
-    PartialDependenceDisplay.from_estimator(
-        model,
-        X_test_pre,
-        features=[idx],
-        feature_names=feature_names,
-        kind="average",
+    figures = [
+        Figure(
+            "pred_vs_actual_glm.png",
+            predicted_vs_actual,
+            lambda: {
+                "y_true": y_test,
+                "y_pred": pred_glm,
+                "title": "Predicted vs Actual (Tuned GLM)",
+            },
+            glm_inputs,
+        ),
+        Figure(
+            "pred_vs_actual_lgbm.png",
+            predicted_vs_actual,
+            lambda: {
+                "y_true": y_test,
+                "y_pred": pred_lgbm,
+                "title": "Predicted vs Actual (Tuned LGBM)",
+            },
+            lgbm_inputs,
+        ),
+        Figure(
+            "lgbm_top5_feature_importance.png",
+            importance_bar,
+            lambda: {
+                "names": top5_names,
+                "values": top5_gain,
+                "ylabel": "Importance (gain)",
+                "title": "Top 5 Feature Importances (LGBM)",
+            },
+            lgbm_inputs,
+        ),
+        Figure(
+            "lgbm_grouped_shap_importance.png", importance_bar, shap_data, lgbm_inputs
+        ),
+    ]
+    for k, fname in enumerate(top5_names):
+        safe_name = fname.replace(":", "_").replace(" ", "_").replace("/", "_")
+        figures.append(
+            Figure(
+                f"pdp/pdp_{safe_name}.png",
+                pdp_plot,
+                lambda k=k, fname=fname: {
+                    "fname": fname,
+                    "grid": pdp_results()[k]["grid"],
+                    "average": pdp_results()[k]["average"],
+                    "individual": pdp_results()[k]["individual"],
+                },
+                lgbm_inputs,
+            )
+        )
+
+    with stage("build_report"):
+        manifest = build_report(figures, OUT_DIR, n_workers=n_workers, force=force)
+    print(
+        f"\nFigures: {manifest['rendered']} rendered, {manifest['skipped']} "
+        f"unchanged ({manifest['total_seconds']:.1f} s, see {OUT_DIR}/manifest.json)"
     )
-    plt.title(f"PDP (LGBM): {fname}")
-    safe_name = fname.replace(":", "_").replace(" ", "_").replace("/", "_")
-    plt.savefig(PDP_DIR / f"pdp_{safe_name}.png", dpi=200, bbox_inches="tight")
-    plt.close()
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers", type=int, default=None, help="0 renders in the main process"
+    )
+    parser.add_argument("--force", action="store_true", help="re-render everything")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    main(n_workers=args.workers, force=args.force)
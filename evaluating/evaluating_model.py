@@ -1,18 +1,25 @@
+from pathlib import Path
+
 import numpy as np
 import polars as pl
 from joblib import load
 
 from data import create_sample_split
-from evaluating import evaluate_predictions
+from evaluating import bootstrap_metrics, evaluate_predictions_multi
+from instrumentation import stage
 from modeling._common import CAT_COLS, NUM_COLS, TARGET
 
 print(CAT_COLS, NUM_COLS)
 
+# AI_JOBS_PROFILE=1 records the stages below in reports/profile.json
+
 # ----------------------------
 # Load cleaned data + split (same deterministic split)
 # ----------------------------
-df = pl.read_parquet("data/jobs_cleaned.parquet")
-df = create_sample_split(df, id_column="job_id", training_frac=0.8)
+with stage("load") as s:
+    df = pl.read_parquet("data/jobs_cleaned.parquet")
+    df = create_sample_split(df, id_column="job_id", training_frac=0.8)
+    s.rows = df.height
 
 test_df = df.filter(pl.col("sample") == "test")
 
@@ -32,10 +39,11 @@ best_lgbm = load("modeling/models/best_lgbm.joblib")
 # Predict
 # (GLM is ElasticNet on log-target)
 # ----------------------------
-pred_glm = np.expm1(best_glm.predict(X_test))
+with stage("predict", rows=len(X_test)):
+    pred_glm = np.expm1(best_glm.predict(X_test))
 
-# (LGBM is trained on log-target)
-pred_lgbm = np.expm1(best_lgbm.predict(X_test))
+    # (LGBM is trained on log-target)
+    pred_lgbm = np.expm1(best_lgbm.predict(X_test))
 
 # ----------------------------
 # Evaluate using PS4-style function
@@ -45,10 +53,30 @@ eval_df[TARGET] = y_test
 eval_df["pred_glm"] = pred_glm
 eval_df["pred_lgbm"] = pred_lgbm
 
-print("=== Evaluation: Tuned GLM (ElasticNet, log-target) ===")
-print(evaluate_predictions(eval_df, TARGET, preds_column="pred_glm", tweedie_power=1.5))
+# ----------------------------
+# LGBM with native categoricals (written by model_tuning.py)
+# ----------------------------
+native_path = Path("modeling/models/best_lgbm_native.joblib")
+if native_path.exists():
+    best_lgbm_native = load(native_path)
+    eval_df["pred_lgbm_native"] = np.expm1(best_lgbm_native.predict(X_test))
 
-print("\n=== Evaluation: Tuned LGBM (log-target) ===")
+# All models in one pass: one column per model
+preds_columns = [c for c in eval_df.columns if c.startswith("pred_")]
+print("=== Evaluation: tuned models (log-target) ===")
 print(
-    evaluate_predictions(eval_df, TARGET, preds_column="pred_lgbm", tweedie_power=1.5)
+    evaluate_predictions_multi(
+        eval_df, TARGET, preds_columns=preds_columns, tweedie_power=1.5
+    )
 )
+
+# ----------------------------
+# Bootstrap 95% confidence intervals
+# ----------------------------
+for col in preds_columns:
+    print(f"\n=== Bootstrap 95% CI: {col} ===")
+    print(
+        bootstrap_metrics(
+            eval_df, TARGET, preds_column=col, tweedie_power=1.5, n_boot=1000, n_jobs=-1
+        )
+    )
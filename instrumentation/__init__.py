@@ -0,0 +1,27 @@
+from ._stages import (
+    add_profile_arguments,
+    disable,
+    enable,
+    enable_from_args,
+    instrumented,
+    peak_rss_mb,
+    records,
+    reset,
+    reset_peak_rss,
+    rss_mb,
+    stage,
+)
+
+__all__ = [
+    "stage",
+    "instrumented",
+    "enable",
+    "disable",
+    "records",
+    "reset",
+    "add_profile_arguments",
+    "enable_from_args",
+    "rss_mb",
+    "peak_rss_mb",
+    "reset_peak_rss",
+]
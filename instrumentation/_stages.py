@@ -0,0 +1,419 @@
+"""
+Named, nestable pipeline stages with wall time, CPU time, peak RSS and rows.
+
+Peak RSS is sampled by a background thread while stages run, so the
+process-wide high-water mark (``ru_maxrss``) is left untouched.
+
+Instrumentation is off by default and then costs one flag check per stage.
+It is switched on by ``enable`` (the scripts' ``--profile`` flag) or by the
+environment:
+
+- ``AI_JOBS_PROFILE``: JSON report path (``1`` means reports/profile.json),
+  written when the process exits
+- ``AI_JOBS_PROFILE_STAGE``: ``name`` or ``outer/inner`` (plus an optional
+  ``:tracemalloc``) to also dump a cProfile (``.prof``) or tracemalloc (top
+  allocations, ``.txt``) report of every run of that stage next to the JSON
+  report (implies ``AI_JOBS_PROFILE=1``)
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_REPORT_PATH = Path("reports/profile.json")
+
+# Environment overrides
+ENV_PROFILE = "AI_JOBS_PROFILE"
+ENV_PROFILE_STAGE = "AI_JOBS_PROFILE_STAGE"
+
+DUMP_MODES = ("cprofile", "tracemalloc")
+
+_TOP_ALLOCATIONS = 30
+
+# RSS sampling interval of running stages (peaks shorter than this may be missed)
+_SAMPLE_SECONDS = 0.01
+
+
+# ----------------------------
+# Memory (Linux: /proc/self/status, elsewhere ru_maxrss)
+# ----------------------------
+def _proc_status_mb(field: str) -> float | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    return None
+
+
+def _maxrss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    return _proc_status_mb("VmRSS") or _maxrss_mb()
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    """
+    Peak RSS in MB of this process, or with ``children`` the largest of it
+    and its finished child processes.
+    """
+    peak = _proc_status_mb("VmHWM") or _maxrss_mb()
+    return max(peak, _maxrss_mb(resource.RUSAGE_CHILDREN)) if children else peak
+
+
+def reset_peak_rss() -> None:
+    """
+    Reset the process-wide peak (``peak_rss_mb``, ``ru_maxrss``) to the
+    current RSS. Linux only, a no-op elsewhere; stages never call it, only
+    isolated benchmark processes should.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+class _RssSampler(threading.Thread):
+    """
+    Daemon thread sampling RSS into the peaks of the running stages, so
+    per-stage peaks need no reset of the process-wide high-water mark.
+    """
+
+    def __init__(self, profiler: Profiler):
+        super().__init__(name="stage-rss-sampler", daemon=True)
+        self._profiler = profiler
+
+    def run(self) -> None:
+        profiler = self._profiler
+        while profiler.enabled:
+            time.sleep(_SAMPLE_SECONDS)
+            with profiler._lock:
+                active = list(profiler._active)
+            if active:
+                rss = rss_mb()
+                for s in active:
+                    s._peak = max(s._peak, rss)
+        with profiler._lock:
+            if profiler._sampler is self:
+                profiler._sampler = None
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+class Stage:
+    """
+    One timed run of a named stage; use as a context manager (see ``stage``).
+
+    Set ``rows`` inside the block if the row count is only known there.
+    """
+
+    def __init__(self, profiler: Profiler, name: str, rows: int | None):
+        self._profiler = profiler
+        self.name = name
+        self.rows = rows
+        self._dump = None
+
+    def __enter__(self) -> Stage:
+        stack = self._profiler._stack()
+        self.path = "/".join([*(s.name for s in stack), self.name])
+        self.depth = len(stack)
+        stack.append(self)
+
+        if self._profiler.dumps_stage(self.name, self.path):
+            self._dump = self._profiler._start_dump()
+
+        self._rss_start = rss_mb()
+        self._peak = self._rss_start
+        self._profiler._start_sampling(self)
+        self._cpu0 = time.process_time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter() - self._t0
+        cpu = time.process_time() - self._cpu0
+        self._profiler._stop_sampling(self)
+        self._peak = max(self._peak, rss_mb())
+
+        if self._dump is not None:
+            self._profiler._finish_dump(self._dump, self.path)
+
+        stack = self._profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1]._peak = max(stack[-1]._peak, self._peak)
+
+        self._profiler._record(
+            {
+                "stage": self.path,
+                "depth": self.depth,
+                "start_s": self._t0 - self._profiler.origin,
+                "wall_s": wall,
+                "cpu_s": cpu,
+                "peak_rss_mb": self._peak,
+                "peak_increase_mb": self._peak - self._rss_start,
+                "rows": self.rows,
+                "failed": exc[0] is not None,
+            }
+        )
+
+
+class _NullStage:
+    """Shared no-op stage returned while instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullStage:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def __setattr__(self, name, value) -> None:
+        pass  # ``s.rows = n`` is ignored
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Collects stage records; the module-level functions use one global
+    instance.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_path: Path | None = None
+        self.dump_stage: str | None = None
+        self.dump_mode = "cprofile"
+        self.records: list[dict] = []
+        self.origin = time.perf_counter()
+        self._dump_count = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active: set[Stage] = set()
+        self._sampler: _RssSampler | None = None
+
+    def _stack(self) -> list[Stage]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _start_sampling(self, stage: Stage) -> None:
+        with self._lock:
+            self._active.add(stage)
+            if self._sampler is None:
+                self._sampler = _RssSampler(self)
+                self._sampler.start()
+
+    def _stop_sampling(self, stage: Stage) -> None:
+        with self._lock:
+            self._active.discard(stage)
+
+    def _record(self, record: dict) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def dumps_stage(self, name: str, path: str) -> bool:
+        # Dumps go next to the JSON report, so in-memory runs never write
+        return self.report_path is not None and self.dump_stage in (name, path)
+
+    def stage(self, name: str, rows: int | None = None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return Stage(self, name, rows)
+
+    # ----------------------------
+    # cProfile / tracemalloc dumps
+    # ----------------------------
+    def _start_dump(self):
+        if self.dump_mode == "tracemalloc":
+            import tracemalloc
+
+            tracemalloc.start(10)
+            return tracemalloc
+        import cProfile
+
+        prof = cProfile.Profile()
+        prof.enable()
+        return prof
+
+    def _finish_dump(self, dump, path: str) -> None:
+        base = self.report_path.with_suffix("")
+        self._dump_count += 1
+        stem = f"{base}.{path.replace('/', '.')}.{self._dump_count}"
+        Path(stem).parent.mkdir(parents=True, exist_ok=True)
+
+        if self.dump_mode == "tracemalloc":
+            snapshot = dump.take_snapshot()
+            dump.stop()
+            lines = [str(s) for s in snapshot.statistics("lineno")[:_TOP_ALLOCATIONS]]
+            Path(f"{stem}.tracemalloc.txt").write_text("\n".join(lines) + "\n")
+        else:
+            dump.disable()
+            dump.dump_stats(f"{stem}.prof")
+
+    # ----------------------------
+    # Report
+    # ----------------------------
+    def report(self) -> dict:
+        return {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "argv": sys.argv,
+            },
+            # Inner stages finish first; list them in start order
+            "stages": sorted(self.records, key=lambda r: r["start_s"]),
+        }
+
+    def write_report(self, path: str | Path | None = None) -> Path:
+        path = Path(path or self.report_path or DEFAULT_REPORT_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2) + "\n")
+        return path
+
+
+_PROFILER = Profiler()
+_atexit_registered = False
+
+
+def stage(name: str, rows: int | None = None):
+    """
+    Context manager timing one run of ``name``; stages opened inside it are
+    recorded as ``outer/inner``.
+
+    >>> with stage("preprocess", rows=df.height):
+    ...     df = preprocess(df)
+    """
+    return _PROFILER.stage(name, rows)
+
+
+def instrumented(name: str | None = None):
+    """Decorator recording every call of the function as a stage."""
+
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _PROFILER.stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enable(
+    report_path: str | Path | None = DEFAULT_REPORT_PATH,
+    dump_stage: str | None = None,
+    dump_mode: str = "cprofile",
+) -> Profiler:
+    """
+    Switch instrumentation on. The JSON report is written to ``report_path``
+    at exit (``None``: keep the records in memory only, see ``records``).
+    ``dump_stage`` dumps are written next to the report, so they need a path.
+    """
+    if dump_mode not in DUMP_MODES:
+        raise ValueError(f"dump_mode must be one of {DUMP_MODES}, got {dump_mode!r}")
+    if dump_stage is not None and report_path is None:
+        raise ValueError("dump_stage needs a report_path to write the dumps next to")
+    global _atexit_registered
+    _PROFILER.enabled = True
+    _PROFILER.report_path = None if report_path is None else Path(report_path)
+    _PROFILER.dump_stage = dump_stage
+    _PROFILER.dump_mode = dump_mode
+    if report_path is not None and not _atexit_registered:
+        atexit.register(_write_at_exit)
+        _atexit_registered = True
+    return _PROFILER
+
+
+def disable() -> None:
+    _PROFILER.enabled = False
+
+
+def records() -> list[dict]:
+    """Stage records collected so far (one dict per finished stage run)."""
+    return list(_PROFILER.records)
+
+
+def reset() -> None:
+    _PROFILER.records.clear()
+
+
+def _write_at_exit() -> None:
+    if _PROFILER.report_path is not None and _PROFILER.records:
+        path = _PROFILER.write_report()
+        print(f"stage profile written to {path}", file=sys.stderr)
+
+
+def _parse_dump_stage(spec: str | None) -> tuple[str | None, str]:
+    if not spec:
+        return None, "cprofile"
+    name, _, mode = spec.partition(":")
+    return name, mode or "cprofile"
+
+
+def add_profile_arguments(parser) -> None:
+    """``--profile [PATH]`` and ``--profile-stage NAME[:tracemalloc]``."""
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(DEFAULT_REPORT_PATH),
+        default=None,
+        metavar="PATH",
+        help="record stage timings and memory to a JSON report",
+    )
+    parser.add_argument(
+        "--profile-stage",
+        default=None,
+        metavar="NAME[:tracemalloc]",
+        help="also cProfile (or tracemalloc) this stage; implies --profile",
+    )
+
+
+def enable_from_args(args) -> None:
+    """Enable instrumentation if ``--profile`` or ``--profile-stage`` was given."""
+    if args.profile is not None or args.profile_stage:
+        path = args.profile or DEFAULT_REPORT_PATH
+        enable(path, *_parse_dump_stage(args.profile_stage))
+
+
+def _enable_from_env() -> None:
+    value = os.environ.get(ENV_PROFILE, "").strip()
+    dump_stage = os.environ.get(ENV_PROFILE_STAGE, "").strip()
+    if value.lower() in {"0", "false", "no", "off"} or not (value or dump_stage):
+        return
+    # AI_JOBS_PROFILE_STAGE alone implies the default report
+    if not value or value.lower() in {"1", "true", "yes", "on"}:
+        path = DEFAULT_REPORT_PATH
+    else:
+        path = value
+    enable(path, *_parse_dump_stage(dump_stage))
+
+
+_enable_from_env()
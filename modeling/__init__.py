@@ -1,4 +1,21 @@
-from ._common import load_split_xy, make_preprocessor, rmse
+from ._category_encoder import CategoryDtypeEncoder
+from ._common import load_split_xy, make_native_preprocessor, make_preprocessor, rmse
+from ._experiment_cache import ExperimentCache, default_cache
+from ._search import ElasticNetPathSearchCV, FoldCachedSearchCV, HalvingLGBMSearchCV
 from ._simple_scaler import SimpleStandardScaler
+from ._skills_encoder import MultiHotSkillsEncoder
 
-__all__ = ["SimpleStandardScaler", "rmse", "make_preprocessor", "load_split_xy"]
+__all__ = [
+    "SimpleStandardScaler",
+    "MultiHotSkillsEncoder",
+    "CategoryDtypeEncoder",
+    "FoldCachedSearchCV",
+    "ElasticNetPathSearchCV",
+    "HalvingLGBMSearchCV",
+    "ExperimentCache",
+    "default_cache",
+    "rmse",
+    "make_preprocessor",
+    "make_native_preprocessor",
+    "load_split_xy",
+]
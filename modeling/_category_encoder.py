@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+class CategoryDtypeEncoder(BaseEstimator, TransformerMixin):
+    """
+    Convert columns to pandas ``category`` dtype with categories fixed in fit.
+
+    The output keeps one column per input column (integer codes plus the
+    category list), which LightGBM picks up as native categorical features.
+    Values not seen in fit become missing.
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.categories_ = [
+            np.sort(pd.unique(X[c].dropna().astype(str))) for c in X.columns
+        ]
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "categories_")
+        X = pd.DataFrame(X, columns=self.feature_names_in_)
+        return pd.DataFrame(
+            {
+                c: pd.Categorical(X[c].astype(str).where(X[c].notna()), categories=cats)
+                for c, cats in zip(self.feature_names_in_, self.categories_)
+            },
+            index=X.index,
+        )
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "categories_")
+        return self.feature_names_in_.copy()
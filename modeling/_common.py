@@ -9,6 +9,10 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
 
 from data import create_sample_split
+from instrumentation import stage
+
+from ._category_encoder import CategoryDtypeEncoder
+from ._skills_encoder import MultiHotSkillsEncoder
 
 # ----------------------------
 # Columns
@@ -27,12 +31,16 @@ CAT_COLS = [
     "company_size",
 ]
 
+SKILLS_COL = "skills_list"
+
 
 def rmse(y_true, y_pred) -> float:  # RMSE = sqrt(MSE)
     return float(np.sqrt(mean_squared_error(y_true, y_pred)))
 
 
-def make_preprocessor() -> ColumnTransformer:
+def make_preprocessor(
+    skills: bool = False, skills_min_frequency: int | float = 1
+) -> ColumnTransformer:
     # Feature engineering with sklearn transformers
     num_pipe = Pipeline([("imputer", SimpleImputer(strategy="median"))])
     cat_pipe = Pipeline(
@@ -41,31 +49,94 @@ def make_preprocessor() -> ColumnTransformer:
             ("ohe", OneHotEncoder(handle_unknown="ignore")),
         ]
     )
+    transformers = [
+        ("num", num_pipe, NUM_COLS),
+        ("cat", cat_pipe, CAT_COLS),
+    ]
+    if skills:
+        # Sparse multi-hot skills next to the one-hot categoricals
+        transformers.append(
+            (
+                "skills",
+                MultiHotSkillsEncoder(min_frequency=skills_min_frequency),
+                [SKILLS_COL],
+            )
+        )
+    return ColumnTransformer(transformers=transformers, remainder="drop")
+
+
+def make_native_preprocessor() -> ColumnTransformer:
+    """
+    Preprocessor for LightGBM's native categorical support.
+
+    Instead of one-hot columns, every ``CAT_COLS`` entry stays a single pandas
+    ``category`` column (integer codes), which ``LGBMRegressor`` detects
+    automatically. The output has one column per original feature, so
+    ``get_feature_names_out`` maps importances straight back to
+    ``NUM_COLS`` / ``CAT_COLS``, and the fitted booster stores the category
+    lists with the model.
+    """
+    num_pipe = Pipeline([("imputer", SimpleImputer(strategy="median"))])
+    cat_pipe = Pipeline(
+        [
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("category", CategoryDtypeEncoder()),
+        ]
+    )
     return ColumnTransformer(
         transformers=[
             ("num", num_pipe, NUM_COLS),
             ("cat", cat_pipe, CAT_COLS),
         ],
         remainder="drop",
-    )
+    ).set_output(transform="pandas")
 
 
 def load_split_xy(
     parquet_path: str = "data/jobs_cleaned.parquet",
     id_column: str = "job_id",
     training_frac: float = 0.8,
+    skills: bool = False,
+    categorical: bool = False,
 ):
     """
     Load cleaned data, create deterministic ID-based split, and return X/y.
+
+    With ``skills=True`` the ``skills_list`` column is included in X (for
+    ``make_preprocessor(skills=True)``).
+
+    With ``categorical=True`` only the needed columns are read and ``CAT_COLS``
+    come back as pandas categoricals (dictionary-encoded integer codes with the
+    same categories in train and test) instead of object-dtype strings. The
+    split mask is computed once and each split is converted in one pass.
     """
+    feature_cols = NUM_COLS + CAT_COLS + ([SKILLS_COL] if skills else [])
+
+    with stage("load_split_xy") as s:
+        if categorical:
+            out = _load_split_xy_categorical(
+                parquet_path, id_column, training_frac, feature_cols
+            )
+        else:
+            out = _load_split_xy_pandas(
+                parquet_path, id_column, training_frac, feature_cols
+            )
+        s.rows = len(out[1]) + len(out[3])
+    return out
+
+
+def _load_split_xy_pandas(
+    parquet_path: str,
+    id_column: str,
+    training_frac: float,
+    feature_cols: list[str],
+):
     df = pl.read_parquet(parquet_path)
     df = create_sample_split(df, id_column=id_column, training_frac=training_frac)
 
     train_df = df.filter(pl.col("sample") == "train")
     test_df = df.filter(pl.col("sample") == "test")
 
-    feature_cols = NUM_COLS + CAT_COLS
-
     X_train = train_df.select(feature_cols).to_pandas()
     y_train = train_df.select(TARGET).to_numpy().ravel()
 
@@ -73,3 +144,32 @@ def load_split_xy(
     y_test = test_df.select(TARGET).to_numpy().ravel()
 
     return X_train, y_train, X_test, y_test
+
+
+def _load_split_xy_categorical(
+    parquet_path: str,
+    id_column: str,
+    training_frac: float,
+    feature_cols: list[str],
+):
+    # Projection pushdown: only the id, target and feature columns are read
+    df = pl.scan_parquet(parquet_path).select(id_column, TARGET, *feature_cols)
+    df = create_sample_split(df, id_column=id_column, training_frac=training_frac)
+    df = df.with_columns((pl.col("sample") == "train").alias("sample")).collect()
+
+    # One shared (sorted) category list per column so codes agree across splits
+    df = df.with_columns(
+        pl.col(c)
+        .cast(pl.Utf8)
+        .cast(pl.Enum(df[c].drop_nulls().unique().cast(pl.Utf8).sort()))
+        for c in CAT_COLS
+    )
+
+    is_train = df.get_column("sample")
+    out = []
+    for part in (df.filter(is_train), df.filter(~is_train)):
+        out.append(part.select(feature_cols).to_pandas())
+        out.append(part.get_column(TARGET).to_numpy())
+
+    X_train, y_train, X_test, y_test = out
+    return X_train, y_train, X_test, y_test
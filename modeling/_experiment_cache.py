@@ -0,0 +1,223 @@
+"""
+Content-addressed store for fitted models, CV fold scores and predictions.
+
+Every entry is keyed by a hash of everything that determines it (the data, the
+train/validation indices, the estimator and its parameters), so a repeated or
+interrupted run finds finished work on disk and only computes what is
+missing. Entries are written atomically (temporary file + rename) and the
+least recently used ones are evicted once the store exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import joblib
+import sklearn
+from sklearn.base import clone
+
+DEFAULT_CACHE_DIR = Path("modeling/cache")
+
+# Bump when code behind stored results changes in a way the keys cannot see
+# (helpers called by the fold functions of _search.py, e.g. scoring)
+CACHE_VERSION = 1
+
+# Environment overrides
+ENV_CACHE_DIR = "AI_JOBS_EXPERIMENT_CACHE"  # store location, "off" disables it
+ENV_MAX_MB = "AI_JOBS_EXPERIMENT_CACHE_MB"  # size limit in MB
+
+_DISABLED = {"0", "off", "false", "no", "none"}
+
+
+class ExperimentCache:
+    """
+    Directory of joblib files named by their content key.
+
+    Parameters
+    ----------
+    root : str or Path or None
+        Store location (created on first write). ``None`` disables the store:
+        nothing is loaded or written, so ``fit`` / ``predict`` always compute.
+    max_bytes : int, optional
+        Evict least recently used entries (by access time, refreshed on every
+        hit) after a write pushes the total size above this. ``None`` keeps
+        everything.
+    """
+
+    def __init__(self, root: str | Path | None = DEFAULT_CACHE_DIR, max_bytes=None):
+        self.root = None if root is None else Path(root)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    # ----------------------------
+    # Keys
+    # ----------------------------
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        SHA-256 over the joblib hashes of ``parts`` (arrays, DataFrames,
+        unfitted estimators, dicts of parameters, strings, ...), salted with
+        ``CACHE_VERSION`` and the scikit-learn and LightGBM versions.
+        """
+        import lightgbm  # imported here: GLM-only and serving paths skip it
+
+        salt = f"{CACHE_VERSION}/{sklearn.__version__}/{lightgbm.__version__}"
+        h = hashlib.sha256(salt.encode())
+        for part in parts:
+            h.update(joblib.hash(part).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.joblib"
+
+    # ----------------------------
+    # Get / put
+    # ----------------------------
+    def __contains__(self, key: str) -> bool:
+        return self.enabled and self._path(key).exists()
+
+    def get(self, key: str, default=None):
+        if not self.enabled:
+            return default
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            # Truncated, corrupt or pickled under other library versions:
+            # treat as a miss so it is recomputed (and overwritten)
+            path.unlink(missing_ok=True)
+            return default
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key: str, value) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Never leave a half-written entry under the final name
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        if self.max_bytes is not None:
+            self.evict()
+
+    def get_or_compute(self, key: str, func, *args, **kwargs):
+        """Load the entry for ``key``, or compute it with ``func`` and store it."""
+        value = self.get(key)
+        if value is None:
+            value = func(*args, **kwargs)
+            self.put(key, value)
+        return value
+
+    def fit(self, estimator, X, y, **fit_params):
+        """Fitted clone of ``estimator``, loaded if the same fit was stored."""
+        key = self.key("fit", clone(estimator), X, y, fit_params)
+        return self.get_or_compute(key, clone(estimator).fit, X, y, **fit_params)
+
+    def predict(self, estimator, X):
+        """``estimator.predict(X)``, loaded if stored for the same model and X."""
+        key = self.key("predict", estimator, X)
+        return self.get_or_compute(key, estimator.predict, X)
+
+    # ----------------------------
+    # Size management
+    # ----------------------------
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        if not self.enabled:
+            return entries
+        for path in self.root.glob("*/*.joblib"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes=None) -> int:
+        """
+        Remove least recently used entries until the store fits in
+        ``max_bytes``; returns the number of entries removed.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(0)
+
+
+def default_cache() -> ExperimentCache:
+    """
+    Store used by the training and tuning scripts: ``modeling/cache`` unless
+    ``AI_JOBS_EXPERIMENT_CACHE`` names another directory (or is ``off``);
+    ``AI_JOBS_EXPERIMENT_CACHE_MB`` limits its size.
+    """
+    root = os.environ.get(ENV_CACHE_DIR, "").strip()
+    if root.lower() in _DISABLED:
+        return ExperimentCache(None)
+    max_mb = os.environ.get(ENV_MAX_MB, "").strip()
+    return ExperimentCache(
+        root or DEFAULT_CACHE_DIR,
+        max_bytes=int(float(max_mb) * 2**20) if max_mb else None,
+    )
+
+
+def code_digest(func) -> str:
+    """
+    Hash of a function's bytecode, constants and referenced names (nested
+    functions included), used in keys so editing the function misses old
+    entries. Code it calls is covered by ``CACHE_VERSION`` instead.
+    """
+    h = hashlib.sha256()
+
+    def update(code) -> None:
+        h.update(code.co_code)
+        h.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if hasattr(const, "co_code"):
+                update(const)
+            elif isinstance(const, frozenset):  # set order varies per process
+                h.update(repr(sorted(map(repr, const))).encode())
+            else:
+                h.update(repr(const).encode())
+
+    update(func.__code__)
+    return h.hexdigest()
+
+
+def as_cache(cache) -> ExperimentCache | None:
+    """
+    Accept an ``ExperimentCache``, a directory path or ``None``; disabled
+    stores come back as ``None``.
+    """
+    if cache is None:
+        return None
+    if not isinstance(cache, ExperimentCache):
+        cache = ExperimentCache(cache)
+    return cache if cache.enabled else None
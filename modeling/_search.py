@@ -0,0 +1,608 @@
+from __future__ import annotations
+
+import time
+import warnings
+
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterSampler, check_cv
+from sklearn.utils import _safe_indexing
+from sklearn.utils.validation import _num_samples
+
+from ._experiment_cache import as_cache, code_digest
+
+
+def _fit_transform_fold(pre, X, y, train_idx, test_idx):
+    # Fit the preprocessor on the training part of one fold and transform both
+    X_train = _safe_indexing(X, train_idx)
+    X_test = _safe_indexing(X, test_idx)
+    pre = clone(pre)
+    Xt_train = pre.fit_transform(X_train, y[train_idx])
+    Xt_test = pre.transform(X_test)
+    return Xt_train, y[train_idx], Xt_test, y[test_idx]
+
+
+def _fit_and_score(estimator, params, fold, scorer):
+    Xt_train, y_train, Xt_test, y_test = fold
+    est = clone(estimator).set_params(**params)
+    t0 = time.perf_counter()
+    est.fit(Xt_train, y_train)
+    fit_time = time.perf_counter() - t0
+    return scorer(est, Xt_test, y_test), fit_time
+
+
+def _run_and_store(cache, key, func, **kwargs):
+    # Runs in the worker, so every finished fit is on disk even if the search
+    # is interrupted later
+    result = func(**kwargs)
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+class FoldCachedSearchCV:
+    """
+    Randomized search that preprocesses each CV fold only once.
+
+    ``RandomizedSearchCV`` over a ``Pipeline([("preprocess", ...), ("model",
+    ...)])`` refits the preprocessor for every candidate and fold. Here the
+    ``preprocess`` step is fitted once per fold and the transformed (sparse)
+    train/validation matrices are reused by all candidates; only the ``model``
+    step is refit. Candidates are drawn with ``ParameterSampler`` exactly like
+    ``RandomizedSearchCV``, so the same ``random_state`` gives the same
+    candidates and scores.
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        Pipeline with a ``"preprocess"`` and a ``"model"`` step.
+    param_distributions : dict
+        As in ``RandomizedSearchCV``; only ``model__*`` parameters are allowed.
+    memory : str or joblib.Memory, optional
+        Cache the per-fold matrices on disk as well, so repeated searches on
+        the same data skip preprocessing entirely.
+    cache : str or ExperimentCache, optional
+        Store every fold result and the refitted ``best_estimator_`` under a
+        hash of the data, the fold indices, the preprocessor and the model
+        parameters. A repeated or interrupted search loads finished fits and
+        only runs the missing ones (folds are not even preprocessed when all
+        their fits are stored).
+
+    Attributes follow ``RandomizedSearchCV``: ``best_estimator_`` (full
+    pipeline refit on all data), ``best_params_``, ``best_score_`` and
+    ``cv_results_``. ``n_cached_fits_`` counts the fold fits loaded from
+    ``cache``.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        param_distributions,
+        n_iter: int = 10,
+        scoring=None,
+        cv=None,
+        random_state=None,
+        n_jobs=None,
+        memory=None,
+        verbose: int = 0,
+        cache=None,
+    ):
+        self.pipeline = pipeline
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.scoring = scoring
+        self.cv = cv
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.memory = memory
+        self.verbose = verbose
+        self.cache = cache
+
+    def _candidates(self) -> list[dict]:
+        return list(
+            ParameterSampler(
+                self.param_distributions, self.n_iter, random_state=self.random_state
+            )
+        )
+
+    def _cached_folds(self, X, y, needed) -> dict[int, tuple]:
+        # Preprocess the folds in ``needed`` that this fit has not seen yet
+        pre = self.pipeline.named_steps["preprocess"]
+
+        fit_transform = _fit_transform_fold
+        if self.memory is not None:
+            memory = self.memory
+            if not isinstance(memory, Memory):
+                memory = Memory(memory, verbose=0)
+            fit_transform = memory.cache(_fit_transform_fold)
+
+        t0 = time.perf_counter()
+        for i in sorted(set(needed) - set(self._folds)):
+            self._folds[i] = fit_transform(pre, X, y, *self._splits[i])
+        self.preprocess_time_ += time.perf_counter() - t0
+        return self._folds
+
+    def _map_folds(self, func, jobs, X, y) -> list:
+        """
+        ``func(fold=<fold i>, **kwargs)`` for every ``(i, kwargs)`` in
+        ``jobs``, in parallel; results stored in ``cache`` are loaded instead.
+        """
+        cache = as_cache(self.cache)
+
+        results = [None] * len(jobs)
+        keys = [None] * len(jobs)
+        if cache is not None:
+            if self._data_key is None:
+                pre = clone(self.pipeline.named_steps["preprocess"])
+                self._data_key = cache.key(X, y, pre)
+            for n, (i, kwargs) in enumerate(jobs):
+                train_idx, test_idx = self._splits[i]
+                keys[n] = cache.key(
+                    func.__name__,
+                    code_digest(func),  # edits to the fold function
+                    self._data_key,
+                    train_idx,
+                    test_idx,
+                    kwargs,
+                )
+                results[n] = cache.get(keys[n])
+
+        todo = [n for n, res in enumerate(results) if res is None]
+        self.n_cached_fits_ += len(jobs) - len(todo)
+        if not todo:
+            return results
+
+        folds = self._cached_folds(X, y, {jobs[n][0] for n in todo})
+        computed = Parallel(n_jobs=self.n_jobs, verbose=self.verbose)(
+            delayed(_run_and_store)(
+                cache, keys[n], func, fold=folds[jobs[n][0]], **jobs[n][1]
+            )
+            for n in todo
+        )
+        for n, res in zip(todo, computed):
+            results[n] = res
+        return results
+
+    def _start(self, X, y) -> int:
+        # Per-fit state shared by the _map_folds calls; returns the fold count
+        self._splits = list(check_cv(self.cv).split(X, y))
+        self._folds = {}
+        self._data_key = None
+        self.n_cached_fits_ = 0
+        self.preprocess_time_ = 0.0
+        return len(self._splits)
+
+    def _best_pipeline(self, X):
+        return clone(self.pipeline).set_params(**self.best_params_)
+
+    def _refit(self, X, y):
+        # Free the fold matrices before refitting on all data
+        self._splits, self._folds, self._data_key = None, None, None
+
+        best = self._best_pipeline(X)
+        cache = as_cache(self.cache)
+        if cache is None:
+            self.best_estimator_ = best.fit(X, y)
+        else:
+            self.best_estimator_ = cache.fit(best, X, y)
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        estimator = self.pipeline.named_steps["model"]
+        scorer = check_scoring(estimator, scoring=self.scoring)
+
+        candidates = self._candidates()
+        for params in candidates:
+            bad = [k for k in params if not k.startswith("model__")]
+            if bad:
+                raise ValueError(f"Only model__* parameters can be searched: {bad}")
+
+        n_folds = self._start(X, y)
+        results = self._map_folds(
+            _fit_and_score,
+            [
+                (
+                    i,
+                    {
+                        "estimator": estimator,
+                        "params": {
+                            k.removeprefix("model__"): v for k, v in params.items()
+                        },
+                        "scorer": scorer,
+                    },
+                )
+                for params in candidates
+                for i in range(n_folds)
+            ],
+            X,
+            y,
+        )
+
+        scores = np.array([s for s, _ in results]).reshape(len(candidates), -1)
+        fit_times = np.array([t for _, t in results]).reshape(len(candidates), -1)
+
+        mean = scores.mean(axis=1)
+        self.cv_results_ = {
+            "params": candidates,
+            "mean_test_score": mean,
+            "std_test_score": scores.std(axis=1),
+            "mean_fit_time": fit_times.mean(axis=1),
+            # Same ranking convention as sklearn: 1 is best
+            "rank_test_score": (
+                np.argsort(np.argsort(-mean, kind="stable"), kind="stable") + 1
+            ),
+            **{f"split{i}_test_score": scores[:, i] for i in range(scores.shape[1])},
+        }
+
+        self.best_index_ = int(np.argmax(mean))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(mean[self.best_index_])
+
+        self._refit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+
+def _fit_and_score_early_stopping(
+    estimator, params, fold, scorer, n_rounds, stopping_rounds
+):
+    import lightgbm as lgb  # only needed for this search
+
+    Xt_train, y_train, Xt_test, y_test = fold
+    est = clone(estimator).set_params(**params, n_estimators=n_rounds)
+    t0 = time.perf_counter()
+    est.fit(
+        Xt_train,
+        y_train,
+        eval_X=(Xt_test,),
+        eval_y=(y_test,),
+        eval_metric="rmse",
+        callbacks=[lgb.early_stopping(stopping_rounds, verbose=False)],
+    )
+    fit_time = time.perf_counter() - t0
+    # predict() uses best_iteration_ after early stopping
+    n_used = est.best_iteration_ or n_rounds
+    return scorer(est, Xt_test, y_test), n_used, fit_time
+
+
+class HalvingLGBMSearchCV(FoldCachedSearchCV):
+    """
+    Successive-halving search over boosting rounds for an LGBMRegressor.
+
+    All ``n_iter`` candidates first get ``min_resource`` boosting rounds; after
+    each rung only the best ``1 / factor`` are kept and their budget is
+    multiplied by ``factor``, up to ``max_resource`` rounds. Every fit uses
+    LightGBM early stopping on the fold's validation part, so the number of
+    trees is chosen by the data instead of being sampled. Folds are
+    preprocessed once, as in ``FoldCachedSearchCV``.
+
+    The scores in ``cv_results_`` are those of each candidate's last rung;
+    ``rank_test_score`` orders candidates by the rung they reached, then by
+    score.
+
+    ``n_estimators`` must not be in ``param_distributions``. In
+    ``best_params_``, ``model__n_estimators`` is the winner's
+    ``best_iteration_`` averaged over the folds (rounded), and
+    ``best_estimator_`` is refit with that value. Needs LightGBM >= 4.6
+    (``eval_X`` / ``eval_y``).
+
+    Note that the validation fold is used both for early stopping and for the
+    score, so CV scores are slightly optimistic compared to a fixed number of
+    rounds.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        param_distributions,
+        n_iter: int = 10,
+        scoring=None,
+        cv=None,
+        random_state=None,
+        n_jobs=None,
+        memory=None,
+        verbose: int = 0,
+        cache=None,
+        min_resource: int = 100,
+        max_resource: int = 2000,
+        factor: int = 3,
+        early_stopping_rounds: int = 50,
+    ):
+        super().__init__(
+            pipeline,
+            param_distributions,
+            n_iter=n_iter,
+            scoring=scoring,
+            cv=cv,
+            random_state=random_state,
+            n_jobs=n_jobs,
+            memory=memory,
+            verbose=verbose,
+            cache=cache,
+        )
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.factor = factor
+        self.early_stopping_rounds = early_stopping_rounds
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        estimator = self.pipeline.named_steps["model"]
+        scorer = check_scoring(estimator, scoring=self.scoring)
+
+        candidates = self._candidates()
+        if any("model__n_estimators" in p for p in candidates):
+            raise ValueError("n_estimators is the halving budget; do not search it")
+
+        n_folds = self._start(X, y)
+
+        n_cand = len(candidates)
+        mean_score = np.full(n_cand, np.nan)
+        std_score = np.full(n_cand, np.nan)
+        best_iter = np.zeros(n_cand, dtype=int)
+        n_resources = np.zeros(n_cand, dtype=int)
+        fit_time = np.zeros(n_cand)
+
+        alive = np.arange(n_cand)
+        n_rounds = self.min_resource
+        self.n_rungs_ = 0
+        while True:
+            results = self._map_folds(
+                _fit_and_score_early_stopping,
+                [
+                    (
+                        f,
+                        {
+                            "estimator": estimator,
+                            "params": {
+                                k.removeprefix("model__"): v
+                                for k, v in candidates[i].items()
+                            },
+                            "scorer": scorer,
+                            "n_rounds": n_rounds,
+                            "stopping_rounds": self.early_stopping_rounds,
+                        },
+                    )
+                    for i in alive
+                    for f in range(n_folds)
+                ],
+                X,
+                y,
+            )
+            res = np.array(results, dtype=float).reshape(len(alive), n_folds, 3)
+
+            mean_score[alive] = res[:, :, 0].mean(axis=1)
+            std_score[alive] = res[:, :, 0].std(axis=1)
+            best_iter[alive] = np.rint(res[:, :, 1].mean(axis=1)).astype(int)
+            n_resources[alive] = n_rounds
+            fit_time[alive] += res[:, :, 2].sum(axis=1)
+            self.n_rungs_ += 1
+
+            if len(alive) == 1 or n_rounds >= self.max_resource:
+                break
+
+            # Promote the best 1/factor of this rung (higher score is better)
+            n_keep = max(1, len(alive) // self.factor)
+            order = np.argsort(-mean_score[alive], kind="stable")
+            alive = alive[order[:n_keep]]
+            n_rounds = min(n_rounds * self.factor, self.max_resource)
+
+        # The winner is the best candidate of the last rung
+        self.best_index_ = int(alive[np.argmax(mean_score[alive])])
+        self.best_params_ = {
+            **candidates[self.best_index_],
+            "model__n_estimators": int(best_iter[self.best_index_]),
+        }
+        self.best_score_ = float(mean_score[self.best_index_])
+
+        # Rank by the last rung reached, then by score, so the winner is 1
+        order = np.lexsort((-mean_score, -n_resources))
+        rank = np.empty(n_cand, dtype=int)
+        rank[order] = np.arange(1, n_cand + 1)
+
+        self.cv_results_ = {
+            "params": candidates,
+            "mean_test_score": mean_score,
+            "std_test_score": std_score,
+            "rank_test_score": rank,
+            "n_resources": n_resources,
+            "best_iteration": best_iter,
+            "total_fit_time": fit_time,
+        }
+
+        self._refit(X, y)
+        return self
+
+
+def _equivalent_ridge(estimator, alpha, n_samples):
+    # Pure L2: coordinate descent converges very slowly here, while the
+    # ElasticNet objective (1 / 2n) |y - Xw|^2 + alpha / 2 |w|^2 is exactly
+    # Ridge with alpha * n, which has a direct solver.
+    from sklearn.linear_model import Ridge
+
+    return Ridge(alpha=alpha * n_samples, fit_intercept=estimator.fit_intercept)
+
+
+def _fit_from_ridge(pipeline, X, y):
+    # Fit the pipeline's ElasticNet(l1_ratio=0) from the equivalent Ridge
+    # solution: one coordinate-descent sweep from that optimum leaves it in
+    # place, and the duality gap cannot stop the solver without an L1 term
+    pipeline = clone(pipeline)
+    model = pipeline.named_steps["model"]
+    Xt = pipeline[:-1].fit_transform(X, y)
+    ridge = _equivalent_ridge(model, model.alpha, _num_samples(X)).fit(Xt, y)
+
+    max_iter = model.max_iter
+    model.set_params(warm_start=True, max_iter=1)
+    model.coef_ = np.array(ridge.coef_, dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.fit(Xt, y)
+    model.set_params(warm_start=False, max_iter=max_iter)
+    return pipeline
+
+
+def _score_path(estimator, alphas, l1_ratio, fold, scorer, warm_start):
+    # Solve one fold along a descending alpha grid, reusing the previous
+    # solution as the starting point of the next coordinate-descent run
+    Xt_train, y_train, Xt_test, y_test = fold
+    scores, n_iter = [], 0
+
+    if l1_ratio == 0:
+        for alpha in alphas:
+            ridge = _equivalent_ridge(estimator, alpha, Xt_train.shape[0])
+            ridge.fit(Xt_train, y_train)
+            scores.append(scorer(ridge, Xt_test, y_test))
+        return np.array(scores), n_iter
+
+    est = clone(estimator).set_params(l1_ratio=l1_ratio, warm_start=warm_start)
+    for alpha in alphas:
+        est.set_params(alpha=alpha).fit(Xt_train, y_train)
+        scores.append(scorer(est, Xt_test, y_test))
+        n_iter += est.n_iter_
+    return np.array(scores), n_iter
+
+
+class ElasticNetPathSearchCV(FoldCachedSearchCV):
+    """
+    Grid search for ElasticNet along warm-started regularization paths.
+
+    For every ``l1_ratio`` and fold, the alphas are solved from largest to
+    smallest and each fit starts from the previous coefficients, so the whole
+    ``alphas x l1_ratios`` grid costs a fraction of the coordinate-descent
+    iterations of independent fits. Folds are preprocessed once, as in
+    ``FoldCachedSearchCV``, and the result has the same ``best_estimator_`` /
+    ``best_params_`` (``model__alpha``, ``model__l1_ratio``) shape.
+
+    Grid points with ``l1_ratio=0`` are scored with the equivalent Ridge
+    problem, which has a direct solver (coordinate descent barely converges
+    there). If such a point wins, ``best_estimator_`` still holds the
+    pipeline's own ElasticNet (with ``l1_ratio=0``), warm-started from that
+    Ridge solution, so its type does not depend on the winner.
+
+    The defaults make a grid of 180 points (30 alphas x 6 l1_ratios) per fold,
+    against e.g. 30 draws of a ``RandomizedSearchCV``; the warm-started paths
+    keep this affordable, and fewer ``alphas`` make it cheaper.
+
+    Parameters
+    ----------
+    alphas : array-like, optional
+        Regularization strengths; sorted in descending order internally.
+        Defaults to 30 log-spaced values in [1e-4, 1e1].
+    l1_ratios : array-like, optional
+        Mixing parameters to solve a path for. Defaults to
+        ``np.linspace(0, 1, 6)``.
+    warm_start : bool
+        Set to False to solve every grid point from scratch (for comparison).
+
+    ``n_iter_total_`` holds the coordinate-descent iterations spent on CV.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        alphas=None,
+        l1_ratios=None,
+        scoring=None,
+        cv=None,
+        n_jobs=None,
+        memory=None,
+        verbose: int = 0,
+        warm_start: bool = True,
+        cache=None,
+    ):
+        super().__init__(
+            pipeline,
+            param_distributions={},
+            scoring=scoring,
+            cv=cv,
+            n_jobs=n_jobs,
+            memory=memory,
+            verbose=verbose,
+            cache=cache,
+        )
+        self.alphas = alphas
+        self.l1_ratios = l1_ratios
+        self.warm_start = warm_start
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        estimator = self.pipeline.named_steps["model"]
+        scorer = check_scoring(estimator, scoring=self.scoring)
+
+        alphas = np.geomspace(1e1, 1e-4, 30) if self.alphas is None else self.alphas
+        alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+        l1_ratios = np.asarray(
+            np.linspace(0.0, 1.0, 6) if self.l1_ratios is None else self.l1_ratios,
+            dtype=float,
+        )
+
+        n_folds = self._start(X, y)
+        results = self._map_folds(
+            _score_path,
+            [
+                (
+                    i,
+                    {
+                        "estimator": estimator,
+                        "alphas": alphas,
+                        "l1_ratio": l1_ratio,
+                        "scorer": scorer,
+                        "warm_start": self.warm_start,
+                    },
+                )
+                for l1_ratio in l1_ratios
+                for i in range(n_folds)
+            ],
+            X,
+            y,
+        )
+
+        # scores[l1_ratio, fold, alpha]
+        scores = np.stack([s for s, _ in results]).reshape(
+            len(l1_ratios), n_folds, len(alphas)
+        )
+        self.n_iter_total_ = int(sum(n for _, n in results))
+
+        mean = scores.mean(axis=1)
+        i, j = np.unravel_index(np.argmax(mean), mean.shape)
+
+        self.cv_results_ = {
+            "params": [
+                {"model__alpha": a, "model__l1_ratio": r}
+                for r in l1_ratios
+                for a in alphas
+            ],
+            "mean_test_score": mean.ravel(),
+            "std_test_score": scores.std(axis=1).ravel(),
+        }
+
+        self.best_index_ = int(i * len(alphas) + j)
+        self.best_params_ = {
+            "model__alpha": float(alphas[j]),
+            "model__l1_ratio": float(l1_ratios[i]),
+        }
+        self.best_score_ = float(mean[i, j])
+
+        self._refit(X, y)
+        return self
+
+    def _refit(self, X, y):
+        if self.best_params_["model__l1_ratio"] != 0:
+            return super()._refit(X, y)
+        self._splits, self._folds, self._data_key = None, None, None
+
+        best = self._best_pipeline(X)
+        cache = as_cache(self.cache)
+        if cache is None:
+            self.best_estimator_ = _fit_from_ridge(best, X, y)
+        else:
+            key = cache.key("fit_from_ridge", clone(best), X, y)
+            self.best_estimator_ = cache.get_or_compute(
+                key, _fit_from_ridge, best, X, y
+            )
@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sp
 from sklearn.base import BaseEstimator, TransformerMixin
 
 
@@ -8,14 +9,112 @@ class SimpleStandardScaler(BaseEstimator, TransformerMixin):
 
     Computes column-wise mean and standard deviation during fit,
     and standardizes features during transform.
+
+    The statistics are running moments (count, mean, sum of squared
+    deviations), so ``partial_fit`` can consume the data chunk by chunk and
+    ``merge`` combines scalers fitted on different chunks (e.g. in separate
+    workers) into exactly the statistics of the concatenated data. Constant
+    columns get a std of 1 instead of dividing by zero.
+
+    Parameters
+    ----------
+    with_mean : bool
+        Center the data before scaling. Must be ``False`` for sparse input,
+        which is only scaled so that it stays sparse.
+    dtype : numpy dtype
+        Output dtype of ``transform`` (e.g. ``np.float32`` to halve memory);
+        the statistics are always accumulated in float64.
+    copy : bool
+        If ``False``, ``transform`` works in place when the input already is
+        an array (or sparse matrix) of ``dtype``.
     """
 
-    def fit(self, X, y=None):
-        X = np.asarray(X, dtype=float)
-        self.mean_ = X.mean(axis=0)
-        self.std_ = X.std(axis=0)
+    def __init__(self, with_mean=True, dtype=np.float64, copy=True):
+        self.with_mean = with_mean
+        self.dtype = dtype
+        self.copy = copy
+
+    def _check_sparse(self, X):
+        if sp.issparse(X) and self.with_mean:
+            raise ValueError(
+                "Cannot center sparse matrices: use with_mean=False to scale only"
+            )
+
+    # ----------------------------
+    # Running moments
+    # ----------------------------
+    def _chunk_moments(self, X):
+        """Count, mean and sum of squared deviations of one chunk."""
+        if sp.issparse(X):
+            X = X.tocsr()
+            n = X.shape[0]
+            mean = np.asarray(X.sum(axis=0), dtype=np.float64).ravel() / n
+            # Deviations of the stored entries plus the implicit zeros
+            data = X.data.astype(np.float64) - mean[X.indices]
+            n_cols = X.shape[1]
+            m2 = np.bincount(X.indices, weights=data**2, minlength=n_cols)
+            n_zeros = n - np.bincount(X.indices, minlength=n_cols)
+            m2 += n_zeros * mean**2
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            if X.ndim == 1:
+                X = X.reshape(-1, 1)
+            n = X.shape[0]
+            mean = X.mean(axis=0)
+            m2 = ((X - mean) ** 2).sum(axis=0)
+        return n, mean, m2
+
+    def _combine(self, n_b, mean_b, m2_b):
+        # Chan et al. pairwise update of (count, mean, M2)
+        n_a = getattr(self, "n_samples_seen_", 0)
+        if n_a == 0:
+            self.n_samples_seen_, self.mean_, self._m2 = n_b, mean_b, m2_b
+        elif n_b > 0:
+            n = n_a + n_b
+            delta = mean_b - self.mean_
+            self.mean_ = self.mean_ + delta * (n_b / n)
+            self._m2 = self._m2 + m2_b + delta**2 * (n_a * n_b / n)
+            self.n_samples_seen_ = n
+
+        self.var_ = self._m2 / self.n_samples_seen_
+        std = np.sqrt(self.var_)
+        # Constant columns: leave them unscaled instead of dividing by zero
+        self.std_ = np.where(std > 0, std, 1.0)
         return self
 
+    def fit(self, X, y=None):
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        """Update the statistics with one chunk of rows."""
+        self._check_sparse(X)
+        return self._combine(*self._chunk_moments(X))
+
+    def merge(self, other):
+        """Add the statistics of another (partially) fitted scaler."""
+        return self._combine(other.n_samples_seen_, other.mean_, other._m2)
+
+    # ----------------------------
+    # Transform
+    # ----------------------------
     def transform(self, X):
-        X = np.asarray(X, dtype=float)
-        return (X - self.mean_) / self.std_
+        self._check_sparse(X)
+        if sp.issparse(X):
+            X = X.astype(self.dtype, copy=self.copy)
+            if X.format in ("csr", "csc"):
+                # Scale the stored values only; zeros stay zeros
+                cols = (
+                    X.indices
+                    if X.format == "csr"
+                    else np.repeat(np.arange(X.shape[1]), np.diff(X.indptr))
+                )
+                X.data /= self.std_[cols].astype(self.dtype)
+                return X
+            return X.multiply(1.0 / self.std_).astype(self.dtype)
+
+        X = np.array(X, dtype=self.dtype, copy=self.copy or None)
+        if self.with_mean:
+            X -= self.mean_.astype(self.dtype)
+        X /= self.std_.astype(self.dtype)
+        return X
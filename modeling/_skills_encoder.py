@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+def _to_list_series(X) -> pl.Series:
+    """
+    Return the skills column as a polars ``List(String)`` Series.
+
+    Accepts a polars/pandas Series or single-column DataFrame, a 2-D object
+    array (as passed by ColumnTransformer) or a plain list of lists.
+    """
+    if isinstance(X, pl.DataFrame):
+        X = X.to_series(0)
+    elif isinstance(X, pd.DataFrame):
+        X = X.iloc[:, 0]
+    elif isinstance(X, np.ndarray) and X.ndim == 2:
+        X = X[:, 0]
+
+    s = X if isinstance(X, pl.Series) else pl.Series(X)
+    return s.cast(pl.List(pl.Utf8))
+
+
+class MultiHotSkillsEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encode a column of skill lists as a sparse multi-hot (CSR) matrix.
+
+    Every row is turned into one column per vocabulary skill in a single
+    vectorized pass: the lists are flattened, looked up in the vocabulary and
+    the list lengths become the CSR row pointers. Skills not in the vocabulary
+    are ignored.
+
+    Parameters
+    ----------
+    min_frequency : int or float
+        Skills required by fewer job postings are dropped from the vocabulary.
+        A float in (0, 1) is read as a fraction of the rows seen in fit.
+    """
+
+    def __init__(self, min_frequency: int | float = 1):
+        self.min_frequency = min_frequency
+
+    def fit(self, X, y=None):
+        s = _to_list_series(X)
+
+        # Count each skill once per posting (document frequency)
+        flat = s.list.unique().explode(empty_as_null=False, keep_nulls=False)
+        counts = flat.drop_nulls().value_counts(name="n")
+
+        min_n = self.min_frequency
+        if isinstance(min_n, float) and 0 < min_n < 1:
+            min_n = int(np.ceil(min_n * len(s)))
+
+        vocab = counts.filter(pl.col("n") >= min_n).get_column(flat.name).sort()
+
+        self.vocabulary_ = {skill: i for i, skill in enumerate(vocab.to_list())}
+        self.skills_ = vocab.to_numpy().astype(object)
+        self.n_features_in_ = 1
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "vocabulary_")
+        s = _to_list_series(X)
+        n_rows = len(s)
+
+        lengths = s.list.len().fill_null(0).to_numpy()
+        flat = s.explode(empty_as_null=False, keep_nulls=False)
+
+        codes = flat.replace_strict(
+            self.vocabulary_, default=-1, return_dtype=pl.Int32
+        ).to_numpy()
+        rows = np.repeat(np.arange(n_rows, dtype=np.int32), lengths)
+
+        known = codes >= 0
+        rows, codes = rows[known], codes[known]
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+
+        X_out = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.float64), codes, indptr),
+            shape=(n_rows, len(self.vocabulary_)),
+        )
+        # A skill listed twice in one posting is still a single hot entry
+        X_out.sum_duplicates()
+        X_out.data[:] = 1.0
+        return X_out
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "vocabulary_")
+        prefix = "skills_list" if input_features is None else input_features[0]
+        return np.array([f"{prefix}_{skill}" for skill in self.skills_], dtype=object)
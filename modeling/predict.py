@@ -0,0 +1,192 @@
+"""
+Batch scoring of the tuned models over a (possibly very large) Parquet file.
+
+The input is streamed in record batches, scored in a process pool where every
+worker loads each model once, and the predictions are appended to the output
+Parquet as they come back, so memory stays bounded by the batch size.
+
+python -m modeling.predict data/jobs_cleaned.parquet reports/predictions.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from joblib import load
+
+from instrumentation import (
+    add_profile_arguments,
+    enable_from_args,
+    peak_rss_mb,
+    stage,
+)
+from modeling._common import CAT_COLS, NUM_COLS
+from serving import load_bundle
+
+DEFAULT_MODELS = {
+    "glm": "modeling/models/best_glm.joblib",
+    "lgbm": "modeling/models/best_lgbm.joblib",
+}
+
+# Models loaded once per worker process (see _init_worker)
+_MODELS: dict = {}
+
+
+def _init_worker(model_paths: dict[str, str]) -> None:
+    _MODELS.clear()
+    for name, path in model_paths.items():
+        # A directory is a model bundle (see serving), a file a joblib pipeline.
+        # Bundled boosters use native LightGBM here: faster for large batches.
+        if Path(path).is_dir():
+            _MODELS[name] = load_bundle(path, engine="lightgbm")
+        else:
+            _MODELS[name] = load(path)
+
+
+def _feature_columns(model) -> list[str]:
+    names = getattr(model, "feature_names_in_", None)
+    return list(names) if names is not None else NUM_COLS + CAT_COLS
+
+
+def _input_columns(path: str | Path) -> list[str]:
+    """Input columns of a saved model, without keeping it loaded."""
+    if Path(path).is_dir():
+        manifest = json.loads((Path(path) / "manifest.json").read_text())
+        return manifest["num_cols"] + manifest["cat_cols"]
+    return _feature_columns(load(path))
+
+
+def _score_batch(batch: pa.RecordBatch, id_column: str | None) -> pa.RecordBatch:
+    X = batch.to_pandas()
+    out = {}
+    if id_column is not None:
+        out[id_column] = batch.column(id_column)
+    for name, model in _MODELS.items():
+        # Models are trained on log1p(salary_usd)
+        pred = np.expm1(model.predict(X[_feature_columns(model)]))
+        out[f"pred_{name}"] = pa.array(pred, type=pa.float64())
+    return pa.RecordBatch.from_pydict(out)
+
+
+def predict_parquet(
+    in_path: str | Path,
+    out_path: str | Path,
+    model_paths: dict[str, str] | None = None,
+    batch_size: int = 100_000,
+    n_workers: int = 1,
+    id_column: str | None = "job_id",
+) -> dict[str, float]:
+    """
+    Score ``in_path`` batch by batch and write the predictions to ``out_path``.
+
+    ``n_workers=0`` scores in the current process. Returns the number of rows,
+    wall time, throughput (rows/s) and peak RSS (MB, largest single process).
+    """
+    if model_paths is None:
+        model_paths = DEFAULT_MODELS
+
+    # Only read the columns the models need
+    columns = sorted({c for p in model_paths.values() for c in _input_columns(p)})
+    if id_column is not None:
+        columns = [id_column, *columns]
+
+    source = pq.ParquetFile(in_path)
+    batches = source.iter_batches(batch_size=batch_size, columns=columns)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with stage("predict_parquet") as s:
+        t0 = time.perf_counter()
+        n_rows = 0
+        writer = None
+        try:
+            if n_workers == 0:
+                _init_worker(model_paths)
+                results = (_score_batch(b, id_column) for b in batches)
+                for res in results:
+                    writer = writer or pq.ParquetWriter(out_path, res.schema)
+                    writer.write_batch(res)
+                    n_rows += res.num_rows
+            else:
+                with ProcessPoolExecutor(
+                    n_workers, initializer=_init_worker, initargs=(model_paths,)
+                ) as pool:
+                    # Keep a bounded number of batches in flight, written in order
+                    pending: deque = deque()
+                    for batch in batches:
+                        pending.append(pool.submit(_score_batch, batch, id_column))
+                        if len(pending) >= 2 * n_workers:
+                            res = pending.popleft().result()
+                            writer = writer or pq.ParquetWriter(out_path, res.schema)
+                            writer.write_batch(res)
+                            n_rows += res.num_rows
+                    while pending:
+                        res = pending.popleft().result()
+                        writer = writer or pq.ParquetWriter(out_path, res.schema)
+                        writer.write_batch(res)
+                        n_rows += res.num_rows
+        finally:
+            _MODELS.clear()
+            if writer is not None:
+                writer.close()
+        s.rows = n_rows
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "rows": n_rows,
+        "seconds": elapsed,
+        "rows_per_sec": n_rows / elapsed if elapsed > 0 else float("nan"),
+        "peak_rss_mb": peak_rss_mb(children=True),
+    }
+
+
+def _parse_model(spec: str) -> tuple[str, str]:
+    name, _, path = spec.partition("=")
+    if not path:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {spec!r}")
+    return name, path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="Parquet file with the feature columns")
+    parser.add_argument("output", help="Parquet file to write predictions to")
+    parser.add_argument(
+        "--model",
+        action="append",
+        type=_parse_model,
+        help="NAME=PATH of a joblib pipeline or model bundle directory "
+        "(repeatable; default: glm and lgbm)",
+    )
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="0 scores in the main process"
+    )
+    parser.add_argument(
+        "--id-column", default="job_id", help="column copied to the output"
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    stats = predict_parquet(
+        args.input,
+        args.output,
+        model_paths=dict(args.model) if args.model else None,
+        batch_size=args.batch_size,
+        n_workers=args.workers,
+        id_column=args.id_column or None,
+    )
+    print(f"rows        : {stats['rows']:,}")
+    print(f"wall time   : {stats['seconds']:.2f} s")
+    print(f"throughput  : {stats['rows_per_sec']:,.0f} rows/s")
+    print(f"peak RSS    : {stats['peak_rss_mb']:.0f} MB")
@@ -1,3 +1,5 @@
+from ._density import DENSITY_THRESHOLD, density_grid, plot_density
+from ._group_stats import GroupStats, compute_group_stats
 from ._plotting import (
     plot_group_median_salary,
     plot_salary_hist,
@@ -10,4 +12,9 @@ __all__ = [
     "plot_group_median_salary",
     "plot_salary_scatter",
     "plot_top_skills",
+    "density_grid",
+    "plot_density",
+    "DENSITY_THRESHOLD",
+    "GroupStats",
+    "compute_group_stats",
 ]
@@ -0,0 +1,87 @@
+"""
+Density rendering for scatter plots with many points.
+
+Points are binned into a fixed 2-D grid with integer arithmetic and one
+``np.bincount``, and only the grid goes to matplotlib (as an image), so render
+time and PNG size depend on the grid, not on the number of rows.
+"""
+
+from __future__ import annotations
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm, Normalize
+
+# Row count above which the plotting functions switch to density mode
+DENSITY_THRESHOLD = 100_000
+
+
+def density_grid(
+    x, y, bins: int | tuple[int, int] = 200, limits=None
+) -> tuple[np.ndarray, tuple[float, float, float, float]]:
+    """
+    Count points per cell of a ``bins`` grid.
+
+    Returns the counts with shape ``(ny, nx)`` (row 0 at the bottom) and the
+    extent ``(xmin, xmax, ymin, ymax)``; NaN points are dropped. ``limits``
+    is ``((xmin, xmax), (ymin, ymax))`` (default: the data range).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    nx, ny = (bins, bins) if np.isscalar(bins) else bins
+
+    if limits is None:
+        limits = ((x.min(), x.max()), (y.min(), y.max())) if len(x) else ((0, 1),) * 2
+    (xmin, xmax), (ymin, ymax) = limits
+    # Degenerate axis: widen so the single value sits in a valid cell
+    if xmax <= xmin:
+        xmin, xmax = xmin - 0.5, xmin + 0.5
+    if ymax <= ymin:
+        ymin, ymax = ymin - 0.5, ymin + 0.5
+
+    ix = ((x - xmin) * (nx / (xmax - xmin))).astype(np.int64)
+    iy = ((y - ymin) * (ny / (ymax - ymin))).astype(np.int64)
+    # Points on the upper edge belong to the last cell, others outside are out
+    ix[x == xmax] = nx - 1
+    iy[y == ymax] = ny - 1
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+
+    counts = np.bincount(iy[inside] * nx + ix[inside], minlength=nx * ny).reshape(
+        ny, nx
+    )
+    return counts, (xmin, xmax, ymin, ymax)
+
+
+def plot_density(
+    x,
+    y,
+    ax=None,
+    bins: int | tuple[int, int] = 200,
+    log: bool = True,
+    cmap: str = "viridis",
+    limits=None,
+):
+    """
+    Draw the point density of ``(x, y)`` as an image; empty cells stay blank.
+
+    ``log=True`` uses a logarithmic color scale. Returns the ``AxesImage``.
+    """
+    ax = ax if ax is not None else plt.gca()
+    counts, extent = density_grid(x, y, bins=bins, limits=limits)
+    masked = np.ma.masked_equal(counts, 0)
+    vmax = max(int(counts.max()), 1)
+    norm = LogNorm(vmin=1, vmax=vmax) if log else Normalize(vmin=0, vmax=vmax)
+
+    image = ax.imshow(
+        masked,
+        origin="lower",
+        extent=extent,
+        aspect="auto",
+        interpolation="nearest",
+        cmap=cmap,
+        norm=norm,
+    )
+    ax.figure.colorbar(image, ax=ax, label="count (log)" if log else "count")
+    return image
@@ -0,0 +1,176 @@
+"""
+One-pass grouped statistics for the plotting functions.
+
+``compute_group_stats`` builds one aggregation per grouping column plus the
+skill frequency table as lazy queries and runs them together with
+``pl.collect_all``, so the shared source (e.g. a ``scan_parquet``) is read
+once. The resulting ``GroupStats`` is small and can be kept in memory or
+saved as Parquet files.
+
+With ``approx=True`` the quantiles come from per-group log-bucket counts
+(DDSketch-style, relative error at most ``relative_accuracy`` for positive
+values) instead of exact sorts.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import polars as pl
+
+VALUE_COL = "salary_usd"
+SKILLS_COL = "skills_list"
+
+
+def _quantile_name(q: float) -> str:
+    return "median_salary" if q == 0.5 else f"q{round(100 * q):02d}"
+
+
+class GroupStats:
+    """
+    Cached per-group statistics.
+
+    Attributes
+    ----------
+    groups : dict[str, pl.DataFrame]
+        Per grouping column: the group value, ``n``, ``median_salary`` and one
+        ``qXX`` column per other quantile.
+    skills : pl.DataFrame or None
+        ``skill`` and ``n_jobs`` (as counted by ``plot_top_skills``), sorted by
+        ``n_jobs`` descending.
+    """
+
+    def __init__(self, groups: dict[str, pl.DataFrame], skills=None, meta=None):
+        self.groups = groups
+        self.skills = skills
+        self.meta = meta or {}
+
+    def group(self, col: str) -> pl.DataFrame:
+        if col not in self.groups:
+            raise KeyError(f"No statistics for {col!r}; computed: {list(self.groups)}")
+        return self.groups[col]
+
+    # ----------------------------
+    # Parquet persistence
+    # ----------------------------
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for col, table in self.groups.items():
+            table.write_parquet(path / f"group_{col}.parquet")
+        if self.skills is not None:
+            self.skills.write_parquet(path / "skills.parquet")
+        meta = {**self.meta, "groups": list(self.groups)}
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GroupStats":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        groups = {
+            col: pl.read_parquet(path / f"group_{col}.parquet")
+            for col in meta["groups"]
+        }
+        skills_path = path / "skills.parquet"
+        skills = pl.read_parquet(skills_path) if skills_path.exists() else None
+        return cls(groups, skills, meta)
+
+
+def _exact_query(lf: pl.LazyFrame, col: str, quantiles) -> pl.LazyFrame:
+    value = pl.col(VALUE_COL)
+    return lf.group_by(col).agg(
+        pl.len().alias("n"),
+        *[
+            value.quantile(q, interpolation="linear").alias(_quantile_name(q))
+            for q in quantiles
+        ],
+    )
+
+
+def _approx_query(
+    lf: pl.LazyFrame, col: str, quantiles, relative_accuracy: float
+) -> pl.LazyFrame:
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    # Bucket k holds (gamma^(k-1), gamma^k]; its representative value
+    # 2 gamma^k / (gamma + 1) is within relative_accuracy of every member
+    key = (
+        (pl.col(VALUE_COL).clip(lower_bound=1e-300).log() / math.log(gamma))
+        .ceil()
+        .cast(pl.Int32)
+        .alias("_key")
+    )
+    # Missing values form a null bucket, sorted last: counted in ``n`` (all
+    # rows, as in the exact path) but not in the quantile ranks
+    buckets = (
+        lf.group_by(col, key)
+        .agg(pl.len().alias("_count"))
+        .sort(col, "_key", nulls_last=True)
+        .with_columns(
+            pl.col("_count").cum_sum().over(col).alias("_cum"),
+            pl.col("_count").sum().over(col).alias("n"),
+            pl.col("_count")
+            .filter(pl.col("_key").is_not_null())
+            .sum()
+            .over(col)
+            .alias("_n_values"),
+        )
+    )
+    rank = pl.col("_n_values") - 1
+    return buckets.group_by(col).agg(
+        pl.col("n").first(),
+        *[
+            (
+                2
+                * gamma ** pl.col("_key").filter(pl.col("_cum") > q * rank).first()
+                / (gamma + 1)
+            ).alias(_quantile_name(q))
+            for q in quantiles
+        ],
+    )
+
+
+def compute_group_stats(
+    df: pl.DataFrame | pl.LazyFrame,
+    group_cols: list[str],
+    *,
+    quantiles=(0.25, 0.5, 0.75),
+    skills: bool = True,
+    approx: bool = False,
+    relative_accuracy: float = 0.01,
+) -> GroupStats:
+    """
+    Counts and ``VALUE_COL`` quantiles for every column in ``group_cols`` and
+    (if ``skills``) the skill frequency table, from one pass over ``df``.
+    """
+    quantiles = sorted(set(quantiles) | {0.5})
+    lf = df.lazy()
+
+    queries = [
+        (
+            _approx_query(lf, col, quantiles, relative_accuracy)
+            if approx
+            else _exact_query(lf, col, quantiles)
+        ).sort(col, nulls_last=True)
+        for col in group_cols
+    ]
+    if skills:
+        queries.append(
+            lf.select(pl.col(SKILLS_COL).alias("skill"))
+            .explode("skill")
+            .filter(pl.col("skill").is_not_null() & (pl.col("skill") != ""))
+            .group_by("skill")
+            .agg(pl.len().alias("n_jobs"))
+            .sort(["n_jobs", "skill"], descending=[True, False])
+        )
+
+    results = pl.collect_all(queries)
+    groups = dict(zip(group_cols, results))
+    meta = {
+        "quantiles": quantiles,
+        "approx": approx,
+        "relative_accuracy": relative_accuracy if approx else None,
+    }
+    return GroupStats(groups, results[-1] if skills else None, meta)
@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import polars as pl
 
+from ._density import DENSITY_THRESHOLD, plot_density
+from ._group_stats import GroupStats
+
 
 def plot_salary_hist(df: pl.DataFrame, log_scale: bool = False, bins: int = 50) -> None:
 
@@ -15,26 +18,30 @@ def plot_salary_hist(df: pl.DataFrame, log_scale: bool = False, bins: int = 50)
 
 
 def plot_group_median_salary(
-    df: pl.DataFrame,
+    df: pl.DataFrame | None,
     group_col: str,
     order: list[str] | None = None,
     min_n: int = 20,
+    stats: GroupStats | None = None,
 ) -> None:
-    g = (
-        df.group_by(group_col)
-        .agg(
+    # Precomputed statistics (compute_group_stats) skip the group_by over df
+    if stats is not None:
+        g = stats.group(group_col).select(group_col, "median_salary", "n")
+    else:
+        g = df.group_by(group_col).agg(
             pl.col("salary_usd").median().alias("median_salary"),
             pl.len().alias("n"),
         )
-        .filter(pl.col("n") >= min_n)  # groups with small samples are excluded
-    )
+    g = g.filter(pl.col("n") >= min_n)  # groups with small samples are excluded
 
     if order is not None:
         # if a group is not included order, it will be excluded
         g = (
             g.filter(pl.col(group_col).is_in(order))
             .with_columns(
-                pl.col(group_col).replace(order, list(range(len(order)))).alias("_ord")
+                pl.col(group_col)
+                .replace_strict(order, list(range(len(order))), return_dtype=pl.Int64)
+                .alias("_ord")
             )
             .sort("_ord")
             .drop("_ord")
@@ -56,7 +63,18 @@ def plot_group_median_salary(
     plt.show()
 
 
-def plot_salary_scatter(df, corr_cols) -> None:
+def plot_salary_scatter(
+    df, corr_cols, kind: str = "auto", bins: int = 200, log: bool = True
+) -> None:
+    """
+    salary_usd against each column in ``corr_cols``.
+
+    ``kind="density"`` draws a binned 2-D density (``bins`` cells per axis,
+    log color scale if ``log``) instead of one marker per row;
+    ``kind="auto"`` does so above ``DENSITY_THRESHOLD`` rows.
+    """
+    if kind == "auto":
+        kind = "density" if len(df) > DENSITY_THRESHOLD else "scatter"
 
     y = df["salary_usd"].to_numpy()
 
@@ -64,7 +82,10 @@ def plot_salary_scatter(df, corr_cols) -> None:
         x = df[xcol].to_numpy()
 
         plt.figure()
-        plt.scatter(x, y, alpha=0.3, s=10)
+        if kind == "density":
+            plot_density(x, y, bins=bins, log=log)
+        else:
+            plt.scatter(x, y, alpha=0.3, s=10)
         plt.xlabel(xcol)
         plt.ylabel("salary_usd")
         plt.title(f"salary_usd vs {xcol}")
@@ -73,9 +94,10 @@ def plot_salary_scatter(df, corr_cols) -> None:
 
 
 def plot_top_skills(
-    df: pl.DataFrame,
+    df: pl.DataFrame | None,
     top_n: int = 15,
     min_n: int = 1,
+    stats: GroupStats | None = None,
 ) -> None:
     """
     Plot top-N most frequently required skills.
@@ -88,24 +110,37 @@ def plot_top_skills(
         Number of top skills to display
     min_n : int
         Minimum number of job postings required for a skill
+    stats : GroupStats, optional
+        Precomputed skill counts (``compute_group_stats``); ``df`` is not used
+        unless ``stats`` were computed with ``skills=False``
     """
 
-    # explode skills_list -> one row per skill
-    df_skills = (
-        df.select("skills_list")
-        .explode("skills_list")
-        .rename({"skills_list": "skill"})
-        .filter(pl.col("skill").is_not_null() & (pl.col("skill") != ""))
-    )
+    if stats is not None and stats.skills is None:
+        if df is None:
+            raise ValueError(
+                "stats computed without skills (skills=False); pass df instead"
+            )
+        stats = None
 
-    # aggregate counts
-    skill_counts = (
-        df_skills.group_by("skill")
-        .agg(pl.len().alias("n_jobs"))
-        .filter(pl.col("n_jobs") >= min_n)
-        .sort("n_jobs", descending=True)
-        .head(top_n)
-    )
+    if stats is not None:
+        skill_counts = stats.skills.filter(pl.col("n_jobs") >= min_n).head(top_n)
+    else:
+        # explode skills_list -> one row per skill
+        df_skills = (
+            df.select("skills_list")
+            .explode("skills_list")
+            .rename({"skills_list": "skill"})
+            .filter(pl.col("skill").is_not_null() & (pl.col("skill") != ""))
+        )
+
+        # aggregate counts
+        skill_counts = (
+            df_skills.group_by("skill")
+            .agg(pl.len().alias("n_jobs"))
+            .filter(pl.col("n_jobs") >= min_n)
+            .sort("n_jobs", descending=True)
+            .head(top_n)
+        )
 
     # plot (horizontal bar for readability)
     plt.figure()
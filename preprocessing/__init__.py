@@ -1,3 +1,3 @@
-from ._preprocessing import preprocess
+from ._preprocessing import load_mappings, map_to_group, preprocess
 
-__all__ = ["preprocess"]
+__all__ = ["preprocess", "load_mappings", "map_to_group"]
@@ -1,107 +1,112 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, TypeVar
+
 import polars as pl
 
+from instrumentation import stage
 
-def preprocess(df: pl.DataFrame) -> pl.DataFrame:
-    # ----------------------------
-    # 1. Process the dtype of date
-    # ----------------------------
-    df = df.with_columns(
-        [
-            pl.col("posting_date").str.strptime(pl.Date, "%Y-%m-%d", strict=False),
-            pl.col("application_deadline").str.strptime(
-                pl.Date, "%Y-%m-%d", strict=False
-            ),
-        ]
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
+# Lookup tables for the country -> area and industry -> group aggregation.
+# Point AI_JOBS_MAPPINGS at another JSON file to change them without code edits.
+MAPPINGS_PATH = Path(__file__).with_name("mappings.json")
+ENV_MAPPINGS = "AI_JOBS_MAPPINGS"
+
+
+def load_mappings(path: str | Path | None = None) -> dict[str, Any]:
+    """
+    Read the categorical lookup tables.
+
+    Each table has the form ``{"default": str, "groups": {group: [values]}}``.
+    """
+    if path is None:
+        path = os.environ.get(ENV_MAPPINGS) or MAPPINGS_PATH
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def map_to_group(col_name: str, table: dict[str, Any]) -> pl.Expr:
+    """
+    Map the values of ``col_name`` to their group as a single hash lookup.
+
+    Values that are not listed (and nulls) fall back to the table default. The
+    result is a ``pl.Enum`` whose categories are the groups in table order.
+    """
+    default = table.get("default", "Other")
+
+    lookup: dict[str, str] = {}
+    for group, values in table["groups"].items():
+        for value in values:
+            lookup.setdefault(value, group)  # first listed group wins
+
+    categories = list(dict.fromkeys([*table["groups"], default]))
+
+    return pl.col(col_name).replace_strict(
+        lookup, default=default, return_dtype=pl.Enum(categories)
     )
 
-    # ----------------------------
-    # 2. Aggregate country into geographic areas
-    # ----------------------------
-    AREA_MAP = {
-        "Asia": [
-            "China",
-            "India",
-            "Singapore",
-            "South Korea",
-            "Israel",
-            "Japan",
-        ],
-        "Europe": [
-            "Switzerland",
-            "France",
-            "Germany",
-            "United Kingdom",
-            "Austria",
-            "Sweden",
-            "Norway",
-            "Netherlands",
-            "Ireland",
-            "Denmark",
-            "Finland",
-        ],
-        "North America": [
-            "United States",
-            "Canada",
-        ],
-        "Australia": [
-            "Australia",
-        ],
-    }
-
-    def map_country_to_area(col_name: str) -> pl.Expr:
-        expr = pl.when(pl.lit(False)).then(pl.lit("Other"))
-
-        for area, countries in AREA_MAP.items():
-            expr = expr.when(pl.col(col_name).is_in(countries)).then(pl.lit(area))
-
-        return expr.otherwise(pl.lit("Other"))
+
+def preprocess(df: FrameT, mappings: dict[str, Any] | None = None) -> FrameT:
+    """
+    Clean the raw job postings and add the engineered columns.
+
+    Accepts an eager ``pl.DataFrame`` or a ``pl.LazyFrame`` and returns the same
+    type. All steps are built as one lazy query with a single projection, so a
+    LazyFrame input (e.g. from ``pl.scan_csv``) can be streamed straight into
+    ``sink_parquet`` without materialising the full dataset.
+
+    ``mappings`` overrides the lookup tables from ``load_mappings``.
+    """
+    if mappings is None:
+        mappings = load_mappings()
+
+    lf = df.lazy()
 
     # ----------------------------
-    # Aggregate company location into areas
-    # ----------------------------
-    df = df.with_columns(map_country_to_area("company_location").alias("company_area"))
-    # ----------------------------
-    # Aggregate employee residence into areas
+    # 1. Process the dtype of date
     # ----------------------------
-    df = df.with_columns(
-        map_country_to_area("employee_residence").alias("residence_area")
-    )
+    date_exprs = [
+        pl.col("posting_date").str.strptime(pl.Date, "%Y-%m-%d", strict=False),
+        pl.col("application_deadline").str.strptime(pl.Date, "%Y-%m-%d", strict=False),
+    ]
+
     # ----------------------------
-    # Same country indicator
+    # 2. Aggregate country into geographic areas
     # ----------------------------
-    df = df.with_columns(
+    # Groups are looked up as Enum and stored as String, the schema of
+    # jobs_cleaned.parquet
+    area_exprs = [
+        # Aggregate company location into areas
+        map_to_group("company_location", mappings["area"])
+        .cast(pl.String)
+        .alias("company_area"),
+        # Aggregate employee residence into areas
+        map_to_group("employee_residence", mappings["area"])
+        .cast(pl.String)
+        .alias("residence_area"),
+        # Same country indicator
         (pl.col("company_location") == pl.col("employee_residence")).alias(
             "same_country"
-        )
-    )
+        ),
+    ]
 
     # ----------------------------
     # 3. Aggregate industry into broader groups
     # ----------------------------
-    df = df.with_columns(
-        pl.when(pl.col("industry").is_in(["Technology", "Telecommunications"]))
-        .then(pl.lit("Tech & Telecom"))
-        .when(pl.col("industry").is_in(["Finance", "Real Estate"]))
-        .then(pl.lit("Finance & Real Estate"))
-        .when(pl.col("industry").is_in(["Healthcare", "Education", "Government"]))
-        .then(pl.lit("Public & Social"))
-        .when(pl.col("industry").is_in(["Manufacturing", "Automotive"]))
-        .then(pl.lit("Manufacturing"))
-        .when(pl.col("industry") == "Energy")
-        .then(pl.lit("Energy"))
-        .when(pl.col("industry").is_in(["Transportation", "Retail"]))
-        .then(pl.lit("Consumer & Transport"))
-        .when(pl.col("industry").is_in(["Media", "Gaming"]))
-        .then(pl.lit("Media & Entertainment"))
-        .when(pl.col("industry") == "Consulting")
-        .then(pl.lit("Consulting"))
-        .otherwise(pl.lit("Other"))  # Please reconsider the clarification if it happens
+    industry_expr = (
+        map_to_group("industry", mappings["industry_group"])
+        .cast(pl.String)
         .alias("industry_group")
     )
+
     # ----------------------------
     # 4. Split required skills into a list
     # ----------------------------
-    df = df.with_columns(
+    skills_expr = (
         pl.col("required_skills")
         .str.split(",")  # Split comma-separated skills into a list
         .list.eval(
@@ -113,10 +118,16 @@ def preprocess(df: pl.DataFrame) -> pl.DataFrame:
     # ----------------------------
     # 5. Create summary skill feature
     # ----------------------------
-    df = df.with_columns(
-        pl.col("skills_list")
-        .list.len()
-        .alias("num_skills")  # Number of listed skills as a proxy for job complexity
+    num_skills_expr = skills_expr.list.len().alias(
+        "num_skills"
+    )  # Number of listed skills as a proxy for job complexity
+
+    # One fused projection: every new column is computed in a single pass
+    lf = lf.with_columns(
+        *date_exprs, *area_exprs, industry_expr, skills_expr, num_skills_expr
     )
 
-    return df
+    if isinstance(df, pl.LazyFrame):
+        return lf
+    with stage("preprocess", rows=df.height):
+        return lf.collect()
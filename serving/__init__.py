@@ -0,0 +1,4 @@
+from ._bundle import ModelBundle, export_bundle, load_bundle
+from ._compiled_glm import CompiledGLM, compile_glm
+
+__all__ = ["CompiledGLM", "ModelBundle", "compile_glm", "export_bundle", "load_bundle"]
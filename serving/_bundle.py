@@ -0,0 +1,237 @@
+"""
+Fast-loading model bundles.
+
+A bundle is a directory holding a fitted ``Pipeline(preprocess + model)`` as
+plain data instead of a pickle:
+
+- ``manifest.json``: model kind, feature encoding, columns, category lists and
+  the imputation fill values for the categoricals
+- ``num_fill.npy``: median fill values for ``num_cols``
+- ``coef.npy``: GLM coefficients (intercept in the manifest)
+- ``booster.txt``: LightGBM booster in its native text format
+- ``tree_*.npy``: the same trees as flat node arrays (see ``_trees``)
+
+Loading only needs numpy; sklearn, glum and lightgbm are never imported (LGBM
+bundles are evaluated from the tree arrays unless ``engine="lightgbm"``). The
+``.npy`` arrays are memory-mapped, so worker processes that load the same
+bundle share one copy through the page cache.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ._trees import TREE_ARRAYS, parse_lgbm_model, predict_trees
+
+FORMAT_VERSION = 1
+
+
+# ----------------------------
+# Export (from a fitted sklearn pipeline)
+# ----------------------------
+def describe_preprocessor(pre) -> tuple[dict, np.ndarray]:
+    """
+    Plain-data description of a fitted ``make_preprocessor`` /
+    ``make_native_preprocessor`` ColumnTransformer.
+
+    Returns the manifest entries (encoding, columns, categories, categorical
+    fill values, output feature names) and the numeric fill values.
+    """
+    steps = {name: (trans, cols) for name, trans, cols in pre.transformers_}
+    unsupported = set(steps) - {"num", "cat", "remainder"}
+    if unsupported:
+        raise ValueError(f"Cannot bundle transformers: {sorted(unsupported)}")
+
+    num_pipe, num_cols = steps["num"]
+    cat_pipe, cat_cols = steps["cat"]
+
+    if "ohe" in cat_pipe.named_steps:
+        encoding = "onehot"
+        categories = cat_pipe.named_steps["ohe"].categories_
+    elif "category" in cat_pipe.named_steps:
+        encoding = "native"
+        categories = cat_pipe.named_steps["category"].categories_
+    else:
+        raise ValueError("Categorical step must be 'ohe' or 'category'")
+
+    description = {
+        "encoding": encoding,
+        "num_cols": list(num_cols),
+        "cat_cols": list(cat_cols),
+        "cat_fill": [str(v) for v in cat_pipe.named_steps["imputer"].statistics_],
+        "categories": [[str(c) for c in cats] for cats in categories],
+        "feature_names": [str(n) for n in pre.get_feature_names_out()],
+    }
+    num_fill = np.asarray(num_pipe.named_steps["imputer"].statistics_, dtype=np.float64)
+    return description, num_fill
+
+
+def export_bundle(pipeline, path: str | Path) -> Path:
+    """
+    Write a fitted ``Pipeline([("preprocess", ...), ("model", ...)])`` built
+    with ``make_preprocessor`` or ``make_native_preprocessor`` as a bundle.
+
+    Supported models are linear models with ``coef_`` / ``intercept_`` (the
+    ElasticNet GLM) and ``LGBMRegressor``.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    model = pipeline.named_steps["model"]
+    description, num_fill = describe_preprocessor(pipeline.named_steps["preprocess"])
+    manifest = {"format": FORMAT_VERSION, **description}
+    np.save(path / "num_fill.npy", num_fill)
+
+    if hasattr(model, "booster_"):
+        manifest["kind"] = "lgbm"
+        model.booster_.save_model(str(path / "booster.txt"))
+        trees = parse_lgbm_model((path / "booster.txt").read_text())
+        for name, arr in trees.items():
+            np.save(path / f"tree_{name}.npy", arr)
+    elif hasattr(model, "coef_"):
+        manifest["kind"] = "glm"
+        np.save(path / "coef.npy", np.asarray(model.coef_, dtype=np.float64).ravel())
+        manifest["intercept"] = float(np.ravel(model.intercept_)[0])
+    else:
+        raise ValueError(f"Cannot bundle model of type {type(model).__name__}")
+
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return path
+
+
+# ----------------------------
+# Load + predict (numpy only)
+# ----------------------------
+def _is_missing_value(value) -> bool:
+    # None, any NaN (NaN != NaN) and pd.NA count as missing, like SimpleImputer.
+    # Comparisons with pd.NA return pd.NA, whose truth value raises TypeError;
+    # catching that keeps pandas out of the import.
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        return True
+
+
+def _is_missing(values: np.ndarray) -> np.ndarray:
+    return np.fromiter(
+        (_is_missing_value(v) for v in values), dtype=bool, count=len(values)
+    )
+
+
+def _as_float(values) -> np.ndarray:
+    """Float array with NaN for every missing value (incl. pd.NA in objects)."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except TypeError:
+        values = np.asarray(values, dtype=object)
+        return np.where(_is_missing(values), np.nan, values).astype(np.float64)
+
+
+class ModelBundle:
+    """
+    A loaded bundle; ``predict`` matches ``Pipeline.predict`` of the source.
+
+    ``X`` can be a pandas or polars DataFrame, or a dict of column -> values.
+
+    ``engine`` only matters for LGBM bundles: ``"numpy"`` (default) walks the
+    memory-mapped tree arrays and is fastest to load and for small batches;
+    ``"lightgbm"`` loads ``booster.txt`` into a native Booster, which is faster
+    for large batches.
+    """
+
+    def __init__(self, path: str | Path, mmap: bool = True, engine: str = "numpy"):
+        self.path = Path(path)
+        manifest = json.loads((self.path / "manifest.json").read_text())
+        if manifest["format"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format {manifest['format']}")
+
+        mmap_mode = "r" if mmap else None
+        self.kind = manifest["kind"]
+        self.encoding = manifest["encoding"]
+        self.num_cols = manifest["num_cols"]
+        self.cat_cols = manifest["cat_cols"]
+        self.cat_fill = manifest["cat_fill"]
+        self.feature_names = manifest["feature_names"]
+        # Input columns, named like sklearn's attribute for drop-in use
+        self.feature_names_in_ = self.num_cols + self.cat_cols
+        self.num_fill = np.load(self.path / "num_fill.npy", mmap_mode=mmap_mode)
+
+        # Sorted category arrays for vectorized lookup (searchsorted)
+        self.categories = []
+        for cats in manifest["categories"]:
+            cats = np.asarray(cats, dtype=str)
+            order = np.argsort(cats)
+            self.categories.append((cats[order], order))
+
+        # Column offsets of each categorical block in the design matrix
+        n_num = len(self.num_cols)
+        if self.encoding == "onehot":
+            sizes = [len(c) for c, _ in self.categories]
+            self._offsets = n_num + np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.n_features = len(self.feature_names)
+
+        if self.kind == "glm":
+            self.coef = np.load(self.path / "coef.npy", mmap_mode=mmap_mode)
+            self.intercept = manifest["intercept"]
+        elif engine == "numpy":
+            self.booster = None
+            self.trees = {
+                name: np.load(self.path / f"tree_{name}.npy", mmap_mode=mmap_mode)
+                for name in TREE_ARRAYS
+            }
+        elif engine == "lightgbm":
+            import lightgbm as lgb
+
+            self.booster = lgb.Booster(model_file=str(self.path / "booster.txt"))
+        else:
+            raise ValueError(f"Unknown engine {engine!r}")
+
+    def _encode_categorical(self, j: int, values) -> np.ndarray:
+        """Category index of each value (-1 for unseen)."""
+        values = np.asarray(values, dtype=object)
+        values = np.where(_is_missing(values), self.cat_fill[j], values).astype(str)
+
+        sorted_cats, order = self.categories[j]
+        pos = np.searchsorted(sorted_cats, values).clip(0, len(sorted_cats) - 1)
+        known = sorted_cats[pos] == values
+        return np.where(known, order[pos], -1)
+
+    def transform(self, X) -> np.ndarray:
+        """Dense design matrix in the column order of the fitted preprocessor."""
+        n_rows = len(X[self.num_cols[0]] if self.num_cols else X[self.cat_cols[0]])
+        Z = np.zeros((n_rows, self.n_features), dtype=np.float64)
+
+        for j, col in enumerate(self.num_cols):
+            v = _as_float(X[col])
+            Z[:, j] = np.where(np.isnan(v), self.num_fill[j], v)
+
+        n_num = len(self.num_cols)
+        for j, col in enumerate(self.cat_cols):
+            codes = self._encode_categorical(j, X[col])
+            if self.encoding == "onehot":
+                # handle_unknown="ignore": unseen values leave the block at 0
+                rows = np.flatnonzero(codes >= 0)
+                Z[rows, self._offsets[j] + codes[rows]] = 1.0
+            else:
+                # LightGBM treats NaN as missing for categorical features
+                Z[:, n_num + j] = np.where(codes >= 0, codes, np.nan)
+        return Z
+
+    def predict(self, X) -> np.ndarray:
+        Z = self.transform(X)
+        if self.kind == "glm":
+            return Z @ self.coef + self.intercept
+        if self.booster is not None:
+            return self.booster.predict(Z)
+        return predict_trees(self.trees, Z)
+
+
+def load_bundle(
+    path: str | Path, mmap: bool = True, engine: str = "numpy"
+) -> ModelBundle:
+    return ModelBundle(path, mmap=mmap, engine=engine)
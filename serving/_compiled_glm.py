@@ -0,0 +1,163 @@
+"""
+Compiled single-row predictor for the tuned ElasticNet GLM.
+
+A one-hot linear model is just an intercept, one slope per numeric column and
+one coefficient per category. ``compile_glm`` flattens the fitted pipeline
+into exactly that (plain floats and dicts), so a prediction is a handful of
+dict lookups and additions instead of ColumnTransformer dispatch, sparse
+matrix construction and input validation.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ._bundle import (
+    ModelBundle,
+    _as_float,
+    _is_missing_value,
+    describe_preprocessor,
+)
+
+
+class CompiledGLM:
+    """
+    Flat lookup form of a one-hot GLM pipeline (predicts on the model scale,
+    i.e. log1p(salary_usd) for the tuned GLM, like ``Pipeline.predict``).
+
+    Attributes
+    ----------
+    intercept : float
+    numeric : list of (column, slope, fill)
+        ``fill`` is the median used for missing values.
+    categorical : list of (column, {category: coefficient}, missing_coef)
+        Unseen categories contribute 0 (``handle_unknown="ignore"``); missing
+        values contribute the coefficient of the imputed (most frequent)
+        category.
+    """
+
+    def __init__(self, intercept: float, numeric: list, categorical: list):
+        self.intercept = float(intercept)
+        self.numeric = [(c, float(s), float(f)) for c, s, f in numeric]
+        self.categorical = [(c, dict(t), float(m)) for c, t, m in categorical]
+
+    # ----------------------------
+    # Prediction
+    # ----------------------------
+    def predict_one(self, row: dict) -> float:
+        """Prediction for one posting given as ``{column: value}``."""
+        y = self.intercept
+        for col, slope, fill in self.numeric:
+            v = row.get(col)
+            y += slope * (fill if _is_missing_value(v) else v)
+        for col, table, missing_coef in self.categorical:
+            v = row.get(col)
+            y += missing_coef if _is_missing_value(v) else table.get(v, 0.0)
+        return y
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Batch prediction; ``X`` is a pandas / polars DataFrame or a dict of
+        column -> values.
+        """
+        first = (self.numeric or self.categorical)[0][0]
+        y = np.full(len(X[first]), self.intercept)
+
+        for col, slope, fill in self.numeric:
+            v = _as_float(X[col])
+            y += slope * np.where(np.isnan(v), fill, v)
+
+        for col, table, missing_coef in self.categorical:
+            values = np.asarray(X[col], dtype=object)
+            y += np.fromiter(
+                (
+                    missing_coef if _is_missing_value(v) else table.get(v, 0.0)
+                    for v in values
+                ),
+                dtype=np.float64,
+                count=len(values),
+            )
+        return y
+
+    # ----------------------------
+    # Persistence (plain JSON)
+    # ----------------------------
+    def to_dict(self) -> dict:
+        return {
+            "intercept": self.intercept,
+            "numeric": self.numeric,
+            "categorical": self.categorical,
+        }
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompiledGLM":
+        d = json.loads(Path(path).read_text())
+        return cls(d["intercept"], d["numeric"], d["categorical"])
+
+
+def _build(description: dict, num_fill, coef, intercept) -> CompiledGLM:
+    if description["encoding"] != "onehot":
+        raise ValueError("Only one-hot GLM pipelines can be compiled")
+
+    coef = np.asarray(coef, dtype=np.float64)
+    num_cols = description["num_cols"]
+
+    numeric = [
+        (col, coef[j], num_fill[j]) for j, col in enumerate(description["num_cols"])
+    ]
+
+    categorical = []
+    offset = len(num_cols)
+    for col, cats, fill in zip(
+        description["cat_cols"], description["categories"], description["cat_fill"]
+    ):
+        table = {cat: float(coef[offset + k]) for k, cat in enumerate(cats)}
+        categorical.append((col, table, table.get(fill, 0.0)))
+        offset += len(cats)
+
+    if offset != len(coef):
+        raise ValueError("Coefficients do not match the one-hot layout")
+
+    return CompiledGLM(intercept, numeric, categorical)
+
+
+def compile_glm(model, X_check=None, atol: float = 1e-9) -> CompiledGLM:
+    """
+    Compile a fitted GLM ``Pipeline`` (or a GLM ``ModelBundle``).
+
+    If ``X_check`` is given, the compiled predictions are compared with
+    ``model.predict(X_check)`` and a ``ValueError`` is raised when any differs
+    by more than ``atol``.
+    """
+    if isinstance(model, ModelBundle):
+        if model.kind != "glm":
+            raise ValueError("Only GLM bundles can be compiled")
+        description = {
+            "encoding": model.encoding,
+            "num_cols": model.num_cols,
+            "cat_cols": model.cat_cols,
+            "cat_fill": model.cat_fill,
+            "categories": [
+                cats[np.argsort(order)].tolist() for cats, order in model.categories
+            ],
+        }
+        compiled = _build(description, model.num_fill, model.coef, model.intercept)
+    else:
+        est = model.named_steps["model"]
+        description, num_fill = describe_preprocessor(model.named_steps["preprocess"])
+        compiled = _build(
+            description, num_fill, np.ravel(est.coef_), np.ravel(est.intercept_)[0]
+        )
+
+    if X_check is not None:
+        diff = np.max(np.abs(compiled.predict(X_check) - model.predict(X_check)))
+        if diff > atol:
+            raise ValueError(f"Compiled GLM differs from the pipeline by {diff:g}")
+
+    return compiled
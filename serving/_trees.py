@@ -0,0 +1,194 @@
+"""
+Numpy evaluator for LightGBM regression boosters.
+
+``parse_lgbm_model`` turns the native text model (``Booster.save_model``) into
+flat node arrays shared by all trees; ``predict_trees`` walks every row through
+every tree level by level with vectorized numpy, following LightGBM's
+numerical / categorical decision rules. This lets bundles predict without
+importing lightgbm (and the sklearn / pandas imports it pulls in).
+
+Node encoding: a child ``c >= 0`` is a global internal node index, ``c < 0``
+is leaf ``~c`` (global leaf index).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# LightGBM decision_type bits
+_CATEGORICAL_MASK = 1
+_DEFAULT_LEFT_MASK = 2
+_MISSING_ZERO = 1
+_MISSING_NAN = 2
+_ZERO_THRESHOLD = 1e-35
+
+# (row, tree) pairs walked at once by predict_trees
+_MAX_CELLS = 1 << 20
+
+TREE_ARRAYS = (
+    "root",
+    "feature",
+    "threshold",
+    "decision_type",
+    "left",
+    "right",
+    "cat_index",
+    "cat_boundaries",
+    "cat_words",
+    "leaf_value",
+)
+
+
+def _parse_blocks(text: str) -> tuple[dict[str, str], list[dict[str, str]]]:
+    header: dict[str, str] = {}
+    trees: list[dict[str, str]] = []
+    current = header
+    for line in text.splitlines():
+        if line.startswith("end of trees"):
+            break
+        if line.startswith("Tree="):
+            current = {}
+            trees.append(current)
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            current[key] = value
+    return header, trees
+
+
+def parse_lgbm_model(text: str) -> dict[str, np.ndarray]:
+    """Flatten a LightGBM text model into the arrays in ``TREE_ARRAYS``."""
+    header, trees = _parse_blocks(text)
+    if header.get("num_class", "1") != "1" or not header.get(
+        "objective", ""
+    ).startswith("regression"):
+        raise ValueError("Only single-output regression boosters are supported")
+    if "average_output" in header:
+        raise ValueError("Random-forest boosters are not supported")
+
+    def ints(tree, key):
+        return np.array(tree[key].split(), dtype=np.int64)
+
+    def floats(tree, key):
+        return np.array(tree[key].split(), dtype=np.float64)
+
+    root, leaf_value = [], []
+    feature, threshold, decision_type, left, right, cat_index = [], [], [], [], [], []
+    cat_boundaries, cat_words = [0], []
+    n_int = n_leaf = n_cat = 0
+
+    for tree in trees:
+        values = floats(tree, "leaf_value")
+        if int(tree["num_leaves"]) == 1:
+            root.append(~n_leaf)
+            leaf_value.append(values)
+            n_leaf += 1
+            continue
+
+        lc, rc = ints(tree, "left_child"), ints(tree, "right_child")
+        # Re-base children: internal -> + n_int, leaf ~l -> ~(l + n_leaf)
+        left.append(np.where(lc >= 0, lc + n_int, ~(~lc + n_leaf)))
+        right.append(np.where(rc >= 0, rc + n_int, ~(~rc + n_leaf)))
+
+        dt = ints(tree, "decision_type")
+        thr = floats(tree, "threshold")
+        is_cat = (dt & _CATEGORICAL_MASK) != 0
+        cat_index.append(np.where(is_cat, thr.astype(np.int64) + n_cat, -1))
+
+        if int(tree.get("num_cat", "0")) > 0:
+            bounds = ints(tree, "cat_boundaries")
+            cat_boundaries.extend((bounds[1:] + len(cat_words)).tolist())
+            cat_words.extend(ints(tree, "cat_threshold").tolist())
+            n_cat += len(bounds) - 1
+
+        feature.append(ints(tree, "split_feature"))
+        threshold.append(thr)
+        decision_type.append(dt)
+        leaf_value.append(values)
+        root.append(n_int)
+        n_int += len(lc)
+        n_leaf += len(values)
+
+    def cat(parts, dtype):
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype)
+
+    return {
+        "root": np.array(root, dtype=np.int64),
+        "feature": cat(feature, np.int64),
+        "threshold": cat(threshold, np.float64),
+        "decision_type": cat(decision_type, np.int64),
+        "left": cat(left, np.int64),
+        "right": cat(right, np.int64),
+        "cat_index": cat(cat_index, np.int64),
+        "cat_boundaries": np.array(cat_boundaries, dtype=np.int64),
+        "cat_words": np.array(cat_words, dtype=np.uint32),
+        "leaf_value": cat(leaf_value, np.float64),
+    }
+
+
+def _go_left(trees, nodes: np.ndarray, fval: np.ndarray) -> np.ndarray:
+    dt = trees["decision_type"][nodes]
+    missing_type = (dt >> 2) & 3
+    is_nan = np.isnan(fval)
+
+    # Numerical split
+    x = np.where(is_nan & (missing_type != _MISSING_NAN), 0.0, fval)
+    use_default = ((missing_type == _MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD)) | (
+        (missing_type == _MISSING_NAN) & np.isnan(x)
+    )
+    with np.errstate(invalid="ignore"):
+        left = np.where(
+            use_default,
+            (dt & _DEFAULT_LEFT_MASK) != 0,
+            x <= trees["threshold"][nodes],
+        )
+
+    # Categorical split: left if the category's bit is set
+    is_cat = (dt & _CATEGORICAL_MASK) != 0
+    if is_cat.any():
+        c = np.flatnonzero(is_cat)
+        f = fval[c]
+        code = np.where(np.isnan(f) | (f < 0), -1, np.nan_to_num(f)).astype(np.int64)
+        ci = trees["cat_index"][nodes[c]]
+        start = trees["cat_boundaries"][ci]
+        n_words = trees["cat_boundaries"][ci + 1] - start
+        word = code // 32
+        valid = (code >= 0) & (word < n_words)
+        bits = trees["cat_words"][np.where(valid, start + word, 0)]
+        left[c] = valid & (((bits >> (code % 32).astype(np.uint32)) & 1) == 1)
+    return left
+
+
+def _predict_chunk(trees, X: np.ndarray) -> np.ndarray:
+    n_rows, n_trees = X.shape[0], len(trees["root"])
+
+    node = np.broadcast_to(trees["root"], (n_rows, n_trees)).copy()
+    rows, cols = np.nonzero(node >= 0)
+    while len(rows):
+        nodes = node[rows, cols]
+        left = _go_left(trees, nodes, X[rows, trees["feature"][nodes]])
+        node[rows, cols] = np.where(left, trees["left"][nodes], trees["right"][nodes])
+        keep = node[rows, cols] >= 0
+        rows, cols = rows[keep], cols[keep]
+
+    return trees["leaf_value"][~node].sum(axis=1)
+
+
+def predict_trees(trees, X: np.ndarray, max_cells: int = _MAX_CELLS) -> np.ndarray:
+    """
+    Raw score (sum of leaf values) for each row of the dense matrix ``X``.
+
+    Rows are walked in chunks of at most ``max_cells`` (row, tree) pairs, so
+    memory stays bounded (a few hundred bytes per pair) for any batch size.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_rows, n_trees = X.shape[0], len(trees["root"])
+    chunk = max(1, max_cells // max(n_trees, 1))
+    if n_rows <= chunk:
+        return _predict_chunk(trees, X)
+
+    out = np.empty(n_rows, dtype=np.float64)
+    for start in range(0, n_rows, chunk):
+        rows = slice(start, start + chunk)
+        out[rows] = _predict_chunk(trees, X[rows])
+    return out
@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.bench_pipeline import STAGES, compare, main, run_stages, run_suite
+
+
+def test_run_stages_measures_every_stage():
+    results = run_stages(2_000, lgbm_rounds=5)
+
+    assert list(results) == STAGES
+    assert all(r["seconds"] >= 0 and r["peak_mb"] >= 0 for r in results.values())
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {
+        "10000": {
+            "glm_fit": {"seconds": 1.0, "peak_mb": 100.0},
+            "glm_predict": {"seconds": 0.001, "peak_mb": 0.0},
+        }
+    }
+    results = {
+        "10000": {
+            # 50% slower: regression
+            "glm_fit": {"seconds": 1.5, "peak_mb": 100.0},
+            # 3x slower but only by 2 ms: timer noise
+            "glm_predict": {"seconds": 0.003, "peak_mb": 1.0},
+        },
+        # Not in the baseline: skipped
+        "100000": {"glm_fit": {"seconds": 9.0, "peak_mb": 900.0}},
+    }
+
+    failures = compare(results, baseline, threshold=0.25)
+
+    assert len(failures) == 1
+    assert failures[0].startswith("glm_fit @ 10,000 rows: seconds")
+
+
+def test_run_suite_fails_when_a_child_dies():
+    # A negative size makes make_raw raise in the child process
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        run_suite([-1])
+    assert main([-1]) == 2
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMRegressor
+from sklearn.linear_model import ElasticNet
+from sklearn.pipeline import Pipeline
+
+from modeling import make_native_preprocessor, make_preprocessor
+from modeling._common import CAT_COLS
+from serving import CompiledGLM, compile_glm, export_bundle, load_bundle
+
+
+def _data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        {
+            "years_experience": rng.integers(0, 20, n).astype(float),
+            **{c: rng.choice(["a", "b", "c", "d"], n) for c in CAT_COLS},
+        }
+    )
+    y = (
+        0.1 * X["years_experience"].to_numpy()
+        + (X[CAT_COLS[1]] == "b")
+        + rng.normal(0, 0.1, n)
+    )
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "make_pre, model, engine",
+    [
+        (make_preprocessor, ElasticNet(alpha=1e-3), "numpy"),
+        (make_preprocessor, LGBMRegressor(n_estimators=30, verbosity=-1), "numpy"),
+        (make_preprocessor, LGBMRegressor(n_estimators=30, verbosity=-1), "lightgbm"),
+        (
+            make_native_preprocessor,
+            LGBMRegressor(n_estimators=30, verbosity=-1, min_data_per_group=5),
+            "numpy",
+        ),
+    ],
+)
+def test_bundle_matches_pipeline(tmp_path, make_pre, model, engine):
+    X, y = _data()
+    pipe = Pipeline([("preprocess", make_pre()), ("model", model)]).fit(X, y)
+    bundle = load_bundle(export_bundle(pipe, tmp_path / "model"), engine=engine)
+
+    X_new = X.head(20).copy()
+    X_new.loc[0, "years_experience"] = np.nan
+    X_new.loc[1, CAT_COLS[1]] = "unseen"
+    X_new.loc[2, CAT_COLS[1]] = None
+
+    np.testing.assert_allclose(bundle.predict(X_new), pipe.predict(X_new), atol=1e-10)
+    # Plain dict input (one row)
+    row = {c: [X_new.loc[3, c]] for c in X_new.columns}
+    np.testing.assert_allclose(bundle.predict(row), pipe.predict(X_new.loc[[3]]))
+
+
+def test_compiled_glm_matches_pipeline(tmp_path):
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(alpha=1e-3))]
+    ).fit(X, y)
+
+    X_new = X.head(20).copy()
+    X_new.loc[0, "years_experience"] = np.nan
+    X_new.loc[1, CAT_COLS[1]] = "unseen"
+    X_new.loc[2, CAT_COLS[1]] = None
+    expected = pipe.predict(X_new)
+
+    compiled = compile_glm(pipe, X_check=X_new)
+    rows = X_new.to_dict(orient="records")
+    np.testing.assert_allclose([compiled.predict_one(r) for r in rows], expected)
+
+    # From a bundle and after a JSON round trip
+    bundle = load_bundle(export_bundle(pipe, tmp_path / "model"))
+    np.testing.assert_allclose(compile_glm(bundle).predict(X_new), expected)
+    compiled.save(tmp_path / "glm.json")
+    np.testing.assert_allclose(
+        CompiledGLM.load(tmp_path / "glm.json").predict(X_new), expected
+    )
+
+
+def test_missing_value_spellings_match_pipeline(tmp_path):
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(alpha=1e-3))]
+    ).fit(X, y)
+    X_ref = X.head(4).astype({CAT_COLS[1]: object})
+    X_ref.loc[[0, 1, 2], CAT_COLS[1]] = np.nan
+    X_ref.loc[3, "years_experience"] = np.nan
+    expected = pipe.predict(X_ref)
+
+    # The same missing values spelled as pd.NA and float32 NaN
+    X_new = X.head(4).astype({CAT_COLS[1]: object, "years_experience": object})
+    X_new.loc[0, CAT_COLS[1]] = pd.NA
+    X_new.loc[1, CAT_COLS[1]] = np.float32("nan")
+    X_new.loc[2, CAT_COLS[1]] = float("nan")
+    X_new.loc[3, "years_experience"] = pd.NA
+
+    compiled = compile_glm(pipe)
+    bundle = load_bundle(export_bundle(pipe, tmp_path / "model"))
+    np.testing.assert_allclose(compiled.predict(X_new), expected)
+    np.testing.assert_allclose(bundle.predict(X_new), expected)
+
+    rows = X_new.to_dict(orient="records")
+    np.testing.assert_allclose([compiled.predict_one(r) for r in rows], expected)
+    rows[3]["years_experience"] = np.float32("nan")
+    assert compiled.predict_one(rows[3]) == pytest.approx(expected[3])
+
+
+def test_predict_trees_matches_booster_in_chunks(tmp_path):
+    from serving._trees import predict_trees
+
+    X, y = _data(n=5000, seed=1)
+    model = LGBMRegressor(
+        n_estimators=200, num_leaves=15, verbosity=-1, min_data_per_group=5
+    )
+    pipe = Pipeline([("preprocess", make_native_preprocessor()), ("model", model)])
+    bundle = load_bundle(export_bundle(pipe.fit(X, y), tmp_path / "model"))
+    Z = bundle.transform(X)  # numeric and categorical splits
+
+    expected = model.booster_.predict(Z)
+    # 200 trees -> 50-row chunks
+    np.testing.assert_allclose(
+        predict_trees(bundle.trees, Z, max_cells=10_000), expected, atol=1e-10
+    )
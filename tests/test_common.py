@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from modeling import load_split_xy
+from modeling._common import CAT_COLS
+
+
+def test_load_split_xy_categorical_matches_default(tmp_path):
+    n = 200
+    rng = np.random.default_rng(0)
+    path = tmp_path / "jobs.parquet"
+    pl.DataFrame(
+        {
+            "job_id": [f"AI{i:05d}" for i in range(n)],
+            "salary_usd": rng.integers(30_000, 300_000, n),
+            "years_experience": rng.integers(0, 20, n),
+            **{c: rng.choice(["a", "b", "c"], n) for c in CAT_COLS},
+            "unused": rng.random(n),
+        }
+    ).write_parquet(path)
+
+    X_tr, y_tr, X_te, y_te = load_split_xy(str(path))
+    C_tr, c_y_tr, C_te, c_y_te = load_split_xy(str(path), categorical=True)
+
+    np.testing.assert_array_equal(y_tr, c_y_tr)
+    np.testing.assert_array_equal(y_te, c_y_te)
+    for c in CAT_COLS:
+        assert isinstance(C_tr[c].dtype, pd.CategoricalDtype)
+        assert C_tr[c].cat.categories.equals(C_te[c].cat.categories)
+        assert (C_te[c].astype(str).to_numpy() == X_te[c].astype(str).to_numpy()).all()
+
+
+def test_native_preprocessor_keeps_one_column_per_feature():
+    from modeling import make_native_preprocessor
+    from modeling._common import NUM_COLS
+
+    X = pd.DataFrame(
+        {
+            "years_experience": [1.0, np.nan, 3.0],
+            **{c: ["a", "b", "a"] for c in CAT_COLS},
+        }
+    )
+    pre = make_native_preprocessor().fit(X)
+    names = pre.get_feature_names_out()
+    assert [n.split("__", 1)[1] for n in names] == NUM_COLS + CAT_COLS
+
+    X_new = X.assign(**{CAT_COLS[0]: ["b", "zzz", None]})
+    Xt = pre.transform(X_new)
+    assert Xt["num__years_experience"].tolist() == [1.0, 2.0, 3.0]
+    col = Xt[f"cat__{CAT_COLS[0]}"]
+    assert list(col.cat.categories) == ["a", "b"]
+    # unseen -> missing, missing -> imputed most frequent
+    assert col.tolist()[0] == "b" and pd.isna(col.tolist()[1])
+    assert col.tolist()[2] == "a"
@@ -0,0 +1,267 @@
+import json
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+import scipy.sparse as sp
+from glum import TweedieDistribution
+from lightgbm import LGBMRegressor
+from sklearn.inspection import partial_dependence
+from sklearn.metrics import auc
+from sklearn.pipeline import Pipeline
+
+from evaluating import (
+    Figure,
+    LorenzSketch,
+    bootstrap_metrics,
+    build_report,
+    evaluate_predictions,
+    evaluate_predictions_multi,
+    gini_exact,
+    grouped_shap,
+    lorenz_curve,
+    partial_dependence_batched,
+)
+from evaluating._bootstrap import METRICS, _metrics_from_counts
+from modeling import make_native_preprocessor, make_preprocessor
+from modeling._common import CAT_COLS, NUM_COLS
+
+
+@pytest.mark.parametrize("tweedie_power", [1.5, 2])
+@pytest.mark.parametrize("frame", ["pandas", "polars"])
+def test_multi_matches_single(frame, tweedie_power):
+    rng = np.random.default_rng(0)
+    n = 500
+    data = {
+        "y": rng.gamma(2.0, 50.0, n),
+        "w": rng.uniform(0.5, 2.0, n),
+        **{f"pred_{k}": rng.gamma(2.0, 50.0, n) for k in range(3)},
+    }
+    pdf = pd.DataFrame(data)
+    df = pdf if frame == "pandas" else pl.DataFrame(data)
+    cols = [f"pred_{k}" for k in range(3)]
+
+    multi = evaluate_predictions_multi(
+        df, "y", preds_columns=cols, tweedie_power=tweedie_power, exposure_column="w"
+    )
+    for col in cols:
+        single = evaluate_predictions(
+            pdf, "y", preds_column=col, tweedie_power=tweedie_power, exposure_column="w"
+        )[0]
+        np.testing.assert_allclose(multi[col], single.loc[multi.index], rtol=1e-10)
+
+    # Same result from a 2-D array
+    from_array = evaluate_predictions_multi(
+        df,
+        "y",
+        preds=pdf[cols].to_numpy(),
+        model_names=cols,
+        tweedie_power=tweedie_power,
+        exposure_column="w",
+    )
+    pd.testing.assert_frame_equal(from_array, multi)
+
+
+def test_bootstrap_counts_match_resampled_rows():
+    rng = np.random.default_rng(1)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "y": rng.gamma(2.0, 50.0, n),
+            "pred": rng.gamma(2.0, 50.0, n),
+            "w": rng.uniform(0.5, 2.0, n),
+        }
+    )
+    result = bootstrap_metrics(
+        df, "y", preds_column="pred", exposure_column="w", n_boot=50, seed=3
+    )
+    full = evaluate_predictions(df, "y", preds_column="pred", exposure_column="w")[0]
+    np.testing.assert_allclose(result["estimate"], full.loc[result.index])
+    assert (result["lower"] <= result["estimate"]).all()
+    assert (result["estimate"] <= result["upper"]).all()
+
+    # One resample through the count formulas vs. materialized repeated rows
+    order = np.argsort(df["pred"].to_numpy())
+    sorted_df = df.iloc[order].reset_index(drop=True)
+    counts = rng.multinomial(n, np.full(n, 1 / n)).astype(float)
+    resampled = sorted_df.loc[np.repeat(np.arange(n), counts.astype(int))]
+    expected = evaluate_predictions(
+        resampled, "y", preds_column="pred", exposure_column="w"
+    )[0]
+
+    y, p, w = (sorted_df[c].to_numpy() for c in ("y", "pred", "w"))
+    columns = np.column_stack(
+        [
+            w,
+            w * p,
+            w * y,
+            w * (p - y) ** 2,
+            w * np.abs(p - y),
+            w * TweedieDistribution(1.5).unit_deviance(y, p),
+        ]
+    )
+    got = _metrics_from_counts(counts[None, :], columns, y * w)[0]
+    np.testing.assert_allclose(got, expected.loc[METRICS], rtol=1e-10)
+
+
+def test_gini_exact_and_sketch():
+    rng = np.random.default_rng(2)
+    n = 20_000
+    y = rng.gamma(2.0, 50.0, n)
+    pred = y * rng.lognormal(0.0, 0.5, n)
+    w = rng.uniform(0.5, 2.0, n)
+
+    expected = 1 - 2 * auc(*lorenz_curve(y, pred, w))
+    assert gini_exact(y, pred, w) == pytest.approx(expected, abs=1e-12)
+
+    # Chunked sketches merged == one sketch over everything
+    edges = LorenzSketch.from_predictions(pred[:2000], n_bins=100).edges
+    parts = [
+        LorenzSketch(edges).update(*chunk)
+        for chunk in zip(*(np.array_split(a, 4) for a in (y, pred, w)))
+    ]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged = merged.merge(part)
+    whole = LorenzSketch(edges).update(y, pred, w)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_allclose(merged.sums, whole.sums)
+    np.testing.assert_array_equal(
+        whole.counts,
+        np.bincount(np.searchsorted(edges, pred), minlength=len(edges) + 1),
+    )
+
+    assert len(merged.curve()[0]) == len(edges) + 2
+
+    # Non-finite predictions land in the outer bins, like searchsorted
+    sketch = LorenzSketch(np.linspace(0, 1, 2000))
+    sketch.update(np.ones(4), np.array([-np.inf, 0.5, np.inf, np.nan]))
+    assert sketch.counts[0] == 1 and sketch.counts[-1] == 2
+    assert sketch.counts.sum() == 4
+    assert abs(merged.gini() - expected) <= merged.gini_error_bound() + 1 / n
+
+
+def test_partial_dependence_batched_matches_sklearn():
+    rng = np.random.default_rng(3)
+    n = 300
+    X = sp.random(n, 8, density=0.3, format="csr", random_state=3)
+    X[:, 0] = rng.integers(0, 40, (n, 1))  # numeric column with many values
+    X[:, 1] = rng.integers(0, 2, (n, 1))  # one-hot style column
+    y = X[:, 0].toarray().ravel() * X[:, 1].toarray().ravel() + rng.normal(0, 1, n)
+    model = LGBMRegressor(n_estimators=20, verbosity=-1).fit(X, y)
+
+    results = partial_dependence_batched(
+        model, X, [0, 1, 4], grid_resolution=10, n_samples=None
+    )
+    for res in results:
+        expected = partial_dependence(
+            model, X.toarray(), [res["feature"]], kind="both", grid_resolution=10
+        )
+        np.testing.assert_allclose(res["grid"], expected["grid_values"][0])
+        np.testing.assert_allclose(res["average"], expected["average"][0])
+        np.testing.assert_allclose(res["individual"], expected["individual"][0])
+    np.testing.assert_array_equal(results[1]["grid"], [0, 1])
+
+    subsampled = partial_dependence_batched(model, X, [0], n_samples=50)
+    assert subsampled[0]["individual"].shape == (50, len(subsampled[0]["grid"]))
+
+
+@pytest.mark.parametrize("make_pre", [make_preprocessor, make_native_preprocessor])
+def test_grouped_shap_sums_to_prediction(make_pre):
+    rng = np.random.default_rng(4)
+    n = 300
+    X = pd.DataFrame(
+        {
+            "years_experience": rng.integers(0, 20, n).astype(float),
+            **{c: rng.choice(["a", "b", "c"], n) for c in CAT_COLS},
+        }
+    )
+    y = 0.1 * X["years_experience"] + (X[CAT_COLS[1]] == "b") + rng.normal(0, 0.1, n)
+    model = LGBMRegressor(n_estimators=20, verbosity=-1, min_data_per_group=5)
+    pipe = Pipeline([("preprocess", make_pre()), ("model", model)]).fit(X, y)
+
+    per_row, importance = grouped_shap(pipe, X, batch_size=70, n_jobs=2)
+
+    assert list(per_row.columns) == NUM_COLS + CAT_COLS + ["expected_value"]
+    np.testing.assert_allclose(per_row.sum(axis=1), pipe.predict(X), atol=1e-10)
+    assert set(importance.index[:2]) == {"years_experience", CAT_COLS[1]}
+
+
+def _line_plot(values, out_path):
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    plt.plot(values)
+    plt.savefig(out_path)
+    plt.close()
+
+
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_build_report_skips_unchanged_figures(tmp_path, n_workers):
+    calls = []
+
+    def figures(model_hash):
+        return [
+            Figure(
+                name,
+                _line_plot,
+                lambda name=name: calls.append(name) or {"values": [1, 2, 3]},
+                [model_hash, "data"],
+            )
+            for name in ("a.png", "sub/b.png")
+        ]
+
+    first = build_report(figures("m1"), tmp_path, n_workers=n_workers)
+    assert (first["rendered"], first["skipped"]) == (2, 0)
+    assert (tmp_path / "sub" / "b.png").exists()
+    assert first["figures"]["a.png"]["render_seconds"] > 0
+
+    second = build_report(figures("m1"), tmp_path, n_workers=n_workers)
+    assert (second["rendered"], second["skipped"]) == (0, 2)
+    assert calls == ["a.png", "sub/b.png"]  # data not prepared again
+
+    (tmp_path / "a.png").unlink()
+    third = build_report(figures("m2"), tmp_path, n_workers=n_workers)
+    assert third["rendered"] == 2
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["figures"]["a.png"]["inputs"] == ["m2", "data"]
+
+
+def test_figure_key_tracks_renderer_code():
+    def prepare():
+        return {"values": [1, 2, 3]}
+
+    def key(render, **kwargs):
+        return Figure("a.png", render, prepare, ["m1"], **kwargs).key
+
+    # Same qualname, only a constant differs (as when editing bins=300)
+    render_50 = lambda values, out_path: _line_plot(values[:50], out_path)  # noqa
+    render_60 = lambda values, out_path: _line_plot(values[:60], out_path)  # noqa
+    same_50 = lambda values, out_path: _line_plot(values[:50], out_path)  # noqa
+
+    assert key(render_50) == key(same_50)
+    assert key(render_50) != key(render_60)
+    assert key(render_50) != key(render_50, version="2")
+
+
+def test_bootstrap_independent_of_chunking():
+    from evaluating._bootstrap import _draw_counts
+
+    counts = _draw_counts(np.random.default_rng(0), 5, 40)
+    assert counts.dtype == np.int32
+    assert (counts.sum(axis=1) == 40).all()
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(
+        {"y": rng.gamma(2.0, 50.0, 300), "pred": rng.gamma(2.0, 50.0, 300)}
+    )
+    kwargs = dict(preds_column="pred", n_boot=100, seed=1)
+    ref = bootstrap_metrics(df, "y", **kwargs)
+    pd.testing.assert_frame_equal(
+        ref, bootstrap_metrics(df, "y", chunk_size=32, **kwargs)
+    )
+    # n_jobs only changes the default chunking
+    pd.testing.assert_frame_equal(
+        ref, bootstrap_metrics(df, "y", chunk_size=64, **kwargs)
+    )
@@ -0,0 +1,98 @@
+import argparse
+import json
+import time
+
+import pytest
+
+import instrumentation
+from instrumentation import instrumented, stage
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    yield instrumentation.enable(tmp_path / "profile.json")
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_stages_nest_and_record(profiler):
+    @instrumented()
+    def work(n):
+        return sum(range(n))
+
+    with stage("outer", rows=10) as outer:
+        with stage("inner") as inner:
+            inner.rows = 5
+            work(1_000)
+    assert outer.rows == 10
+
+    by_stage = {r["stage"]: r for r in instrumentation.records()}
+    assert set(by_stage) == {"outer", "outer/inner", "outer/inner/work"}
+    assert by_stage["outer/inner"]["rows"] == 5
+    assert by_stage["outer/inner/work"]["depth"] == 2
+    assert by_stage["outer"]["wall_s"] >= by_stage["outer/inner"]["wall_s"]
+    assert by_stage["outer"]["peak_rss_mb"] >= by_stage["outer/inner"]["peak_rss_mb"]
+
+    report = json.loads(profiler.write_report().read_text())
+    assert [r["stage"] for r in report["stages"]] == [
+        "outer",
+        "outer/inner",
+        "outer/inner/work",
+    ]
+
+
+def test_failed_stage_and_cprofile_dump(profiler, tmp_path):
+    profiler.dump_stage = "inner"
+    with pytest.raises(ValueError):
+        with stage("outer"):
+            with stage("inner"):
+                raise ValueError
+
+    assert [r["failed"] for r in instrumentation.records()] == [True, True]
+    assert len(list(tmp_path.glob("profile.outer.inner.*.prof"))) == 1
+
+
+def test_disabled_is_a_no_op():
+    with stage("ignored") as s:
+        s.rows = 3
+    assert instrumentation.records() == []
+
+
+def test_dumps_need_a_report_path(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="report_path"):
+        instrumentation.enable(None, dump_stage="inner")
+
+    # --profile-stage implies --profile
+    monkeypatch.chdir(tmp_path)
+    parser = argparse.ArgumentParser()
+    instrumentation.add_profile_arguments(parser)
+    instrumentation.enable_from_args(parser.parse_args(["--profile-stage", "inner"]))
+    try:
+        with stage("inner"):
+            pass
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert len(list(tmp_path.glob("reports/profile.inner.*.prof"))) == 1
+
+
+def test_stage_peaks_leave_process_peak_alone(profiler):
+    import resource
+
+    import numpy as np
+
+    np.ones(2**24).sum()  # 128 MB, freed again
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with stage("alloc"):
+        block = np.ones(2**23)  # 64 MB, held for a few sampling intervals
+        time.sleep(0.05)
+        del block
+    (record,) = instrumentation.records()
+
+    assert record["peak_increase_mb"] > 32
+    assert resource.getrusage(resource.RUSAGE_SELF).ru_maxrss >= before
+
+
+def test_memory_helpers():
+    rss, peak = instrumentation.rss_mb(), instrumentation.peak_rss_mb()
+    assert 0 < rss <= peak <= instrumentation.peak_rss_mb(children=True)
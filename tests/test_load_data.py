@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from data import cache_dataset, load_data
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = tmp_path / "ai_job_dataset.csv"
+    pl.DataFrame(
+        {"job_id": ["AI00001", "AI00002"], "company_location": ["Switzerland", "Japan"]}
+    ).write_csv(path)
+    return path
+
+
+def test_load_data_from_local_csv_is_cached(raw_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = cache_dataset(raw_csv, cache_dir=cache_dir)
+    mtime = first.stat().st_mtime_ns
+
+    df = load_data(raw_csv, cache_dir=cache_dir)
+    assert df.shape == (2, 2)
+    # Same content -> same cache file, not rewritten
+    assert cache_dataset(raw_csv, cache_dir=cache_dir) == first
+    assert first.stat().st_mtime_ns == mtime
+
+
+def test_load_data_env_override(raw_csv, tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_JOBS_CSV", str(raw_csv))
+    monkeypatch.setenv("AI_JOBS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("AI_JOBS_OFFLINE", "1")
+    assert load_data()["job_id"].to_list() == ["AI00001", "AI00002"]
+
+
+def test_offline_without_cache_raises(tmp_path, monkeypatch):
+    monkeypatch.delenv("AI_JOBS_CSV", raising=False)
+    with pytest.raises(FileNotFoundError):
+        cache_dataset(cache_dir=tmp_path / "empty", offline=True)
+
+
+def test_streaming_and_eager_prepare_agree_on_non_ascii(tmp_path, monkeypatch):
+    from data import generate_postings
+    from data.prepare_data import main
+
+    monkeypatch.setenv("AI_JOBS_CACHE_DIR", str(tmp_path / "cache"))
+    raw = generate_postings(200, seed=0).with_columns(
+        pl.col("company_name") + pl.lit(" Zürich")
+    )
+    csv = tmp_path / "postings.csv"
+    csv.write_bytes(raw.write_csv().encode("latin1"))
+
+    main(csv, tmp_path / "eager.parquet")
+    main(csv, tmp_path / "streaming.parquet", streaming=True)
+
+    eager = pl.read_parquet(tmp_path / "eager.parquet")
+    assert eager["company_name"].str.ends_with(" Zürich").all()
+    assert eager.equals(pl.read_parquet(tmp_path / "streaming.parquet"))
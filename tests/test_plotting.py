@@ -0,0 +1,118 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import polars as pl  # noqa: E402
+import pytest  # noqa: E402
+
+from plotting import (  # noqa: E402
+    GroupStats,
+    compute_group_stats,
+    density_grid,
+    plot_density,
+    plot_salary_scatter,
+    plot_top_skills,
+)
+
+
+def test_density_grid_matches_histogram2d():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=10_000), rng.gamma(2.0, size=10_000)
+    x[:5] = np.nan
+
+    counts, extent = density_grid(x, y, bins=(30, 20))
+
+    keep = ~np.isnan(x)
+    expected, _, _ = np.histogram2d(x[keep], y[keep], bins=(30, 20))
+    np.testing.assert_array_equal(counts, expected.T)
+    assert extent == (x[keep].min(), x[keep].max(), y.min(), y.max())
+
+
+def test_density_mode_renders_grid_not_points(monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    rng = np.random.default_rng(1)
+    df = pl.DataFrame(
+        {"salary_usd": rng.gamma(4.0, 3e4, 5000), "years": rng.integers(0, 20, 5000)}
+    )
+
+    plot_salary_scatter(df, ["years"], kind="density", bins=50)
+    images = plt.gca().get_images()
+    assert len(images) == 1 and images[0].get_array().shape == (50, 50)
+    assert not plt.gca().collections
+    plt.close("all")
+
+    image = plot_density([0.0, 0.0], [1.0, 1.0], log=False)
+    assert image.get_array().sum() == 2
+    plt.close("all")
+
+
+def test_group_stats_match_direct_aggregation(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 5000
+    df = pl.DataFrame(
+        {
+            "salary_usd": rng.gamma(4.0, 3e4, n),
+            "company_size": rng.choice(["S", "M", "L"], n),
+            "employment_type": rng.choice(["FT", "PT", "CT", "FL"], n),
+            "skills_list": [
+                list(rng.choice(["Python", "SQL", "R", ""], 2)) for _ in range(n)
+            ],
+        }
+    ).with_columns(  # missing salaries still count towards n
+        pl.when(pl.int_range(pl.len()) % 50 == 0)
+        .then(None)
+        .otherwise("salary_usd")
+        .alias("salary_usd")
+    )
+    cols = ["company_size", "employment_type"]
+
+    stats = compute_group_stats(df.lazy(), cols)
+    for col in cols:
+        expected = (
+            df.group_by(col)
+            .agg(pl.col("salary_usd").median().alias("median_salary"), pl.len())
+            .sort(col)
+        )
+        got = stats.group(col)
+        assert got[col].to_list() == expected[col].to_list()
+        assert got["n"].to_list() == expected["len"].to_list()
+        np.testing.assert_allclose(got["median_salary"], expected["median_salary"])
+
+    expected_skills = (
+        df.select(pl.col("skills_list").alias("skill"))
+        .explode("skill")
+        .filter(pl.col("skill") != "")
+        .group_by("skill")
+        .len()
+    )
+    assert dict(stats.skills.iter_rows()) == dict(expected_skills.iter_rows())
+
+    # Approximate quantiles stay within the relative accuracy
+    approx = compute_group_stats(df, cols, approx=True, relative_accuracy=0.01)
+    for col in cols:
+        exact = stats.group(col).select("q25", "median_salary", "q75").to_numpy()
+        rough = approx.group(col).select("q25", "median_salary", "q75").to_numpy()
+        np.testing.assert_allclose(rough, exact, rtol=0.02)
+        assert approx.group(col)["n"].equals(stats.group(col)["n"])
+
+    loaded = GroupStats.load(stats.save(tmp_path / "stats"))
+    assert loaded.group("company_size").equals(stats.group("company_size"))
+    assert loaded.skills.equals(stats.skills)
+
+
+def test_plot_top_skills_needs_skill_counts():
+    df = pl.DataFrame(
+        {
+            "company_size": ["S", "M", "S"],
+            "salary_usd": [1.0, 2.0, 3.0],
+            "skills_list": [["Python", "SQL"], ["Python"], []],
+        }
+    )
+    stats = compute_group_stats(df, ["company_size"], skills=False)
+
+    with pytest.raises(ValueError, match="without skills"):
+        plot_top_skills(None, stats=stats)
+    plot_top_skills(df, stats=stats)  # falls back to counting df
+    plt.close("all")
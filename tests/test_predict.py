@@ -0,0 +1,75 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from sklearn.linear_model import ElasticNet
+from sklearn.pipeline import Pipeline
+
+from modeling import make_preprocessor
+from modeling._common import CAT_COLS
+from modeling.predict import _MODELS, predict_parquet
+from serving import export_bundle
+
+
+def _write_inputs(tmp_path, n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        {
+            "job_id": [f"AI{i:05d}" for i in range(n)],
+            "years_experience": rng.integers(0, 20, n).astype(float),
+            **{c: rng.choice(["a", "b", "c"], n) for c in CAT_COLS},
+            "unused": rng.normal(size=n),
+        }
+    )
+    y = 11 + 0.05 * X["years_experience"] + rng.normal(0, 0.1, n)
+    features = X.drop(columns=["job_id", "unused"])
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(alpha=1e-3))]
+    ).fit(features, y)
+
+    joblib.dump(pipe, tmp_path / "glm.joblib")
+    export_bundle(pipe, tmp_path / "glm_bundle")
+    X.to_parquet(tmp_path / "jobs.parquet")
+    return X, pipe
+
+
+def test_predict_parquet_workers_and_bundles(tmp_path):
+    X, pipe = _write_inputs(tmp_path)
+    models = {
+        "file": str(tmp_path / "glm.joblib"),
+        "bundle": str(tmp_path / "glm_bundle"),
+    }
+
+    outputs = []
+    for n_workers in (0, 2):
+        out = tmp_path / f"pred_{n_workers}.parquet"
+        stats = predict_parquet(
+            tmp_path / "jobs.parquet",
+            out,
+            model_paths=models,
+            batch_size=120,
+            n_workers=n_workers,
+        )
+        assert stats["rows"] == len(X)
+        assert not _MODELS  # nothing stays loaded in this process
+        outputs.append(pq.read_table(out).to_pandas())
+
+    serial, pooled = outputs
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert serial["job_id"].tolist() == X["job_id"].tolist()
+    expected = np.expm1(pipe.predict(X.drop(columns=["job_id", "unused"])))
+    np.testing.assert_allclose(serial["pred_file"], expected)
+    np.testing.assert_allclose(serial["pred_bundle"], serial["pred_file"], atol=1e-8)
+
+
+def test_predict_parquet_without_id_column(tmp_path):
+    _write_inputs(tmp_path, n=50)
+    out = tmp_path / "pred.parquet"
+    predict_parquet(
+        tmp_path / "jobs.parquet",
+        out,
+        model_paths={"glm": str(tmp_path / "glm.joblib")},
+        n_workers=0,
+        id_column=None,
+    )
+    assert pq.read_schema(out).names == ["pred_glm"]
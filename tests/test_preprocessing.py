@@ -0,0 +1,57 @@
+import polars as pl
+
+from preprocessing import map_to_group, preprocess
+
+
+def _raw_postings() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "job_id": ["AI00001", "AI00002", "AI00003"],
+            "salary_usd": [90376, 61895, 152626],
+            "company_location": ["China", "Canada", "Brazil"],
+            "employee_residence": ["China", "Germany", "Brazil"],
+            "industry": ["Finance", "Gaming", "Space"],
+            "required_skills": ["Python, SQL", "AWS", "NLP, Deep Learning, R"],
+            "posting_date": ["2024-10-18", "2024-11-20", "2025-01-02"],
+            "application_deadline": ["2024-11-07", "2025-01-11", "2025-02-01"],
+        }
+    )
+
+
+def test_preprocess_features():
+    df = preprocess(_raw_postings())
+
+    assert df["company_area"].to_list() == ["Asia", "North America", "Other"]
+    assert df["residence_area"].to_list() == ["Asia", "Europe", "Other"]
+    assert df["same_country"].to_list() == [True, False, True]
+    assert df["industry_group"].to_list() == [
+        "Finance & Real Estate",
+        "Media & Entertainment",
+        "Other",
+    ]
+    assert df["skills_list"].to_list()[0] == ["Python", "SQL"]
+    assert df["num_skills"].to_list() == [2, 1, 3]
+    assert df.schema["posting_date"] == pl.Date
+
+
+def test_preprocess_lazy_matches_eager():
+    raw = _raw_postings()
+    lazy = preprocess(raw.lazy())
+
+    assert isinstance(lazy, pl.LazyFrame)
+    assert lazy.collect(engine="streaming").equals(preprocess(raw))
+
+
+def test_preprocess_custom_mappings():
+    mappings = {
+        "area": {"default": "Rest", "groups": {"BRICS": ["China", "Brazil"]}},
+        "industry_group": {"default": "Other", "groups": {"Fun": ["Gaming"]}},
+    }
+    df = preprocess(_raw_postings(), mappings=mappings)
+
+    assert df["company_area"].to_list() == ["BRICS", "Rest", "BRICS"]
+    assert df["industry_group"].to_list() == ["Other", "Fun", "Other"]
+    # Enum lookups, stored as String like jobs_cleaned.parquet
+    assert df.schema["company_area"] == pl.String
+    groups = _raw_postings().select(map_to_group("company_location", mappings["area"]))
+    assert groups.dtypes == [pl.Enum(["BRICS", "Rest"])]
@@ -0,0 +1,230 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform
+from sklearn.base import clone
+from sklearn.linear_model import ElasticNet
+from sklearn.model_selection import KFold, RandomizedSearchCV
+from sklearn.pipeline import Pipeline
+
+from modeling import FoldCachedSearchCV, make_preprocessor
+from modeling._common import CAT_COLS
+
+
+def _data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        {
+            "years_experience": rng.integers(0, 20, n).astype(float),
+            **{c: rng.choice(["a", "b", "c"], n) for c in CAT_COLS},
+        }
+    )
+    y = (
+        0.1 * X["years_experience"].to_numpy()
+        + (X[CAT_COLS[0]] == "a")
+        + rng.normal(0, 0.1, n)
+    )
+    return X, y
+
+
+def test_fold_cached_search_matches_randomized_search(tmp_path):
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(max_iter=5000))]
+    )
+    kwargs = dict(
+        param_distributions={
+            "model__alpha": loguniform(1e-2, 1e0),
+            "model__l1_ratio": np.linspace(0.0, 1.0, 6),
+        },
+        n_iter=5,
+        scoring="neg_root_mean_squared_error",
+        cv=KFold(n_splits=3, shuffle=True, random_state=0),
+        random_state=0,
+    )
+
+    ref = RandomizedSearchCV(pipe, **kwargs).fit(X, y)
+    cached = FoldCachedSearchCV(pipe, memory=str(tmp_path), **kwargs).fit(X, y)
+
+    assert cached.best_params_ == ref.best_params_
+    np.testing.assert_allclose(
+        cached.cv_results_["mean_test_score"], ref.cv_results_["mean_test_score"]
+    )
+    np.testing.assert_allclose(cached.predict(X), ref.predict(X))
+
+
+def test_halving_lgbm_search_budget():
+    from lightgbm import LGBMRegressor
+
+    from modeling import HalvingLGBMSearchCV
+
+    X, y = _data()
+    pipe = Pipeline(
+        [
+            ("preprocess", make_preprocessor()),
+            ("model", LGBMRegressor(verbosity=-1, min_child_samples=5)),
+        ]
+    )
+    search = HalvingLGBMSearchCV(
+        pipe,
+        {"model__learning_rate": loguniform(1e-2, 3e-1), "model__num_leaves": [7, 15]},
+        n_iter=9,
+        scoring="neg_root_mean_squared_error",
+        cv=KFold(n_splits=3, shuffle=True, random_state=0),
+        random_state=0,
+        min_resource=10,
+        max_resource=90,
+        factor=3,
+        early_stopping_rounds=5,
+    ).fit(X, y)
+
+    # 9 candidates @ 10 rounds -> 3 @ 30 -> 1 @ 90
+    assert search.n_rungs_ == 3
+    results = search.cv_results_
+    assert sorted(results["n_resources"]) == [10] * 6 + [30] * 2 + [90]
+    assert sorted(results["rank_test_score"]) == list(range(1, 10))
+    assert results["rank_test_score"][search.best_index_] == 1
+    assert np.all(results["std_test_score"] >= 0)
+    assert 1 <= search.best_params_["model__n_estimators"] <= 90
+    assert search.best_estimator_.named_steps["model"].n_estimators == (
+        search.best_params_["model__n_estimators"]
+    )
+
+
+def test_elastic_net_path_search_warm_start():
+    from modeling import ElasticNetPathSearchCV
+
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(max_iter=5000))]
+    )
+    kwargs = dict(
+        alphas=np.geomspace(1e0, 1e-3, 8),
+        l1_ratios=[0.0, 0.5, 1.0],
+        scoring="neg_root_mean_squared_error",
+        cv=KFold(n_splits=3, shuffle=True, random_state=0),
+    )
+
+    warm = ElasticNetPathSearchCV(pipe, **kwargs).fit(X, y)
+    cold = ElasticNetPathSearchCV(pipe, warm_start=False, **kwargs).fit(X, y)
+
+    assert set(warm.best_params_) == {"model__alpha", "model__l1_ratio"}
+    assert warm.best_params_ == cold.best_params_
+    assert warm.n_iter_total_ < cold.n_iter_total_
+    np.testing.assert_allclose(
+        warm.cv_results_["mean_test_score"],
+        cold.cv_results_["mean_test_score"],
+        rtol=1e-3,
+    )
+
+
+def test_path_search_keeps_elastic_net_for_pure_l2():
+    from sklearn.linear_model import Ridge
+
+    from modeling import ElasticNetPathSearchCV
+
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(max_iter=5000))]
+    )
+    search = ElasticNetPathSearchCV(
+        pipe, alphas=[1e-2], l1_ratios=[0.0], cv=KFold(n_splits=3)
+    ).fit(X, y)
+
+    best = search.best_estimator_
+    assert search.best_params_ == {"model__alpha": 1e-2, "model__l1_ratio": 0.0}
+    assert type(best.named_steps["model"]) is ElasticNet
+    assert best.named_steps["model"].l1_ratio == 0.0
+
+    # Same model as the Ridge the grid point was scored with
+    ridge = clone(pipe).set_params(model=Ridge(alpha=1e-2 * len(X))).fit(X, y)
+    np.testing.assert_allclose(best.predict(X), ridge.predict(X), rtol=1e-3)
+
+
+def test_experiment_cache_resumes_search(tmp_path):
+    from modeling import ExperimentCache
+
+    X, y = _data()
+    pipe = Pipeline(
+        [("preprocess", make_preprocessor()), ("model", ElasticNet(max_iter=5000))]
+    )
+    kwargs = dict(
+        param_distributions={"model__alpha": loguniform(1e-2, 1e0)},
+        scoring="neg_root_mean_squared_error",
+        cv=KFold(n_splits=3, shuffle=True, random_state=0),
+        random_state=0,
+        cache=ExperimentCache(tmp_path),
+    )
+
+    # An "interrupted" search with 3 of the 5 candidates, then the full one
+    FoldCachedSearchCV(pipe, n_iter=3, **kwargs).fit(X, y)
+    resumed = FoldCachedSearchCV(pipe, n_iter=5, **kwargs).fit(X, y)
+    ref = FoldCachedSearchCV(pipe, n_iter=5, **{**kwargs, "cache": None}).fit(X, y)
+
+    assert resumed.n_cached_fits_ == 3 * 3
+    np.testing.assert_allclose(
+        resumed.cv_results_["mean_test_score"], ref.cv_results_["mean_test_score"]
+    )
+    np.testing.assert_allclose(resumed.predict(X), ref.predict(X))
+
+    again = FoldCachedSearchCV(pipe, n_iter=5, **kwargs).fit(X, y)
+    assert again.n_cached_fits_ == 5 * 3
+    assert again.preprocess_time_ == 0.0  # no fold was even preprocessed
+
+
+def test_experiment_cache_evicts_least_recently_used(tmp_path):
+    from modeling import ExperimentCache
+
+    cache = ExperimentCache(tmp_path)
+    keys = [cache.key("entry", i) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, np.zeros(1000) + i)
+        os.utime(cache._path(key), (i, i))  # written in this order
+    entry_size = cache.size_bytes() // 4
+
+    cache.get(keys[0])  # now the most recently used
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+
+    assert keys[0] in cache and keys[3] in cache
+    assert keys[1] not in cache and keys[2] not in cache
+    assert cache.get(keys[1]) is None
+    np.testing.assert_array_equal(cache.get(keys[3]), np.full(1000, 3.0))
+
+
+def test_experiment_cache_treats_corrupt_entries_as_misses(tmp_path):
+    from modeling import ExperimentCache
+
+    cache = ExperimentCache(tmp_path)
+    key = cache.key("entry")
+    cache.put(key, np.arange(1000))
+    path = cache._path(key)
+    path.write_bytes(path.read_bytes()[:50])  # truncated write
+
+    assert cache.get(key, default="miss") == "miss"
+    assert not path.exists()
+    assert cache.get_or_compute(key, np.ones, 3).tolist() == [1.0, 1.0, 1.0]
+
+
+def test_experiment_cache_keys_track_code(monkeypatch):
+    import subprocess
+    import sys
+
+    import modeling._experiment_cache as ec
+
+    key = ec.ExperimentCache.key("entry")
+    monkeypatch.setattr(ec, "CACHE_VERSION", ec.CACHE_VERSION + 1)
+    assert ec.ExperimentCache.key("entry") != key
+
+    def score_a(y):
+        return y.mean()
+
+    def score_b(y):
+        return y.median()
+
+    assert ec.code_digest(score_a) != ec.code_digest(score_b)
+
+    # LightGBM is only loaded once a key is computed
+    check = "import sys, modeling; assert 'lightgbm' not in sys.modules"
+    subprocess.run([sys.executable, "-c", check], check=True)
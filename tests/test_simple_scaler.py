@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+import scipy.sparse as sp
 
 from modeling import SimpleStandardScaler
 
@@ -19,3 +20,70 @@ def test_simple_standard_scaler(X):
     # After standardization: mean ≈ 0, std ≈ 1
     assert np.allclose(X_scaled.mean(axis=0), 0.0)
     assert np.allclose(X_scaled.std(axis=0), 1.0)
+
+
+def _data(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=[1e6, -3.0, 0.0], scale=[10.0, 2.0, 1e-3], size=(n, 3))
+    X[:, 2] = 5.0  # constant column
+    return X
+
+
+@pytest.mark.parametrize("n_chunks", [1, 7, 100])
+def test_partial_fit_matches_one_shot(n_chunks):
+    X = _data()
+    one_shot = SimpleStandardScaler().fit(X)
+
+    chunked = SimpleStandardScaler()
+    for chunk in np.array_split(X, n_chunks):
+        chunked.partial_fit(chunk)
+
+    assert chunked.n_samples_seen_ == len(X)
+    np.testing.assert_allclose(chunked.mean_, X.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(chunked.var_, X.var(axis=0), rtol=1e-9, atol=1e-20)
+    np.testing.assert_allclose(chunked.std_, one_shot.std_, rtol=1e-9)
+
+    # Constant column is left unscaled, not divided by zero
+    X_scaled = chunked.transform(X)
+    assert np.isfinite(X_scaled).all()
+    np.testing.assert_allclose(X_scaled[:, 2], 0.0)
+
+
+def test_merge_of_separately_fitted_chunks():
+    X = _data()
+    parts = [SimpleStandardScaler().fit(c) for c in np.array_split(X, 13)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    expected = SimpleStandardScaler().fit(X)
+    np.testing.assert_allclose(merged.mean_, expected.mean_, rtol=1e-12)
+    np.testing.assert_allclose(merged.std_, expected.std_, rtol=1e-9)
+
+
+def test_float32_in_place_transform():
+    X = np.random.default_rng(1).normal(5.0, 2.0, (1000, 3)).astype(np.float32)
+    scaler = SimpleStandardScaler(dtype=np.float32, copy=False).fit(X)
+    expected = (X.astype(np.float64) - scaler.mean_) / scaler.std_
+
+    X_scaled = scaler.transform(X)
+    assert X_scaled is X and X_scaled.dtype == np.float32
+    np.testing.assert_allclose(X_scaled, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("fmt", ["csr", "csc"])
+def test_sparse_scaled_without_centering(fmt):
+    X = sp.random(500, 6, density=0.2, format=fmt, random_state=0)
+    scaler = SimpleStandardScaler(with_mean=False)
+    for rows in np.array_split(np.arange(500), 4):
+        scaler.partial_fit(X[rows])
+
+    dense = X.toarray()
+    np.testing.assert_allclose(scaler.std_, dense.std(axis=0), rtol=1e-10)
+
+    X_scaled = scaler.transform(X)
+    assert sp.issparse(X_scaled) and X_scaled.nnz == X.nnz
+    np.testing.assert_allclose(X_scaled.toarray(), dense / dense.std(axis=0))
+
+    with pytest.raises(ValueError, match="with_mean=False"):
+        SimpleStandardScaler().fit(X)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from modeling import MultiHotSkillsEncoder
+
+SKILLS = [["Python", "SQL"], ["SQL"], [], None, ["R", "Python", "Python"]]
+
+
+@pytest.mark.parametrize(
+    "X",
+    [
+        pl.Series("skills_list", SKILLS),
+        pd.DataFrame({"skills_list": SKILLS}),
+        SKILLS,
+    ],
+)
+def test_multi_hot_skills_encoder(X):
+    enc = MultiHotSkillsEncoder().fit(X)
+    X_enc = enc.transform(X)
+
+    assert list(enc.skills_) == ["Python", "R", "SQL"]
+    np.testing.assert_array_equal(
+        X_enc.toarray(),
+        [[1, 0, 1], [0, 0, 1], [0, 0, 0], [0, 0, 0], [1, 1, 0]],
+    )
+
+
+def test_min_frequency_and_unknown_skills():
+    enc = MultiHotSkillsEncoder(min_frequency=2).fit(SKILLS)
+    assert list(enc.get_feature_names_out()) == [
+        "skills_list_Python",
+        "skills_list_SQL",
+    ]
+
+    X_enc = enc.transform([["Rust", "SQL"]])
+    np.testing.assert_array_equal(X_enc.toarray(), [[0, 1]])
@@ -0,0 +1,38 @@
+import polars as pl
+
+from data import generate_postings, write_postings
+from data._synthetic import COLUMNS
+from preprocessing import preprocess
+
+
+def test_generate_postings_schema_and_seed():
+    df = generate_postings(5_000, seed=1)
+
+    assert df.columns == COLUMNS
+    assert df["job_id"].n_unique() == 5_000
+    assert df.equals(generate_postings(5_000, seed=1))
+    assert not df.equals(generate_postings(5_000, seed=2))
+
+    clean = preprocess(df)
+    assert clean["num_skills"].is_between(3, 5).all()
+    assert clean["posting_date"].null_count() == 0
+    assert (clean["application_deadline"] > clean["posting_date"]).all()
+
+    # Salary depends on the features
+    median = dict(
+        clean.group_by("experience_level").agg(pl.col("salary_usd").median()).rows()
+    )
+    assert median["EN"] < median["MI"] < median["SE"] < median["EX"]
+
+
+def test_write_postings_in_chunks(tmp_path):
+    parquet = write_postings(tmp_path / "jobs.parquet", 2_500, chunk_size=1_000)
+    csv = write_postings(tmp_path / "jobs.csv", 2_500, chunk_size=1_000)
+
+    df = pl.read_parquet(parquet)
+    assert df.height == 2_500
+    assert df["job_id"].n_unique() == 2_500
+    assert df.equals(pl.read_csv(csv, schema=df.schema))
+    assert df.equals(
+        pl.read_parquet(write_postings(tmp_path / "b.parquet", 2_500, chunk_size=1_000))
+    )